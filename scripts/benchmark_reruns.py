@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Click through the web app headlessly for every endpoint path and report per-step rerun latency
+Postman and the auth service are stubbed locally; exits non-zero when any journey fails
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import streamlit.config
+import streamlit.logger
+
+from streamlit_app.rerun_benchmark import PERCENTILES, run_rerun_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the web app's reruns with Streamlit's AppTest")
+    parser.add_argument("--rounds", type=int, default=1,
+                        help="Times to walk every path")
+    parser.add_argument("--recipients", type=int, default=10,
+                        help="Recipients in each session's address table")
+    parser.add_argument("--no-execute", action="store_true",
+                        help="Skip generating and running the Python script")
+    parser.add_argument("--only", action="append", default=[], metavar="TEXT",
+                        help="Walk only paths whose endpoint contains TEXT (repeatable)")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="Also write the report to a JSON file")
+
+    args = parser.parse_args()
+    json_file = args.json.resolve() if args.json else None
+
+    # Widget warnings from the bare script run would drown the report; the option outlasts config reloads
+    streamlit.config.set_option("logger.level", "error")
+    streamlit.logger.set_log_level("error")
+
+    def show(slug, endpoint, samples, error):
+        total_ms = sum(seconds for _step, seconds, _size in samples) * 1000
+        status = f"❌ {error}" if error else "✅"
+        print(f"  {slug:<48}{endpoint:<32}{len(samples):>3} steps{total_ms:>10.0f}ms  {status}", flush=True)
+
+    print(f"🖱️  Walking the wizard: {args.rounds} round(s), {args.recipients} recipients\n")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # Trace and watchdog logs, when enabled, land under the working directory; keep them out of the repo
+        os.chdir(directory)
+        try:
+            report = run_rerun_benchmark(args.rounds, args.recipients, not args.no_execute, args.only,
+                                         on_journey=show)
+        finally:
+            os.chdir(cwd)
+
+    columns = "".join(f"{f'p{q}':>10}" for q in PERCENTILES)
+    print(f"\n{'Step':<24}{'Reruns':>8}{columns}{'Bytes':>10}")
+    print("-" * (42 + 10 * len(PERCENTILES)))
+    for step, entry in report["steps"].items():
+        values = "".join(f"{entry[f'p{q}_ms']:>8.1f}ms" for q in PERCENTILES)
+        print(f"{step:<24}{entry['count']:>8}{values}{entry['bytes']:>10,}")
+
+    if json_file:
+        json_file.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n💾 Report saved to: {json_file}")
+
+    if report["errors"]:
+        print(f"\n❌ {len(report['errors'])} of {report['journeys']} journey(s) failed")
+        sys.exit(1)
+    print(f"\n✅ {report['journeys']} journey(s) completed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Build the minified, content-hashed stylesheet bundle
+The app builds it on startup too; run this at deploy time to serve it from the first request
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.static_assets import ASSETS_DIR, STATIC_DIR, build_assets
+
+
+def main():
+    manifest = build_assets()
+    for bundle, entry in manifest.items():
+        print(f"✅ {ASSETS_DIR.name}/{bundle} -> {STATIC_DIR.name}/{entry['file']} ({len(entry['css']):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
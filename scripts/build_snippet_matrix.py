@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Precompute the code skeleton for every request body shape
+The app and the HTTP service load it on first use instead of building it themselves
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.core.snippets import DEFAULT_MATRIX_PATH, SNIPPET_TARGETS, build_snippet_matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the code-snippet lookup table")
+    parser.add_argument("--out", type=Path, default=DEFAULT_MATRIX_PATH,
+                        help=f"Output file (default: {DEFAULT_MATRIX_PATH})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matrix = build_snippet_matrix()
+    path = matrix.save(args.out)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {len(matrix)} skeletons ({len(matrix) // len(SNIPPET_TARGETS)} body shapes x "
+          f"{len(SNIPPET_TARGETS)} templates) written to {path} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,17 @@ Supports multiple output formats: OpenAI, Claude, generic JSONL
 """
 
 import json
+import sys
 import jsonlines
 import argparse
 from pathlib import Path
-from datetime import datetime
 from typing import List, Dict, Any
-import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.core.config import load_config
+from streamlit_app.metrics import METRICS, TRAINING_BUILD_SECONDS, TRAINING_EXAMPLES
+from streamlit_app.profiling import add_profile_argument, profiling
 
 class TrainingDataBuilder:
     def __init__(self, input_file: Path, output_file: Path, format: str = "openai"):
@@ -29,14 +34,15 @@ class TrainingDataBuilder:
     
     def build_training_data(self):
         """Build training data in the specified format"""
-        if self.format == "openai":
-            self._build_openai_format()
-        elif self.format == "claude":
-            self._build_claude_format()
-        elif self.format == "generic":
-            self._build_generic_format()
-        else:
+        builders = {
+            "openai": self._build_openai_format,
+            "claude": self._build_claude_format,
+            "generic": self._build_generic_format,
+        }
+        if self.format not in builders:
             raise ValueError(f"Unsupported format: {self.format}")
+        with TRAINING_BUILD_SECONDS.time(format=self.format):
+            builders[self.format]()
     
     def _build_openai_format(self):
         """Build training data in OpenAI fine-tuning format"""
@@ -73,6 +79,7 @@ class TrainingDataBuilder:
             for example in training_data:
                 writer.write(example)
         
+        TRAINING_EXAMPLES.inc(len(training_data), format="openai")
         print(f"✅ Created {len(training_data)} training examples in OpenAI format")
     
     def _build_claude_format(self):
@@ -97,6 +104,7 @@ class TrainingDataBuilder:
             for example in training_data:
                 writer.write(example)
         
+        TRAINING_EXAMPLES.inc(len(training_data), format="claude")
         print(f"✅ Created {len(training_data)} training examples in Claude format")
     
     def _build_generic_format(self):
@@ -121,6 +129,7 @@ class TrainingDataBuilder:
             for example in training_data:
                 writer.write(example)
         
+        TRAINING_EXAMPLES.inc(len(training_data), format="generic")
         print(f"✅ Created {len(training_data)} training examples in generic format")
     
     def _build_user_prompt(self, session: Dict[str, Any]) -> str:
@@ -237,9 +246,18 @@ def main():
                         help="Output format for training data")
     parser.add_argument("--stats", action="store_true",
                         help="Generate statistics about the training data")
+    parser.add_argument("--metrics-dir", type=Path,
+                        default=load_config().get("metrics", {}).get("textfile_dir") or None,
+                        help="Write build metrics here for the node-exporter textfile collector")
+    add_profile_argument(parser)
     
     args = parser.parse_args()
     
+    with profiling(args.profile, __file__):
+        build(args)
+
+def build(args: argparse.Namespace):
+    """Build the training file the parsed arguments describe"""
     # Check if input file exists
     if not args.input.exists():
         print(f"❌ Input file not found: {args.input}")
@@ -258,6 +276,9 @@ def main():
         builder.generate_statistics()
     
     print(f"\n✨ Training data saved to: {args.output}")
+    
+    if args.metrics_dir:
+        print(f"📈 Metrics written to: {METRICS.write_textfile(args.metrics_dir)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Bundle local documents into a zip archive for zipId submissions
+Streams every document into the archive and prints the matching documentSourceIdentifier entries
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.zip_bundler import bundle_documents, document_sources, index_path
+
+
+def collect_documents(inputs, pattern: str):
+    """Expand directories into the matching files they contain, in name order"""
+    for item in inputs:
+        if item.is_dir():
+            yield from sorted(p for p in item.rglob(pattern) if p.is_file())
+        else:
+            yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream documents into a zip for zipId submissions")
+    parser.add_argument("inputs", type=Path, nargs="+",
+                        help="Documents, or directories to search for them")
+    parser.add_argument("--output", type=Path, default=Path("documents.zip"),
+                        help="Archive to write")
+    parser.add_argument("--zip-id",
+                        help="zipId the documents are referenced by (defaults to the archive name)")
+    parser.add_argument("--upload-id",
+                        help="uploadRequestId to include in every documentSourceIdentifier")
+    parser.add_argument("--pattern", default="*.pdf",
+                        help="File pattern used when an input is a directory")
+    parser.add_argument("--compress", action="store_true",
+                        help="Deflate members instead of storing them (rarely helps for PDFs)")
+    args = parser.parse_args()
+
+    documents = list(collect_documents(args.inputs, args.pattern))
+    try:
+        index = bundle_documents(documents, args.output, zip_id=args.zip_id, compress=args.compress)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    total = sum(member["size"] for member in index["members"])
+    print(f"✅ {len(index['members'])} documents ({total:,} bytes) bundled into {args.output} "
+          f"({index['bytes']:,} bytes)", file=sys.stderr)
+    print(f"📇 Member index: {index_path(args.output)}", file=sys.stderr)
+
+    # Only the identifiers go to stdout, so they can be piped into a request body
+    print(json.dumps(document_sources(index, args.upload_id), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Coalesce single-document jobs into multi-document submissions
+Reads a JSONL stream of single-doc specs and writes the fewest equivalent API calls
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from endpoint_mapper import EndpointMapper
+from streamlit_app.job_coalescer import DEFAULT_MAX_ITEMS, JobCoalescer, coalesce
+
+
+def read_specs(path: Path):
+    """Yield (endpoint, body) pairs from JSONL
+
+    Lines are either {"endpoint": ..., "body": {...}} or a bare single-doc
+    body, whose endpoint follows from whether it names a job template.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+            if "body" in spec:
+                yield spec.get("endpoint", "/jobs/single-doc"), spec["body"]
+            elif "jobTemplate" in spec:
+                yield "/jobs/single-doc-job-template", spec
+            else:
+                yield "/jobs/single-doc", spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coalesce single-doc jobs into multi-doc submissions")
+    parser.add_argument("input", type=Path,
+                        help="JSONL file of single-doc job specs")
+    parser.add_argument("--output", type=Path, default=Path("submissions.jsonl"),
+                        help="JSONL file for the coalesced submissions")
+    parser.add_argument("--max-items", type=int, default=DEFAULT_MAX_ITEMS,
+                        help="Most document/recipient pairs per multi-doc submission")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"❌ Input file not found: {args.input}")
+        return
+
+    mapper = EndpointMapper()
+    coalescer = JobCoalescer(args.max_items)
+    endpoints = Counter()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(args.output, "w", encoding="utf-8") as out:
+            for submission in coalesce(read_specs(args.input), coalescer=coalescer):
+                endpoints[submission["endpoint"]] += 1
+                out.write(json.dumps(submission, separators=(",", ":")) + "\n")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    stats = coalescer.stats
+    print(f"📥 {stats['specs']:,} single-doc specs ({stats['passthrough']:,} passed through unchanged)")
+    print(f"📤 {stats['submissions']:,} submissions", end="")
+    if stats["submissions"]:
+        print(f" - {stats['specs'] / stats['submissions']:.1f}x fewer API calls")
+    else:
+        print()
+    for endpoint, count in endpoints.most_common():
+        print(f"  {endpoint} ({mapper.endpoint_to_usecase(endpoint) or 'unknown use case'}): {count:,}")
+    print(f"\n✨ Submissions saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
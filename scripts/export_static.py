@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Pre-render every Level 1 recommendation path to static HTML and JSON
+Any static file server can then answer recommendations without running Python
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.code_templates import DEFAULT_API_BASE_URL
+from streamlit_app.static_export import DEFAULT_EXPORT_DIR, export_static
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every recommendation page and default code snippet")
+    parser.add_argument("--out", type=Path, default=DEFAULT_EXPORT_DIR,
+                        help=f"Output directory (default: {DEFAULT_EXPORT_DIR})")
+    parser.add_argument("--base-url", default=DEFAULT_API_BASE_URL,
+                        help="API base URL used in the generated code")
+    parser.add_argument("--workers", type=int,
+                        help="Rendering processes (default: one per CPU; 1 renders in-process)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = export_static(args.out, args.base_url, args.workers)
+    elapsed = time.perf_counter() - start
+
+    endpoints = {entry["endpoint"] for entry in entries}
+    print(f"✅ {len(entries)} answer paths ({len(endpoints)} endpoints) rendered to {args.out} in {elapsed:.2f}s")
+    print(f"📄 Start at {args.out / 'index.html'}")
+
+
+if __name__ == "__main__":
+    main()
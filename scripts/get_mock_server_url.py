@@ -9,6 +9,11 @@ import requests
 import argparse
 from dotenv import load_dotenv
 import json
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.profiling import add_profile_argument, profiling
 
 # Load environment variables
 load_dotenv()
@@ -139,9 +144,15 @@ def main():
         action="store_true",
         help="Output only the mock server URL"
     )
+    add_profile_argument(parser)
     
     args = parser.parse_args()
     
+    with profiling(args.profile, __file__):
+        run(args)
+
+def run(args):
+    """Look up the mock server URL the parsed arguments ask for"""
     # If workspace not specified via command line, ask interactively
     if args.workspace is None and not args.all:
         args.workspace = select_workspace_interactive()
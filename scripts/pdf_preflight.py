@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Preflight a combined PDF before a split submission
+Reports the page count and the page range each recipient would receive
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.pdf_preflight import preflight
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a PDF's pages and split ranges locally")
+    parser.add_argument("pdf", type=Path, help="Combined PDF to check")
+    split = parser.add_mutually_exclusive_group()
+    split.add_argument("--recipients", type=int,
+                       help="Split the pages evenly among this many recipients")
+    split.add_argument("--pages-per-recipient", type=int,
+                       help="Pages in each recipient's document")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    if not args.pdf.is_file():
+        print(f"❌ PDF not found: {args.pdf}")
+        sys.exit(1)
+
+    try:
+        report = preflight(args.pdf, args.recipients, args.pages_per_recipient)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"📄 {report['file']}: {report['pages']:,} pages, {report['bytes']:,} bytes "
+          f"(PDF {report['version']}, via {report['method']}, {report['seconds'] * 1000:.1f} ms)")
+    if report["ranges"]:
+        print(f"✂️  {len(report['ranges']):,} page ranges:")
+        for number, page_range in enumerate(report["ranges"], 1):
+            print(f"  {number:>6}: pages {page_range['startPage']}-{page_range['endPage']}")
+
+
+if __name__ == "__main__":
+    main()
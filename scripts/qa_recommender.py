@@ -4,12 +4,14 @@ Click2Endpoint CLI - C2M API v2
 Interactive questionnaire to help developers find the right C2M API endpoint
 """
 
+import argparse
 import json
+import sys
 import yaml
 import questionary
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Optional, Any
 import csv
 import jsonlines
 from rich.console import Console
@@ -17,6 +19,12 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.core.config import load_config
+from streamlit_app.metrics import METRICS, RECOMMENDATIONS, SESSION_LOG_WRITE_SECONDS
+from streamlit_app.profiling import add_profile_argument, profiling
+
 console = Console()
 
 class EndpointNavigator:
@@ -99,8 +107,10 @@ class EndpointNavigator:
         endpoint_id = self._find_matching_endpoint()
         
         if endpoint_id:
+            RECOMMENDATIONS.inc(endpoint=self.endpoints[endpoint_id]["path"], source="cli")
             self._display_recommendation(endpoint_id)
-            self._log_session(endpoint_id)
+            with SESSION_LOG_WRITE_SECONDS.time():
+                self._log_session(endpoint_id)
             
             # Ask if user wants to export the session
             if questionary.confirm("\nWould you like to save this recommendation session?", default=True).ask():
@@ -225,17 +235,27 @@ class EndpointNavigator:
 
 def main():
     """Main CLI entry point"""
-    navigator = EndpointNavigator()
+    parser = argparse.ArgumentParser(description="Find the right C2M API endpoint through a guided questionnaire")
+    add_profile_argument(parser)
+    args = parser.parse_args()
     
-    while True:
-        navigator.answers = {}  # Reset for new session
-        navigator.session_log = []
-        
-        endpoint_id = navigator.run_questionnaire()
+    with profiling(args.profile, __file__):
+        navigator = EndpointNavigator()
         
-        if not questionary.confirm("\nWould you like to find another endpoint?", default=False).ask():
-            console.print("\n[blue]Thanks for using Click2Endpoint! 🚀[/blue]")
-            break
+        while True:
+            navigator.answers = {}  # Reset for new session
+            navigator.session_log = []
+            
+            endpoint_id = navigator.run_questionnaire()
+            
+            if not questionary.confirm("\nWould you like to find another endpoint?", default=False).ask():
+                console.print("\n[blue]Thanks for using Click2Endpoint! 🚀[/blue]")
+                break
+    
+    # Leave this run's counts for the node-exporter textfile collector
+    metrics = load_config().get("metrics", {})
+    if metrics.get("enabled") and metrics.get("textfile_dir"):
+        METRICS.write_textfile(Path(metrics["textfile_dir"]))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Recipient list tools
+validate: normalize and check a CSV / JSONL recipient file locally before it is submitted
+dedupe: drop exact and near-exact duplicate recipients in one streaming pass
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.address_dedup import Deduplicator
+from streamlit_app.address_validation import MAX_REPORTED_ERRORS, validate_frame
+from streamlit_app.recipient_import import iter_chunks, normalize_columns
+
+# Larger than the UI import chunk: per-chunk overhead dominates below ~50k rows
+CHUNK_SIZE = 100_000
+
+
+def file_format(path: Path) -> str:
+    """csv or jsonl, from the file extension"""
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+def write_rows(out, path: Path, frame, header: bool):
+    """Append normalized rows to an open CSV or JSONL output"""
+    if frame.empty:
+        return
+    if file_format(path) == "csv":
+        frame.to_csv(out, index=False, header=header)
+    else:
+        lines = frame.to_json(orient="records", lines=True)
+        out.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+def validate(args) -> int:
+    """Validate a recipient file chunk by chunk; returns the exit code"""
+    if not args.file.is_file():
+        print(f"❌ File not found: {args.file}")
+        return 1
+
+    started = time.perf_counter()
+    rows = 0
+    reasons = Counter()
+    errors = []
+    out = open(args.out, "w", encoding="utf-8", newline="") if args.out else None
+    try:
+        for chunk in iter_chunks(str(args.file), file_format(args.file), args.chunk_size):
+            frame = normalize_columns(chunk, postal_case=args.postal_case, repair_zip=args.repair_zip)
+            chunk_reasons = validate_frame(frame)
+            invalid = np.flatnonzero(chunk_reasons != "")
+
+            reasons.update(chunk_reasons[invalid].tolist())
+            for position in invalid[:MAX_REPORTED_ERRORS - len(errors)]:
+                errors.append((rows + int(position) + 1, str(chunk_reasons[position])))
+
+            if out:
+                write_rows(out, args.out, frame, header=rows == 0)
+            rows += len(frame)
+    except ValueError as e:
+        print(f"❌ Could not read {args.file}: {e}")
+        return 1
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    invalid_rows = sum(reasons.values())
+    print(f"📋 {rows:,} recipients checked in {elapsed:.2f}s")
+    print(f"✅ {rows - invalid_rows:,} valid")
+    if invalid_rows:
+        print(f"❌ {invalid_rows:,} invalid")
+        for reason, count in reasons.most_common():
+            print(f"   {reason}: {count:,}")
+        print()
+        for row, reason in errors:
+            print(f"   row {row}: {reason}")
+        if invalid_rows > len(errors):
+            print(f"   ... and {invalid_rows - len(errors):,} more")
+    if args.out:
+        print(f"\n💾 Normalized recipients written to {args.out}")
+    return 1 if invalid_rows and args.strict else 0
+
+
+def dedupe(args) -> int:
+    """Stream a recipient file through a Deduplicator; returns the exit code"""
+    if not args.file.is_file():
+        print(f"❌ File not found: {args.file}")
+        return 1
+
+    started = time.perf_counter()
+    deduplicator = Deduplicator(near=not args.exact_only)
+    kept = 0
+    out = open(args.out, "w", encoding="utf-8", newline="") if args.out else None
+    try:
+        for chunk in iter_chunks(str(args.file), file_format(args.file), args.chunk_size):
+            frame = normalize_columns(chunk)
+            unique = frame[deduplicator.check(frame) == ""]
+            if out:
+                write_rows(out, args.out, unique, header=kept == 0)
+            kept += len(unique)
+    except ValueError as e:
+        print(f"❌ Could not read {args.file}: {e}")
+        return 1
+    finally:
+        if out:
+            out.close()
+
+    stats = deduplicator.stats()
+    print(f"📋 {stats['checked']:,} recipients checked in {time.perf_counter() - started:.2f}s")
+    print(f"✅ {kept:,} unique")
+    print(f"♻️  {stats['duplicates']:,} exact and {stats['near_duplicates']:,} near-exact duplicates")
+    print(f"📮 {stats['pieces_saved']:,} postage pieces saved")
+    if stats["lists_skipped"]:
+        print(f"📮 {stats['lists_skipped']:,} repeated address list references skipped")
+    if args.out:
+        print(f"\n💾 Unique recipients written to {args.out}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recipient list tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("validate", help="Normalize and validate a recipient file")
+    check.add_argument("file", type=Path, help="CSV or JSONL recipient file")
+    check.add_argument("--postal-case", action="store_true",
+                       help="Uppercase address lines and city")
+    check.add_argument("--repair-zip", action="store_true",
+                       help="Restore the leading zero of 4-digit ZIPs")
+    check.add_argument("--out", type=Path,
+                       help="Write the normalized recipients here (.csv or .jsonl)")
+    check.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                       help="Rows processed at a time")
+    check.add_argument("--strict", action="store_true",
+                       help="Exit with status 1 if any recipient is invalid")
+    check.set_defaults(handler=validate)
+
+    unique = commands.add_parser("dedupe", help="Remove duplicate recipients from a file")
+    unique.add_argument("file", type=Path, help="CSV or JSONL recipient file")
+    unique.add_argument("--exact-only", action="store_true",
+                        help="Only drop recipients identical after normalization")
+    unique.add_argument("--out", type=Path,
+                        help="Write the unique recipients here (.csv or .jsonl)")
+    unique.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="Rows processed at a time; memory does not depend on it beyond one chunk")
+    unique.set_defaults(handler=dedupe)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Serve recommendations, request bodies and generated code over HTTP
+POST JSON (or a JSON list of requests, answered as a batch) to /recommend, /payload or /code
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.core.service import DEFAULT_HOST, DEFAULT_PORT, OPERATIONS, make_server
+from streamlit_app.core.snippets import snippet_matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless Click2Endpoint HTTP service")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port to listen on (default: {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    # Load the code skeletons up front rather than on the first /code request
+    snippet_matrix()
+    server = make_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"🚀 Serving {', '.join(sorted(OPERATIONS))} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
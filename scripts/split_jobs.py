@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Split an oversized request payload into balanced jobs
+Writes one payload file per job, a manifest, and a concurrent submission script
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.code_templates import DEFAULT_API_BASE_URL, build_default_registry
+from streamlit_app.job_splitter import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_RECIPIENTS,
+    MANIFEST_FILE,
+    RECIPIENTS_KEY,
+    SPLITTABLE_ENDPOINTS,
+    split_jobs
+)
+from streamlit_app.session_workspace import atomic_write
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a request payload into parallel jobs")
+    parser.add_argument("payload", type=Path,
+                        help="JSON request body containing recipientAddressSources")
+    parser.add_argument("--endpoint", choices=SPLITTABLE_ENDPOINTS, default="/jobs/single-doc",
+                        help="Endpoint the jobs are submitted to")
+    parser.add_argument("--max-recipients", type=int, default=DEFAULT_MAX_RECIPIENTS,
+                        help="Most recipients per job")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES,
+                        help="Largest payload file per job, in bytes")
+    parser.add_argument("--server", default=DEFAULT_API_BASE_URL,
+                        help="API base URL used by the submission script")
+    parser.add_argument("--out", type=Path, default=Path("jobs"),
+                        help="Directory for job payloads, manifest and script")
+    args = parser.parse_args()
+
+    with open(args.payload, encoding="utf-8") as f:
+        body = json.load(f)
+    if not isinstance(body.get(RECIPIENTS_KEY), list):
+        parser.error(f"{args.payload} has no {RECIPIENTS_KEY} list")
+
+    def body_items():
+        return ((key, iter(value) if key == RECIPIENTS_KEY else value) for key, value in body.items())
+
+    try:
+        manifest = split_jobs(args.out, args.endpoint, body_items, args.max_recipients, args.max_bytes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    script = build_default_registry().render("python_batch", args.endpoint, server=args.server,
+                                             payload_file=MANIFEST_FILE)
+    script_path = atomic_write(args.out / "submit_jobs.py", script)
+
+    jobs = manifest["jobs"]
+    print(f"✅ {manifest['total_recipients']:,} recipients split into {len(jobs)} jobs in {args.out}")
+    for job in jobs:
+        print(f"   {job['file']}: {job['recipients']:,} recipients, {job['bytes']:,} bytes")
+    print(f"\nSubmit with: python {script_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Address Dedup
+Streaming exact and near-exact duplicate detection for recipient lists, keyed on 64-bit address hashes
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from streamlit_app.address_store import RECIPIENT_COLUMNS, AddressStore
+from streamlit_app.address_validation import MAX_REPORTED_ERRORS, normalize_frame
+
+# Street suffixes and generic unit designators are dropped from the address
+# lines, so "1 Main Street Apt 2" and "1 MAIN ST. #2" both become "1 MAIN 2"
+_DESIGNATORS = (
+    r"\b(?:STREET|STR|ST|AVENUE|AVE|AV|ROAD|RD|DRIVE|DR|LANE|LN|BOULEVARD|BLVD|COURT|CT|PLACE|PL"
+    r"|TERRACE|TER|CIRCLE|CIR|PARKWAY|PKWY|HIGHWAY|HWY|WAY|APARTMENT|APT|UNIT|NUMBER|NO)\b"
+)
+# Directionals and specific units are kept (100 N Main and 100 S Main differ,
+# as do Apt 2 and Floor 2) but spelled one way
+_SPELLINGS = {"NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+              "FLOOR": "FL", "SUITE": "STE", "ROOM": "RM", "BUILDING": "BLDG"}
+
+DUPLICATE = "duplicate"
+NEAR_DUPLICATE = "near duplicate"
+
+
+def exact_hashes(frame: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of every recipient column of a normalized frame"""
+    return pd.util.hash_pandas_object(frame[RECIPIENT_COLUMNS], index=False).to_numpy()
+
+
+def near_hashes(frame: pd.DataFrame, exact: np.ndarray) -> np.ndarray:
+    """64-bit hash of a loose address key: case, punctuation and street designators ignored
+
+    The key is names, address lines and ZIP; city, state and country follow
+    from the ZIP. Designators are only rewritten in the address lines; names
+    just ignore case and punctuation, so a Penny Lane is never taken for a
+    Penny Way. Rows that are not newAddress entries keep their exact hash.
+    """
+    names = frame["firstName"].str.cat(frame["lastName"], sep="|").str.upper()
+    address = frame["address1"].str.cat(frame["address2"], sep="|").str.upper()
+    for word, abbreviation in _SPELLINGS.items():
+        spelled = address.str.contains(word, regex=False).to_numpy(dtype=bool)
+        if spelled.any():
+            address[spelled] = address[spelled].str.replace(rf"\b{word}\b", abbreviation, regex=True)
+    address = address.str.replace(_DESIGNATORS, "", regex=True)
+    key = names.str.cat(address, sep="|").str.replace(r"[^\w|]+", "", regex=True)
+
+    near = pd.DataFrame({"key": key, "zip": frame["zip"].str[:5]})
+    hashes = pd.util.hash_pandas_object(near, index=False).to_numpy()
+    is_new = (frame["type"] == "newAddress").to_numpy(dtype=bool)
+    return np.where(is_new, hashes, exact)
+
+
+class _HashSet:
+    """Sorted uint64 array with vectorized membership; 8 bytes per distinct key"""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        positions = np.searchsorted(self.values, hashes)
+        found = np.zeros(len(hashes), dtype=bool)
+        inside = positions < len(self.values)
+        found[inside] = self.values[positions[inside]] == hashes[inside]
+        return found
+
+    def add(self, hashes: np.ndarray):
+        self.values = np.union1d(self.values, hashes)
+
+
+class Deduplicator:
+    """Single-pass duplicate filter over a stream of normalized recipient frames
+
+    Only hashes are remembered, never the rows, so memory grows by 8 bytes
+    per distinct recipient (16 with near matching) whatever the chunking.
+    The first occurrence of an address is kept; later exact or near-exact
+    copies are flagged. 64-bit keys make an accidental collision unlikely
+    below billions of recipients.
+    """
+
+    def __init__(self, near: bool = True):
+        self.near = near
+        self.exact_seen = _HashSet()
+        self.near_seen = _HashSet()
+        self.checked = 0
+        self.duplicates = 0
+        self.near_duplicates = 0
+        self.pieces_saved = 0
+        self.lists_skipped = 0
+
+    def remember(self, frame: pd.DataFrame):
+        """Record rows as seen without counting them, e.g. recipients already in a store"""
+        exact = exact_hashes(frame)
+        if self.near:
+            self.near_seen.add(near_hashes(frame, exact))
+        self.exact_seen.add(exact)
+
+    def check(self, frame: pd.DataFrame) -> np.ndarray:
+        """Duplicate kind per row ("" to keep), remembering every row as seen"""
+        exact = exact_hashes(frame)
+        is_duplicate = self.exact_seen.contains(exact) | pd.Series(exact).duplicated().to_numpy()
+        kinds = np.where(is_duplicate, DUPLICATE, "")
+
+        if self.near:
+            near = near_hashes(frame, exact)
+            is_near = ~is_duplicate & (self.near_seen.contains(near) | pd.Series(near).duplicated().to_numpy())
+            kinds = np.where(is_near, NEAR_DUPLICATE, kinds)
+            self.near_seen.add(near)
+            self.near_duplicates += int(is_near.sum())
+        self.exact_seen.add(exact)
+
+        dropped = kinds != ""
+        is_list = (frame["type"] == "addressListId").to_numpy(dtype=bool)
+        self.checked += len(frame)
+        self.duplicates += int(is_duplicate.sum())
+        self.pieces_saved += int((dropped & ~is_list).sum())
+        self.lists_skipped += int((dropped & is_list).sum())
+        return kinds
+
+    def stats(self) -> Dict[str, int]:
+        """Running totals; pieces_saved counts single recipients, lists_skipped repeated list references"""
+        return {
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "near_duplicates": self.near_duplicates,
+            "pieces_saved": self.pieces_saved,
+            "lists_skipped": self.lists_skipped,
+        }
+
+
+def store_frame(store: AddressStore) -> pd.DataFrame:
+    """Normalized view of a store, for hashing"""
+    return normalize_frame(pd.DataFrame(store.columns, columns=RECIPIENT_COLUMNS))
+
+
+def dedupe_store(store: AddressStore, near: bool = True, apply: bool = True,
+                 deduplicator: Optional[Deduplicator] = None) -> Dict[str, Any]:
+    """Find duplicate recipients in a store, keeping first occurrences
+
+    With apply, duplicates are removed in place. Returns the Deduplicator
+    stats plus the first MAX_REPORTED_ERRORS dropped rows as (1-based row,
+    kind) pairs.
+    """
+    deduplicator = deduplicator or Deduplicator(near)
+    kinds = deduplicator.check(store_frame(store))
+    dropped = kinds != ""
+    if apply and dropped.any():
+        store.keep(~dropped)
+
+    report = deduplicator.stats()
+    report["dropped"] = [
+        (int(position) + 1, str(kinds[position])) for position in np.flatnonzero(dropped)[:MAX_REPORTED_ERRORS]
+    ]
+    return report
@@ -0,0 +1,171 @@
+"""
+Address Store
+Columnar recipient storage - one array per field instead of one dict per recipient
+"""
+
+import sys
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence
+
+# Address fields collected for a newAddress recipient
+ADDRESS_FIELDS = ["firstName", "lastName", "address1", "address2", "city", "state", "zip", "country"]
+
+# Every stored column; "value" holds the id for addressListId / addressId rows
+RECIPIENT_COLUMNS = ["type", "value"] + ADDRESS_FIELDS
+
+ENTRY_TYPES = ["addressListId", "addressId", "newAddress"]
+
+COLUMN_DEFAULTS = {column: "" for column in RECIPIENT_COLUMNS}
+COLUMN_DEFAULTS["type"] = "newAddress"
+COLUMN_DEFAULTS["country"] = "USA"
+
+# Low-cardinality columns whose strings are interned so repeats share one object
+_INTERNED_COLUMNS = {"type", "state", "country"}
+
+
+def _cell(column: str, value: Any) -> str:
+    """Coerce one cell to the stored string form"""
+    if value is None:
+        value = ""
+    value = value if isinstance(value, str) else str(value)
+    if column == "type" and value not in ENTRY_TYPES:
+        value = COLUMN_DEFAULTS["type"]
+    if column in _INTERNED_COLUMNS:
+        value = sys.intern(value)
+    return value
+
+
+class AddressStore:
+    """Recipients kept as parallel per-column lists
+
+    Per-row dicts cost several hundred bytes of overhead per recipient;
+    parallel lists cost one pointer per cell, and bulk imports extend whole
+    columns at once.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List[str]] = {column: [] for column in RECIPIENT_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["type"])
+
+    def append(self, row: Mapping[str, Any]):
+        """Add one recipient; missing cells take the column default"""
+        for column in RECIPIENT_COLUMNS:
+            self.columns[column].append(_cell(column, row.get(column, COLUMN_DEFAULTS[column])))
+
+    def extend_columns(self, data: Mapping[str, Sequence[Any]], coerce: bool = True):
+        """Add many recipients given column arrays of equal length
+
+        Accepts a dict of lists or a pandas DataFrame; missing columns are
+        filled with their default. Pass coerce=False for data that already
+        holds clean strings (e.g. a normalized import chunk) to skip the
+        per-cell conversion.
+        """
+        lengths = {len(data[column]) for column in RECIPIENT_COLUMNS if column in data}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        count = lengths.pop() if lengths else 0
+
+        for column in RECIPIENT_COLUMNS:
+            if column not in data:
+                self.columns[column].extend([_cell(column, COLUMN_DEFAULTS[column])] * count)
+                continue
+
+            values = data[column]
+            values = values.tolist() if hasattr(values, "tolist") else list(values)
+            if coerce:
+                self.columns[column].extend(_cell(column, value) for value in values)
+            elif column in _INTERNED_COLUMNS:
+                self.columns[column].extend(map(sys.intern, values))
+            else:
+                self.columns[column].extend(values)
+
+    def set_column(self, column: str, values: Sequence[str]):
+        """Replace a whole column with clean strings of the same length"""
+        if len(values) != len(self):
+            raise ValueError("All columns must have the same length")
+        values = list(values)
+        self.columns[column] = list(map(sys.intern, values)) if column in _INTERNED_COLUMNS else values
+
+    def insert(self, position: int, rows: Iterable[Mapping[str, Any]]):
+        """Insert recipients before position, shifting the rows after it once per column"""
+        rows = list(rows)
+        if not rows:
+            return
+        for column in RECIPIENT_COLUMNS:
+            self.columns[column][position:position] = [
+                _cell(column, row.get(column, COLUMN_DEFAULTS[column])) for row in rows
+            ]
+
+    def update(self, index: int, changes: Mapping[str, Any]):
+        """Overwrite some cells of one recipient"""
+        for column, value in changes.items():
+            if column in self.columns:
+                self.columns[column][index] = _cell(column, value)
+
+    def delete(self, indexes: Iterable[int]):
+        """Remove recipients by position
+
+        The span from the first to the last deleted row is replaced by its
+        survivors in one slice assignment per column, so the rows after it
+        shift once however many are deleted. Rows keep their order, which
+        rules out swap-remove for the table editor.
+        """
+        removed = set(indexes)
+        if not removed:
+            return
+        low, high = min(removed), max(removed) + 1
+        survivors = [index - low for index in range(low, high) if index not in removed]
+        for column in RECIPIENT_COLUMNS:
+            values = self.columns[column]
+            span = values[low:high]
+            values[low:high] = [span[offset] for offset in survivors]
+
+    def keep(self, mask: Sequence[bool]):
+        """Keep only the recipients whose mask entry is true, in one pass per column"""
+        if len(mask) != len(self):
+            raise ValueError("All columns must have the same length")
+        mask = list(mask)
+        for column in RECIPIENT_COLUMNS:
+            self.columns[column] = list(compress(self.columns[column], mask))
+
+    def clear(self):
+        """Remove every recipient"""
+        for column in RECIPIENT_COLUMNS:
+            self.columns[column].clear()
+
+    def page(self, start: int, end: int) -> Dict[str, List[str]]:
+        """Column slices for rows [start, end)"""
+        return {column: values[start:end] for column, values in self.columns.items()}
+
+    def row(self, index: int) -> Dict[str, str]:
+        """One recipient as a flat dict"""
+        return {column: values[index] for column, values in self.columns.items()}
+
+    def iter_recipient_sources(self) -> Iterator[Dict[str, Any]]:
+        """Yield recipientAddressSources items, skipping incomplete rows"""
+        columns = [self.columns[column] for column in RECIPIENT_COLUMNS]
+        for entry_type, value, first, last, address1, _address2, city, state, zip_code, country in zip(*columns):
+            if entry_type == "addressListId":
+                if value:
+                    yield {"addressListId": value}
+            elif entry_type == "addressId":
+                if value:
+                    yield {"addressId": value}
+            elif first and last:
+                yield {
+                    "recipientAddress": {
+                        "firstName": first,
+                        "lastName": last,
+                        "address1": address1,
+                        "city": city,
+                        "state": state,
+                        "zip": zip_code,
+                        "country": country
+                    }
+                }
+
+    def recipient_sources(self) -> List[Dict[str, Any]]:
+        """recipientAddressSources for the request body"""
+        return list(self.iter_recipient_sources())
@@ -0,0 +1,230 @@
+"""
+Address Validation
+Vectorized normalization and validation of recipient columns against precomputed postal lookup tables
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from streamlit_app.address_store import ENTRY_TYPES, RECIPIENT_COLUMNS, AddressStore
+
+# USPS state and territory codes, including military (AA/AE/AP) and freely associated states
+STATE_CODES = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN", "IA",
+    "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM",
+    "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA",
+    "WV", "WI", "WY", "AS", "GU", "MP", "PR", "VI", "FM", "MH", "PW", "AA", "AE", "AP",
+)
+
+STATE_NAMES = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA",
+    "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE", "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL",
+    "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA",
+    "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE", "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM", "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
+    "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC", "SOUTH DAKOTA": "SD",
+    "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA",
+    "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+    "AMERICAN SAMOA": "AS", "GUAM": "GU", "NORTHERN MARIANA ISLANDS": "MP", "PUERTO RICO": "PR",
+    "VIRGIN ISLANDS": "VI", "US VIRGIN ISLANDS": "VI",
+}
+
+# Country spellings that all mean the United States
+US_COUNTRIES = ("", "US", "USA", "U.S.", "U.S.A.", "UNITED STATES", "UNITED STATES OF AMERICA")
+
+# First three ZIP digits -> state, as inclusive (low, high, state) ranges
+ZIP3_RANGES = (
+    (5, 5, "NY"), (6, 7, "PR"), (8, 8, "VI"), (9, 9, "PR"), (10, 27, "MA"), (28, 29, "RI"),
+    (30, 38, "NH"), (39, 49, "ME"), (50, 54, "VT"), (55, 55, "MA"), (56, 59, "VT"), (60, 69, "CT"),
+    (70, 89, "NJ"), (90, 99, "AE"), (100, 149, "NY"), (150, 196, "PA"), (197, 199, "DE"),
+    (200, 200, "DC"), (201, 201, "VA"), (202, 205, "DC"), (206, 219, "MD"), (220, 246, "VA"),
+    (247, 268, "WV"), (270, 289, "NC"), (290, 299, "SC"), (300, 319, "GA"), (320, 339, "FL"),
+    (340, 340, "AA"), (341, 349, "FL"), (350, 369, "AL"), (370, 385, "TN"), (386, 397, "MS"),
+    (398, 399, "GA"), (400, 427, "KY"), (430, 459, "OH"), (460, 479, "IN"), (480, 499, "MI"),
+    (500, 528, "IA"), (530, 549, "WI"), (550, 567, "MN"), (569, 569, "DC"), (570, 577, "SD"),
+    (580, 588, "ND"), (590, 599, "MT"), (600, 629, "IL"), (630, 658, "MO"), (660, 679, "KS"),
+    (680, 693, "NE"), (700, 714, "LA"), (716, 729, "AR"), (730, 732, "OK"), (733, 733, "TX"),
+    (734, 749, "OK"), (750, 799, "TX"), (800, 816, "CO"), (820, 831, "WY"), (832, 838, "ID"),
+    (840, 847, "UT"), (850, 865, "AZ"), (870, 884, "NM"), (885, 885, "TX"), (889, 898, "NV"),
+    (900, 961, "CA"), (962, 966, "AP"), (967, 968, "HI"), (969, 969, "GU"), (970, 979, "OR"),
+    (980, 994, "WA"), (995, 999, "AK"),
+)
+
+# Prefixes shared with other states, territories or freely associated states
+ZIP3_SHARED = {967: ("AS",), 969: ("MP", "FM", "MH", "PW")}
+
+STATE_INDEX = {code: i for i, code in enumerate(STATE_CODES)}
+
+
+def _build_zip3_table() -> np.ndarray:
+    """Boolean [prefix, state] table so ZIP/state pairs are checked with one vectorized lookup"""
+    allowed = np.zeros((1000, len(STATE_CODES)), dtype=bool)
+    for low, high, state in ZIP3_RANGES:
+        allowed[low:high + 1, STATE_INDEX[state]] = True
+    for prefix, states in ZIP3_SHARED.items():
+        for state in states:
+            allowed[prefix, STATE_INDEX[state]] = True
+    return allowed
+
+
+ZIP3_ALLOWED = _build_zip3_table()
+# Prefixes in use at all; unassigned ones are not reported as mismatches
+ZIP3_KNOWN = ZIP3_ALLOWED.any(axis=1)
+
+ZIP_PATTERN = r"\d{5}(?:-\d{4})?"
+
+# Fields every deliverable newAddress needs
+REQUIRED_FIELDS = ("firstName", "lastName", "address1", "city")
+
+# Rejected rows listed individually in a validation report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+# Cells that need more than a strip: doubled spaces, tabs, newlines and the like
+_MESSY_WHITESPACE = r"\s\s|[^\S ]"
+
+
+def canonical_text(values: pd.Series) -> pd.Series:
+    """Trim and collapse runs of whitespace to single spaces
+
+    The regex replace only runs on cells that need it; most imported data
+    is already clean, so this is mostly a strip and a cheap scan.
+    """
+    values = values.str.strip()
+    messy = values.str.contains(_MESSY_WHITESPACE, regex=True).to_numpy(dtype=bool)
+    if messy.any():
+        values = values.copy()
+        values[messy] = values[messy].str.replace(r"\s+", " ", regex=True)
+    return values
+
+
+def normalize_frame(frame: pd.DataFrame, postal_case: bool = False, repair_zip: bool = False) -> pd.DataFrame:
+    """Canonical form of every recipient column, as a new frame
+
+    Whitespace is collapsed everywhere; states are uppercased and full names
+    mapped to codes; US country spellings become USA; 9-digit ZIPs get their
+    hyphen. With repair_zip, 4-digit ZIPs that lost their leading zero to a
+    spreadsheet get it back. With postal_case, address lines and city are
+    uppercased as USPS prefers.
+    """
+    normalized = {column: canonical_text(frame[column]) for column in RECIPIENT_COLUMNS}
+
+    country = normalized["country"].str.upper()
+    is_us = country.isin(US_COUNTRIES).to_numpy()
+    normalized["country"] = country.where(~is_us, "USA")
+
+    # Full names are rare, so the name lookup only runs on cells that are not already codes
+    state = normalized["state"].str.upper()
+    named = ~state.isin(STATE_CODES).to_numpy() & (state != "").to_numpy()
+    if named.any():
+        state[named] = state[named].map(STATE_NAMES).fillna(state[named])
+    normalized["state"] = state
+
+    zip_code = normalized["zip"]
+    length = zip_code.str.len().to_numpy()
+    spaced = zip_code.str.contains(" ", regex=False).to_numpy(dtype=bool)
+    if spaced.any():
+        zip_code = zip_code.str.replace(" ", "", regex=False)
+        length = zip_code.str.len().to_numpy()
+    nine_digits = is_us & (length == 9)
+    if nine_digits.any():
+        nine_digits &= zip_code.str.isdigit().to_numpy(dtype=bool)
+        zip_code = zip_code.where(~nine_digits, zip_code.str[:5] + "-" + zip_code.str[5:])
+    if repair_zip:
+        lost_zero = is_us & ((length == 4) | (length == 9))
+        if lost_zero.any():
+            lost_zero &= zip_code.str.fullmatch(r"\d{4}(?:-\d{4})?").to_numpy(dtype=bool)
+            zip_code = zip_code.where(~lost_zero, "0" + zip_code)
+    normalized["zip"] = zip_code
+
+    if postal_case:
+        for column in ("address1", "address2", "city"):
+            normalized[column] = normalized[column].str.upper()
+    return pd.DataFrame(normalized, index=frame.index)
+
+
+def zip_state_mismatch(zip_code: pd.Series, state: pd.Series) -> np.ndarray:
+    """True where a ZIP's prefix belongs to a different state than the one given"""
+    # First three characters of each ZIP as a code-point matrix; short or non-digit cells fall out
+    digits = np.array(zip_code.tolist(), dtype="U3").view(np.uint32).reshape(-1, 3).astype(np.int64) - ord("0")
+    is_digit = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    prefix = np.where(is_digit, digits @ np.array([100, 10, 1]), 0)
+
+    state_index = pd.Index(STATE_CODES).get_indexer(state)
+    checkable = is_digit & (state_index >= 0)
+    return checkable & ZIP3_KNOWN[prefix] & ~ZIP3_ALLOWED[prefix, state_index.clip(0)]
+
+
+def validate_frame(frame: pd.DataFrame, required: Sequence[str] = REQUIRED_FIELDS,
+                   check_zip_state: bool = True) -> np.ndarray:
+    """Rejection reason for each row of a normalized frame ("" when valid)
+
+    Checks run in a fixed order and the first failing one is reported. All
+    of them are whole-column operations, so no Python loop runs per row.
+    """
+    is_new = frame["type"] == "newAddress"
+    is_us = frame["country"].str.upper().isin(US_COUNTRIES)
+    state = frame["state"]
+    zip_code = frame["zip"]
+    well_formed_zip = zip_code.str.fullmatch(ZIP_PATTERN)
+
+    conditions = [
+        ~frame["type"].isin(ENTRY_TYPES),
+        ~is_new & (frame["value"] == ""),
+    ]
+    reasons = ["unknown type", "missing list / address id"]
+    for field in required:
+        conditions.append(is_new & (frame[field] == ""))
+        reasons.append(f"missing {field}")
+
+    conditions += [
+        is_new & is_us & (state != "") & ~state.isin(STATE_CODES),
+        is_new & is_us & (zip_code != "") & ~well_formed_zip,
+    ]
+    reasons += ["invalid state", "invalid ZIP"]
+
+    if check_zip_state:
+        conditions.append(is_new & is_us & (state != "") & well_formed_zip
+                          & zip_state_mismatch(zip_code, state))
+        reasons.append("ZIP does not match state")
+
+    return np.select(conditions, reasons, default="")
+
+
+def validate_store(store: AddressStore, postal_case: bool = False, repair_zip: bool = False,
+                   apply: bool = True) -> Dict[str, Any]:
+    """Normalize and validate every recipient in a store
+
+    With apply, normalized values are written back into the store. Returns
+    row counts, the number of normalized cells, a count per reason and the
+    first MAX_REPORTED_ERRORS problems as (1-based row, reason) pairs.
+    """
+    frame = pd.DataFrame(store.columns, columns=RECIPIENT_COLUMNS)
+    normalized = normalize_frame(frame, postal_case, repair_zip)
+    reasons = validate_frame(normalized)
+
+    changed = 0
+    for column in RECIPIENT_COLUMNS:
+        differs = (normalized[column] != frame[column]).to_numpy(dtype=bool)
+        changed += int(differs.sum())
+        if apply and differs.any():
+            store.set_column(column, normalized[column].tolist())
+
+    invalid = np.flatnonzero(reasons != "")
+    errors: List[Tuple[int, str]] = [
+        (int(position) + 1, str(reasons[position])) for position in invalid[:MAX_REPORTED_ERRORS]
+    ]
+    return {
+        "rows": len(frame),
+        "valid": len(frame) - len(invalid),
+        "invalid": len(invalid),
+        "normalized": changed,
+        "reasons": dict(Counter(reasons[invalid].tolist())),
+        "errors": errors,
+    }
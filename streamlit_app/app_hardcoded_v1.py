@@ -5,16 +5,59 @@ Beautiful UI with complete endpoint selection and code generation
 
 import streamlit as st
 import json
-import yaml
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List, Optional
-import streamlit.components.v1 as components
+from typing import Dict, Optional
 import os
-import requests
 from dotenv import load_dotenv
+import shutil
 import subprocess
 import sys
+import time
+import pandas as pd
+
+# Make sibling modules importable both under `streamlit run` and as a package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from streamlit_app import core
+from streamlit_app.core import (
+    CODE_TEMPLATES,
+    DEFAULT_API_BASE_URL,
+    INLINE_PAYLOAD_LIMIT,
+    PAYLOAD_FILE_NAME,
+    default_mock_server_url,
+    get_endpoint,
+    load_config,
+    resolve_mock_server,
+    uses_upload,
+    uses_zip_bundle
+)
+from streamlit_app.session_workspace import SessionWorkspace, atomic_write
+from streamlit_app.param_store import DOC_SPEC_FIELDS, PAYMENT_TYPES, ParameterStore
+from streamlit_app.payload_writer import write_payload
+from streamlit_app.job_splitter import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_RECIPIENTS,
+    MANIFEST_FILE,
+    SPLITTABLE_ENDPOINTS,
+    split_jobs
+)
+from streamlit_app.pdf_preflight import SPLIT_ENDPOINTS, preflight
+from streamlit_app.address_store import AddressStore, ENTRY_TYPES, RECIPIENT_COLUMNS
+from streamlit_app.address_validation import validate_store
+from streamlit_app.address_dedup import Deduplicator, dedupe_store, store_frame
+from streamlit_app.static_assets import build_assets, choice_cards, options_key, stylesheet_tag
+from streamlit_app.recipient_editor import apply_editor_delta, page_bounds, page_count
+from streamlit_app.recipient_import import import_recipients
+from streamlit_app.tracing import DEFAULT_TRACE_FILE, RerunTrace, append_trace
+from streamlit_app.metrics import (
+    CODE_EXECUTION_SECONDS,
+    CODE_EXECUTIONS,
+    METRICS,
+    RECOMMENDATIONS,
+    WIZARD_STEP_SECONDS,
+    CallbackCounter,
+    TextfileExporter,
+)
+from streamlit_app.rerun_watchdog import DEFAULT_OUTPUT_FILE as DEFAULT_SLOW_RERUN_FILE, RerunWatchdog
 
 # Load environment variables from .env file
 load_dotenv()
@@ -28,284 +71,64 @@ st.set_page_config(
 )
 
 # Load configuration
-config_path = Path(__file__).parent.parent / "config.yaml"
-if config_path.exists():
-    with open(config_path, "r") as f:
-        CONFIG = yaml.safe_load(f)
-else:
-    CONFIG = {}
+CONFIG = load_config()
 
-# Postman API Integration
-def get_all_postman_collections(api_key):
-    """Get all collections from Postman"""
-    headers = {"X-Api-Key": api_key}
-    collections_url = "https://api.getpostman.com/collections"
-    
-    response = requests.get(collections_url, headers=headers, timeout=5)
-    response.raise_for_status()
-    
-    return response.json()["collections"]
+# Timing spans for this rerun; off (and free) unless tracing.enabled is set in config.yaml
+TRACING = CONFIG.get("tracing", {})
+TRACE = RerunTrace(TRACING.get("enabled", False))
+TRACE_STEP = st.session_state.get("current_step", "q1")
+RERUN_STARTED = time.perf_counter()
 
-def get_all_postman_mock_servers(api_key):
-    """Get all mock servers from Postman"""
-    headers = {"X-Api-Key": api_key}
-    mocks_url = "https://api.getpostman.com/mocks"
-    
-    response = requests.get(mocks_url, headers=headers, timeout=5)
-    response.raise_for_status()
-    
-    return response.json()["mocks"]
+# Stack samples of reruns that go over watchdog.threshold_seconds; off unless watchdog.enabled is set
+WATCHDOG = CONFIG.get("watchdog", {})
+
+@st.cache_resource
+def start_watchdog() -> RerunWatchdog:
+    """One sampler thread per server process, shared by every session"""
+    return RerunWatchdog(
+        threshold_seconds=WATCHDOG.get("threshold_seconds", 2.0),
+        interval_seconds=WATCHDOG.get("sample_interval_seconds", 0.01),
+        output_file=Path(WATCHDOG.get("output_file", DEFAULT_SLOW_RERUN_FILE)),
+    ).start()
 
+WATCH_TOKEN = start_watchdog().watch(TRACE_STEP) if WATCHDOG.get("enabled", False) else None
+
+def warn_postman_error(error: Exception):
+    """Surface a failed Postman lookup in the UI"""
+    st.warning(f"Could not fetch Postman mock servers: {str(error)}")
+
+@TRACE.wrap
 def get_postman_mock_servers():
-    """Fetch mock servers from Postman API with collection association"""
-    # Get workspace type from session state or config
-    workspace_type = st.session_state.get("selected_workspace", 
-                                         CONFIG.get("postman", {}).get("default_workspace", "personal"))
-    
-    # Get appropriate API key
-    if workspace_type == "team":
-        api_key = os.environ.get("POSTMAN_API_KEY_TEAM", "")
-    else:
-        api_key = os.environ.get("POSTMAN_API_KEY_PERSONAL", "")
-    
-    if not api_key or not CONFIG.get("postman", {}).get("enabled", False):
-        return None
-    
-    try:
-        # Get all collections and mocks
-        collections = get_all_postman_collections(api_key)
-        mocks = get_all_postman_mock_servers(api_key)
-        
-        # Create a map of collection UID to collection info
-        collection_map = {col["uid"]: col for col in collections}
-        
-        # Build list of mocks with collection info
-        mock_list = []
-        for mock in mocks:
-            collection_uid = mock.get("collection")
-            collection_name = "Unknown Collection"
-            
-            if collection_uid and collection_uid in collection_map:
-                collection_name = collection_map[collection_uid]["name"]
-            
-            mock_list.append({
-                "name": f"{mock.get('name', 'Unknown')} ({collection_name})",
-                "url": mock.get("mockUrl", f"https://{mock.get('id', '')}.mock.pstmn.io"),
-                "id": mock.get("id", ""),
-                "collection": collection_name,
-                "workspace": workspace_type
-            })
-        
-        return mock_list
-    except Exception as e:
-        st.warning(f"Could not fetch Postman mock servers: {str(e)}")
-        return None
+    """Fetch mock servers for the selected Postman workspace"""
+    return core.get_postman_mock_servers(st.session_state.get("selected_workspace"), CONFIG,
+                                         on_error=warn_postman_error)
 
 # Initialize mock server URL
+@TRACE.wrap
 def initialize_mock_server():
     """Initialize mock server URL from various sources"""
-    # Try Postman API first
-    if CONFIG.get("postman", {}).get("enabled", False):
-        mocks = get_postman_mock_servers()
-        if mocks and len(mocks) > 0:
-            # Use first C2M mock found
-            st.session_state.mock_server_url = mocks[0]["url"]
-            st.session_state.mock_server_name = mocks[0]["name"]
-            return
-    
-    # Check for mock URL file from c2m-api-repo
-    mock_url_file = Path("../c2m-api-repo/postman/postman_mock_url.txt")
-    if mock_url_file.exists():
-        with open(mock_url_file, "r") as f:
-            url = f.read().strip()
-            if url:
-                st.session_state.mock_server_url = url
-                st.session_state.mock_server_name = "From c2m-api-repo"
-                return
-    
-    # Fall back to config default
-    default_url = CONFIG.get("api", {}).get("mock_server_url", "https://cd140b74-ed23-4980-834b-a966ac3393c1.mock.pstmn.io")
-    st.session_state.mock_server_url = default_url
-    st.session_state.mock_server_name = "Default Mock Server"
+    url, name = resolve_mock_server(st.session_state.get("selected_workspace"), CONFIG,
+                                    on_error=warn_postman_error)
+    st.session_state.mock_server_url = url
+    st.session_state.mock_server_name = name
 
 # Initialize on first run
 if "mock_server_url" not in st.session_state:
     initialize_mock_server()
 
-# Custom CSS - Exact copy from original app.py
-st.markdown("""
-<style>
-    /* Main container styling */
-    .main {
-        padding: 0rem 1rem;
-        max-width: 1200px;
-        margin: 0 auto;
-    }
-    
-    /* Reduce default streamlit padding */
-    .block-container {
-        padding-top: 1rem !important;
-        padding-bottom: 1rem !important;
-    }
-    
-    /* Hide default radio buttons */
-    .stRadio > label {
-        font-size: 1.2rem !important;
-        font-weight: 600 !important;
-        color: #1f2937 !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    .stRadio > div {
-        gap: 1rem !important;
-    }
-    
-    .stRadio > div > label {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white !important;
-        padding: 1.5rem !important;
-        border-radius: 15px !important;
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1) !important;
-        border: 2px solid transparent !important;
-        display: block !important;
-        text-align: center !important;
-        font-size: 1.1rem !important;
-        font-weight: 500 !important;
-        margin: 0 !important;
-    }
-    
-    /* Better readability for selectbox options */
-    .stSelectbox label {
-        color: #FF6B35 !important;
-        font-weight: 600 !important;
-    }
-    
-    .stRadio label {
-        color: #FF6B35 !important;
-        font-weight: 600 !important;
-    }
-    
-    .stRadio > div > label:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 20px rgba(0, 0, 0, 0.15) !important;
-    }
-    
-    /* Selected state */
-    .stRadio > div > label[data-baseweb="radio"] > div:first-child {
-        display: none !important;
-    }
-    
-    /* Recommendation box */
-    .recommendation-box {
-        background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%);
-        border: 2px solid #2196f3;
-        border-radius: 20px;
-        padding: 2rem;
-        margin: 2rem 0;
-        box-shadow: 0 8px 25px rgba(33, 150, 243, 0.2);
-        text-align: center;
-    }
-    
-    .endpoint-url {
-        font-family: 'Courier New', monospace;
-        font-size: 1.8rem;
-        font-weight: bold;
-        color: #1976d2;
-        margin: 1rem 0;
-        padding: 1rem;
-        background: white;
-        border-radius: 10px;
-        box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    /* Visual choice cards */
-    .choice-card {
-        background: white;
-        border-radius: 20px;
-        padding: 2rem;
-        text-align: center;
-        transition: all 0.3s ease;
-        cursor: pointer;
-        border: 2px solid transparent;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.08);
-        min-height: 280px;
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-    }
-    
-    .choice-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 25px rgba(0, 0, 0, 0.12);
-        border-color: #667eea;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: aquamarine;
-        border: none;
-        padding: 0.75rem 2rem;
-        font-size: 1rem;
-        font-weight: 600;
-        border-radius: 12px;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
-    }
-    
-    /* Code block styling */
-    .stCodeBlock {
-        border-radius: 15px !important;
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1) !important;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2rem;
-        background: transparent;
-        padding: 0.5rem;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: auto;
-        padding: 0.8rem 2rem;
-        background: white;
-        border: 2px solid #e0e0e0;
-        border-radius: 10px;
-        color: #666;
-        font-weight: 600;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover {
-        border-color: #667eea;
-        color: #667eea;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-color: #667eea;
-    }
-    
-    /* Address input section */
-    .address-entry {
-        background: #f8f9fa;
-        border: 1px solid #dee2e6;
-        border-radius: 10px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_assets():
+    """Build the minified, content-hashed stylesheet bundle once per server process"""
+    return build_assets()
+
+# One short link per rerun instead of the whole stylesheet; the browser
+# fetches the hashed file once. Falls back to inline CSS without static serving.
+with TRACE.span("inject_css"):
+    st.markdown(stylesheet_tag(load_assets()["app.css"], st.get_option("server.enableStaticServing")),
+                unsafe_allow_html=True)
+
+# Recipients shown per page in the address table
+RECIPIENT_PAGE_SIZE = 50
 
 # Initialize session state
 if "current_step" not in st.session_state:
@@ -314,80 +137,53 @@ if "answers" not in st.session_state:
     st.session_state.answers = {}
 if "endpoint" not in st.session_state:
     st.session_state.endpoint = None
-if "level2_params" not in st.session_state:
-    st.session_state.level2_params = {}
-if "address_entries" not in st.session_state:
-    st.session_state.address_entries = []
+if "parameter_store" not in st.session_state:
+    st.session_state.parameter_store = ParameterStore()
+if "address_store" not in st.session_state:
+    st.session_state.address_store = AddressStore()
 
-# Hardcoded endpoint mapping based on QA_TREE_ALL_PATHS.md
-def get_endpoint(answers):
-    """Determine endpoint based on answers - from EBNF file"""
-    doc_type = answers.get("docType")
-    template_usage = answers.get("templateUsage")
-    recipient_style = answers.get("recipientStyle")
-    
-    if doc_type == "single":
-        if template_usage == "true":
-            return "/jobs/single-doc-job-template"  # Use Case 1
-        else:
-            return "/jobs/single-doc"  # Use Case 4
-    elif doc_type == "multi":
-        if template_usage == "true":
-            return "/jobs/multi-docs-job-template"  # Use Case 2
-        else:
-            return "/jobs/multi-doc"  # Use Case 5
-    elif doc_type == "merge":
-        if template_usage == "true":
-            return "/jobs/multi-doc-merge-job-template"  # Use Case 3
-        else:
-            return "/jobs/multi-doc-merge"  # Use Case 6
-    elif doc_type == "pdfSplit":
-        if recipient_style == "addressCapture":
-            return "/jobs/single-pdf-split-addressCapture"  # Use Case 8
-        else:
-            return "/jobs/single-pdf-split"  # Use Case 7
-    return None
+def get_session_workspace() -> SessionWorkspace:
+    """Return this session's private scratch workspace, creating it on first use"""
+    workspace_config = CONFIG.get("workspace", {})
+    root = Path(workspace_config.get("root", "generated_code/sessions"))
+    ttl_seconds = int(workspace_config.get("ttl_minutes", 60)) * 60
+    
+    if "workspace" not in st.session_state:
+        # Sweep abandoned sessions whenever a new one starts
+        SessionWorkspace.cleanup_expired(root, ttl_seconds)
+        st.session_state.workspace = SessionWorkspace(root, ttl_seconds=ttl_seconds)
+    
+    workspace = st.session_state.workspace
+    workspace.touch()
+    return workspace
+
+def get_param_store() -> ParameterStore:
+    """Return this session's Level 2 parameter store"""
+    if "parameter_store" not in st.session_state:
+        st.session_state.parameter_store = ParameterStore()
+    return st.session_state.parameter_store
 
+def param_widget(widget, *args, key: str, **kwargs):
+    """Render a param_* widget and write its value straight into the parameter store"""
+    value = widget(*args, key=key, **kwargs)
+    get_param_store().set_widget(key, value)
+    return value
+
+@TRACE.wrap
 def render_visual_choice(field, options, current_value=None):
     """Render visual icon-based choice buttons - from original app"""
-    # Icon mapping
-    icons = {
-        "single": "📄",
-        "multi": "📚", 
-        "merge": "🔗",
-        "pdfSplit": "✂️",
-        "true": "✅",
-        "false": "❌",
-        "explicit": "📝",
-        "template": "📋",
-        "addressCapture": "🔍"
-    }
+    # Card markup is cached per option set and selection; styles come from the bundle
+    cards = choice_cards(field, options_key(options), current_value)
     
     # First, render all cards in a row
     card_cols = st.columns(len(options))
     
-    for idx, (col, opt) in enumerate(zip(card_cols, options)):
+    for col, card_html in zip(card_cols, cards):
         with col:
-            # Get icon
-            icon = icons.get(opt["value"], "📌")
-            
-            # Check if selected
-            is_selected = current_value == opt["value"]
-            
-            # Create card
-            card_html = f"""
-            <div class="choice-card" style="{'border-color: #667eea; background: linear-gradient(135deg, #f3f4ff 0%, #e9ecff 100%);' if is_selected else ''}">
-                <div>
-                    <div style="font-size: 72px; margin-bottom: 15px;">{icon}</div>
-                    <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px; color: {'#667eea' if is_selected else '#1f2937'};">{opt['label']}</div>
-                    <div style="font-size: 14px; color: #6b7280; line-height: 1.4;">{opt.get('description', '')}</div>
-                </div>
-            </div>
-            """
             st.markdown(card_html, unsafe_allow_html=True)
     
     # Spacing
-    st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
+    st.markdown('<div class="choice-spacer"></div>', unsafe_allow_html=True)
     
     # Then render buttons
     button_cols = st.columns(len(options))
@@ -407,6 +203,7 @@ def render_visual_choice(field, options, current_value=None):
     
     return selected
 
+@TRACE.wrap
 def render_level1_questions():
     """Render Level 1 questions"""
     st.header("🎯 Find Your Perfect Endpoint")
@@ -470,6 +267,7 @@ def render_level1_questions():
             else:
                 # Done with Level 1
                 st.session_state.endpoint = get_endpoint(st.session_state.answers)
+                RECOMMENDATIONS.inc(endpoint=st.session_state.endpoint, source="app")
                 st.session_state.current_step = "level2"
             st.rerun()
     
@@ -487,11 +285,17 @@ def render_level1_questions():
         if selected:
             st.session_state.answers["personalized"] = selected
             st.session_state.endpoint = get_endpoint(st.session_state.answers)
+            RECOMMENDATIONS.inc(endpoint=st.session_state.endpoint, source="app")
             st.session_state.current_step = "level2"
             st.rerun()
 
+@TRACE.wrap
 def render_document_specification(key_suffix=""):
-    """Helper to render document specification with all 5 EBNF options"""
+    """Helper to choose one of the 5 EBNF document specification methods
+    
+    Rendered outside the Level 2 form: the choice decides which inputs exist,
+    so it has to take effect immediately.
+    """
     # Show info about all options
     with st.expander("ℹ️ Document Specification Options", expanded=False):
         st.markdown("""
@@ -505,138 +309,254 @@ def render_document_specification(key_suffix=""):
     
     doc_type = st.selectbox(
         "How will you specify the document?",
-        ["Document ID", "External URL", "Upload Request + Name", "Zip + Document Name", "Upload Request + Zip + Name"],
+        list(DOC_SPEC_FIELDS),
         key=f"doc_spec_{key_suffix}",
         help="Select one of the 5 EBNF-defined methods"
     )
     
-    # Render appropriate inputs based on selection
+    # Forget values typed into inputs this method hides
+    get_param_store().retain("document", DOC_SPEC_FIELDS[doc_type])
+    
+    return doc_type
+
+@TRACE.wrap
+def render_document_fields(doc_type):
+    """Render the inputs for the chosen document specification method"""
+    st.subheader("📄 Document")
     if doc_type == "Document ID":
-        st.text_input("📄 Document ID", key="param_doc_id", placeholder="doc_12345")
+        param_widget(st.text_input, "📄 Document ID", key="param_doc_id", placeholder="doc_12345")
     elif doc_type == "External URL":
-        st.text_input("🌐 External URL", key="param_doc_url", placeholder="https://example.com/document.pdf")
+        param_widget(
+            st.text_input, "🌐 External URL", key="param_doc_url",
+            placeholder="https://example.com/document.pdf"
+        )
     elif doc_type == "Upload Request + Name":
         col1, col2 = st.columns(2)
         with col1:
-            st.text_input("Upload Request ID", key="param_upload_id", placeholder="upload_789")
+            param_widget(st.text_input, "Upload Request ID", key="param_upload_id", placeholder="upload_789")
         with col2:
-            st.text_input("Document Name", key="param_doc_name", placeholder="contract.pdf")
+            param_widget(st.text_input, "Document Name", key="param_doc_name", placeholder="contract.pdf")
     elif doc_type == "Zip + Document Name":
         col1, col2 = st.columns(2)
         with col1:
-            st.text_input("Zip ID", key="param_zip_id", placeholder="zip_456")
+            param_widget(st.text_input, "Zip ID", key="param_zip_id", placeholder="zip_456")
         with col2:
-            st.text_input("Document Name", key="param_doc_name", placeholder="contract.pdf")
+            param_widget(st.text_input, "Document Name", key="param_doc_name", placeholder="contract.pdf")
     else:  # Upload Request + Zip + Name
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.text_input("Upload Request ID", key="param_upload_id", placeholder="upload_789")
+            param_widget(st.text_input, "Upload Request ID", key="param_upload_id", placeholder="upload_789")
         with col2:
-            st.text_input("Zip ID", key="param_zip_id", placeholder="zip_456")
+            param_widget(st.text_input, "Zip ID", key="param_zip_id", placeholder="zip_456")
         with col3:
-            st.text_input("Document Name", key="param_doc_name", placeholder="contract.pdf")
+            param_widget(st.text_input, "Document Name", key="param_doc_name", placeholder="contract.pdf")
+
+def record_postage_saved(stats):
+    """Add a deduplication run to the session's running total of mail pieces saved"""
+    if stats:
+        st.session_state.postage_pieces_saved = st.session_state.get("postage_pieces_saved", 0) + stats["pieces_saved"]
+        st.session_state.lists_skipped = st.session_state.get("lists_skipped", 0) + stats["lists_skipped"]
+
+@TRACE.wrap
+def render_recipient_import(store: AddressStore):
+    """Bulk-load recipients from an uploaded CSV or JSONL file
     
-    return doc_type
+    Each upload is imported once, in chunks, straight into the columnar
+    store; rows that fail validation are reported instead of added, and so
+    are duplicates of recipients already in the store or earlier in the file.
+    """
+    uploaded = st.file_uploader(
+        "📥 Import recipients (CSV or JSONL)",
+        type=["csv", "jsonl", "ndjson"],
+        key="recipient_upload",
+        help="Columns: type, value, firstName, lastName, address1, address2, city, state, zip, country"
+    )
+    skip_duplicates = st.checkbox("Skip duplicate recipients", value=True, key="import_skip_duplicates",
+                                  help="Also skips near-exact copies, e.g. 1 Main Street Apt 2 vs 1 MAIN ST #2")
+    
+    if uploaded is not None:
+        signature = (uploaded.name, uploaded.size)
+        if st.session_state.get("recipient_import_signature") != signature:
+            fmt = "csv" if uploaded.name.lower().endswith(".csv") else "jsonl"
+            deduplicator = None
+            if skip_duplicates:
+                deduplicator = Deduplicator()
+                if len(store):
+                    deduplicator.remember(store_frame(store))
+            try:
+                report = import_recipients(uploaded, fmt, store, deduplicator=deduplicator)
+                st.session_state.recipient_import_report = report
+                record_postage_saved(report.get("deduplication"))
+                get_param_store().mark_dirty("recipients")
+            except ValueError as e:
+                st.session_state.recipient_import_report = {"error": str(e)}
+            st.session_state.recipient_import_signature = signature
+    
+    report = st.session_state.get("recipient_import_report")
+    if report:
+        if "error" in report:
+            st.error(f"❌ Import failed: {report['error']}")
+        else:
+            st.success(f"✅ Imported {report['imported']:,} of {report['rows']:,} rows")
+            if report["rejected"]:
+                st.warning(f"⚠️ {report['rejected']:,} rows rejected")
+                st.dataframe(pd.DataFrame(report["errors"], columns=["row", "reason"]),
+                             hide_index=True, use_container_width=True)
+
+@TRACE.wrap
+def render_address_validation(store: AddressStore) -> bool:
+    """Normalize and validate every stored recipient on demand
+    
+    Runs as whole-column operations over the store, so checking 100k
+    recipients takes a fraction of a second. Returns True when the store
+    was rewritten and the editor page needs fresh data.
+    """
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        postal_case = st.checkbox("UPPERCASE address lines", key="validate_postal_case",
+                                  help="USPS prefers uppercase address lines and city")
+    with col2:
+        repair_zip = st.checkbox("Restore leading ZIP zeros", key="validate_repair_zip",
+                                 help="Turn 4-digit ZIPs (e.g. 2134 from a spreadsheet) into 02134")
+    with col3:
+        run = st.form_submit_button("🧹 Validate & Normalize", use_container_width=True)
+    with col4:
+        dedupe = st.form_submit_button("♻️ Remove Duplicates", use_container_width=True)
+    
+    changed = False
+    if dedupe:
+        report = dedupe_store(store)
+        record_postage_saved(report)
+        if report["dropped"]:
+            get_param_store().mark_dirty("recipients")
+            changed = True
+        st.session_state.address_dedup_report = report
+    
+    report = st.session_state.get("address_dedup_report")
+    if report:
+        st.info(f"♻️ {report['duplicates']:,} exact and {report['near_duplicates']:,} near-exact duplicates "
+                f"removed from {report['checked']:,} recipients")
+    
+    if run:
+        report = validate_store(store, postal_case=postal_case, repair_zip=repair_zip)
+        if report["normalized"]:
+            get_param_store().mark_dirty("recipients")
+            changed = True
+        st.session_state.address_validation_report = report
+    
+    report = st.session_state.get("address_validation_report")
+    if report:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Valid", f"{report['valid']:,}")
+        col2.metric("Invalid", f"{report['invalid']:,}")
+        col3.metric("Cells normalized", f"{report['normalized']:,}")
+        if report["invalid"]:
+            st.dataframe(pd.DataFrame(sorted(report["reasons"].items()), columns=["reason", "rows"]),
+                         hide_index=True, use_container_width=True)
+            st.dataframe(pd.DataFrame(report["errors"], columns=["row", "reason"]),
+                         hide_index=True, use_container_width=True)
+    return changed
 
+@TRACE.wrap
 def render_address_inputs():
-    """Render dynamic address input section"""
-    st.subheader("📮 Recipient Addresses")
+    """Render the paginated recipient table inside the Level 2 form
     
-    # Add new recipient button
-    if st.button("➕ Add Recipient", use_container_width=True):
-        st.session_state.address_entries.append({
-            'type': 'addressListId',
-            'value': '',
-            'address_data': {}
-        })
-        st.rerun()
+    Only the current page is sent to the browser, and edits come back as a
+    delta of changed, added and deleted rows that is applied on submit, so
+    the cost of an edit does not depend on how many recipients exist.
+    """
+    st.subheader("📮 Recipient Addresses")
+    store = st.session_state.address_store
+    
+    render_recipient_import(store)
+    
+    # Apply the edits committed by the last submit to the page they were made on
+    editor_key = f"recipient_editor_{st.session_state.get('recipient_editor_version', 0)}"
+    delta = st.session_state.get(editor_key)
+    if delta and any(delta.get(part) for part in ("edited_rows", "added_rows", "deleted_rows")):
+        start, end = st.session_state.get("recipient_page_bounds", (0, 0))
+        apply_editor_delta(store, start, end, delta)
+        get_param_store().mark_dirty("recipients")
+        # A fresh editor key drops the applied delta along with the old widget
+        st.session_state.recipient_editor_version = st.session_state.get("recipient_editor_version", 0) + 1
+        editor_key = f"recipient_editor_{st.session_state.recipient_editor_version}"
+    
+    if render_address_validation(store):
+        st.session_state.recipient_editor_version = st.session_state.get("recipient_editor_version", 0) + 1
+        editor_key = f"recipient_editor_{st.session_state.recipient_editor_version}"
+    
+    pages = page_count(len(store), RECIPIENT_PAGE_SIZE)
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="recipient_page")
+    start, end = page_bounds(int(page), len(store), RECIPIENT_PAGE_SIZE)
+    st.session_state.recipient_page_bounds = (start, end)
+    with col2:
+        if len(store):
+            st.caption(f"Showing {start + 1}-{end} of {len(store)} recipients ({pages} pages)")
+        else:
+            st.caption("No recipients yet - add rows to the table below")
+    
+    st.data_editor(
+        pd.DataFrame(store.page(start, end), columns=RECIPIENT_COLUMNS),
+        key=editor_key,
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "type": st.column_config.SelectboxColumn(
+                "Type",
+                options=ENTRY_TYPES,
+                default="newAddress",
+                help="addressListId: Address List ID, addressId: Single Address ID, newAddress: New Address"
+            ),
+            "value": st.column_config.TextColumn("List / Address ID", help="Used for addressListId and addressId rows"),
+            "country": st.column_config.TextColumn("Country", default="USA")
+        }
+    )
     
-    # Show existing entries
-    for idx, entry in enumerate(st.session_state.address_entries):
-        with st.container():
-            st.markdown(f'<div class="address-entry">', unsafe_allow_html=True)
-            
-            col1, col2, col3 = st.columns([3, 7, 1])
-            
-            with col1:
-                entry['type'] = st.selectbox(
-                    "Type",
-                    ["addressListId", "addressId", "newAddress"],
-                    format_func=lambda x: {
-                        "addressListId": "Address List ID",
-                        "addressId": "Single Address ID",
-                        "newAddress": "New Address"
-                    }[x],
-                    key=f"addr_type_{idx}",
-                    index=["addressListId", "addressId", "newAddress"].index(entry['type'])
-                )
-            
-            with col2:
-                if entry['type'] == "addressListId":
-                    entry['value'] = st.text_input(
-                        "List ID",
-                        key=f"addr_value_{idx}",
-                        placeholder="list_12345",
-                        value=entry.get('value', '')
-                    )
-                elif entry['type'] == "addressId":
-                    entry['value'] = st.text_input(
-                        "Address ID",
-                        key=f"addr_value_{idx}",
-                        placeholder="addr_67890",
-                        value=entry.get('value', '')
-                    )
-                else:  # newAddress
-                    with st.expander("📝 Enter Address Details", expanded=True):
-                        addr_col1, addr_col2 = st.columns(2)
-                        
-                        with addr_col1:
-                            entry['address_data']['firstName'] = st.text_input(
-                                "First Name",
-                                key=f"fname_{idx}"
-                            )
-                            entry['address_data']['address1'] = st.text_input(
-                                "Address Line 1",
-                                key=f"addr1_{idx}"
-                            )
-                            entry['address_data']['city'] = st.text_input(
-                                "City",
-                                key=f"city_{idx}"
-                            )
-                            entry['address_data']['zip'] = st.text_input(
-                                "ZIP Code",
-                                key=f"zip_{idx}"
-                            )
-                        
-                        with addr_col2:
-                            entry['address_data']['lastName'] = st.text_input(
-                                "Last Name",
-                                key=f"lname_{idx}"
-                            )
-                            entry['address_data']['address2'] = st.text_input(
-                                "Address Line 2 (optional)",
-                                key=f"addr2_{idx}"
-                            )
-                            entry['address_data']['state'] = st.text_input(
-                                "State",
-                                key=f"state_{idx}"
-                            )
-                            entry['address_data']['country'] = st.text_input(
-                                "Country",
-                                key=f"country_{idx}",
-                                value="USA"
-                            )
-            
-            with col3:
-                if st.button("🗑️", key=f"del_{idx}", help="Remove this address"):
-                    st.session_state.address_entries.pop(idx)
-                    st.rerun()
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+    st.form_submit_button("💾 Apply Recipient Changes", use_container_width=True)
+
+@TRACE.wrap
+def render_payment_fields(payment_type):
+    """Render the inputs for the chosen payment method"""
+    if payment_type == "CREDIT_CARD":
+        col1, col2 = st.columns(2)
+        with col1:
+            param_widget(st.text_input, "Card Number", key="param_cardnum", placeholder="1234 5678 9012 3456")
+            param_widget(st.text_input, "Expiration", key="param_exp", placeholder="MM/YY")
+        with col2:
+            param_widget(
+                st.selectbox, "Card Type", ["visa", "mastercard", "discover", "americanExpress"],
+                key="param_cardtype"
+            )
+            param_widget(st.text_input, "CVV", key="param_cvv", placeholder="123")
+    elif payment_type == "INVOICE":
+        param_widget(st.text_input, "Invoice Number", key="param_invoice_num", placeholder="INV-12345")
+    elif payment_type == "ACH":
+        col1, col2 = st.columns(2)
+        with col1:
+            param_widget(st.text_input, "Routing Number", key="param_routing", placeholder="123456789")
+        with col2:
+            param_widget(st.text_input, "Account Number", key="param_account", placeholder="9876543210")
+    elif payment_type == "USER_CREDIT":
+        param_widget(
+            st.number_input, "Credit Amount", key="param_credit_amount",
+            min_value=0.0, step=0.01, format="%.2f"
+        )
+    elif payment_type in ["APPLE_PAY", "GOOGLE_PAY"]:
+        st.info(f"💳 {payment_type.replace('_', ' ').title()} will be handled by the mobile wallet")
 
+@TRACE.wrap
 def render_level2_parameters():
-    """Render Level 2 parameter collection"""
+    """Render Level 2 parameter collection
+    
+    Choices that change which inputs exist (document source and method,
+    payment method) rerun immediately. Everything else lives in one form, so
+    typing costs no reruns and the whole request is committed on submit.
+    """
     endpoint = st.session_state.endpoint
+    recipient_style = st.session_state.answers.get("recipientStyle")
     
     # Show recommendation
     st.markdown(f"""
@@ -648,11 +568,11 @@ def render_level2_parameters():
     
     st.header("📝 Provide Required Parameters")
     
+    doc_method = None
+    needs_addresses = False
+    
     # Hardcoded parameter forms based on endpoint
     if endpoint == "/jobs/single-doc-job-template":
-        # First check Q3 answer about recipient style
-        recipient_style = st.session_state.answers.get("recipientStyle")
-        
         if recipient_style == "template":
             # Recipients come from template - only question is about document
             st.info("📋 Recipients will be provided by the template/mailing list")
@@ -664,7 +584,7 @@ def render_level2_parameters():
             )
             
             if doc_option == "Document from API call":
-                render_document_specification("template_recipients")
+                doc_method = render_document_specification("template_recipients")
             # else document comes from template - no input needed
             
         elif recipient_style == "explicit":
@@ -679,451 +599,296 @@ def render_level2_parameters():
             )
             
             if doc_option == "Document from API call":
-                render_document_specification("explicit_recipients")
+                doc_method = render_document_specification("explicit_recipients")
             
             # Always need addresses when explicit
-            render_address_inputs()
+            needs_addresses = True
             
         else:  # addressCapture
             st.info("🔍 Recipients will be extracted from the document")
-            render_document_specification("address_capture")
-        
-        # Always need template ID and optionally name
-        col1, col2 = st.columns(2)
-        with col1:
-            st.text_input("📋 Job Template ID", key="param_template_id", placeholder="template_12345", help="Required: Unique identifier for the template")
-        with col2:
-            st.text_input("📝 Job Template Name", key="param_template_name", placeholder="My Template", help="Optional: Human-readable name for the template")
+            doc_method = render_document_specification("address_capture")
     
     elif endpoint == "/jobs/single-doc":
-        render_document_specification("single_doc")
-        
-        if st.session_state.answers.get("recipientStyle") == "explicit":
-            render_address_inputs()
-        
-        # Job options
-        col1, col2 = st.columns(2)
-        with col1:
-            st.selectbox("Document Class", ["businessLetter", "personalLetter"], key="param_docclass")
-            st.selectbox("Layout", ["portrait", "landscape"], key="param_layout")
-            st.selectbox("Mail Class", ["firstClassMail", "priorityMail", "largeEnvelope"], key="param_mailclass")
-        with col2:
-            st.selectbox("Paper Type", ["letter", "legal", "postcard"], key="param_paper")
-            st.selectbox("Print Option", ["color", "grayscale", "none"], key="param_print")
-            st.selectbox("Envelope", ["flat", "windowedFlat", "letter", "legal", "postcard"], key="param_envelope")
+        doc_method = render_document_specification("single_doc")
+        needs_addresses = recipient_style == "explicit"
     
     # Add more endpoint-specific forms...
     
-    # Payment details (common to all)
-    st.subheader("💳 Payment Details")
-    payment_type = st.selectbox(
-        "Payment Method",
-        ["CREDIT_CARD", "INVOICE", "ACH", "USER_CREDIT", "APPLE_PAY", "GOOGLE_PAY"],
+    # Payment method (common to all)
+    payment_type = param_widget(
+        st.selectbox,
+        "💳 Payment Method",
+        PAYMENT_TYPES,
         key="param_payment"
     )
     
-    if payment_type == "CREDIT_CARD":
-        col1, col2 = st.columns(2)
-        with col1:
-            st.text_input("Card Number", key="param_cardnum", placeholder="1234 5678 9012 3456")
-            st.text_input("Expiration", key="param_exp", placeholder="MM/YY")
-        with col2:
-            st.selectbox("Card Type", ["visa", "mastercard", "discover", "americanExpress"], key="param_cardtype")
-            st.text_input("CVV", key="param_cvv", placeholder="123")
-    elif payment_type == "INVOICE":
-        st.text_input("Invoice Number", key="param_invoice_num", placeholder="INV-12345")
-    elif payment_type == "ACH":
-        col1, col2 = st.columns(2)
-        with col1:
-            st.text_input("Routing Number", key="param_routing", placeholder="123456789")
-        with col2:
-            st.text_input("Account Number", key="param_account", placeholder="9876543210")
-    elif payment_type == "USER_CREDIT":
-        st.number_input("Credit Amount", key="param_credit_amount", min_value=0.0, step=0.01, format="%.2f")
-    elif payment_type in ["APPLE_PAY", "GOOGLE_PAY"]:
-        st.info(f"💳 {payment_type.replace('_', ' ').title()} will be handled by the mobile wallet")
-    
-    # Tags
-    st.text_input("🏷️ Tags (comma-separated)", key="param_tags", placeholder="campaign2024, bulk-mail")
-    
-    # Generate button
-    if st.button("🚀 Generate API Call & Code", type="primary", use_container_width=True):
-        st.session_state.current_step = "generate"
-        st.rerun()
-
-def generate_api_call():
-    """Generate API call and code"""
-    endpoint = st.session_state.endpoint
-    
-    # Build request body
-    body = {}
-    
-    # Store params in session state first
-    for key in st.session_state:
-        if key.startswith("param_"):
-            st.session_state.level2_params[key] = st.session_state[key]
-    
-    # Add document based on type - documentSourceIdentifier is a single value OR object
-    if st.session_state.level2_params.get("param_doc_id"):
-        body["documentSourceIdentifier"] = st.session_state.level2_params["param_doc_id"]
-    elif st.session_state.level2_params.get("param_doc_url"):
-        body["documentSourceIdentifier"] = st.session_state.level2_params["param_doc_url"]
-    elif st.session_state.level2_params.get("param_upload_id") and st.session_state.level2_params.get("param_doc_name"):
-        if st.session_state.level2_params.get("param_zip_id"):
-            # Upload + Zip + Name
-            body["documentSourceIdentifier"] = {
-                "uploadRequestId": st.session_state.level2_params["param_upload_id"],
-                "zipId": st.session_state.level2_params["param_zip_id"],
-                "documentName": st.session_state.level2_params["param_doc_name"]
-            }
-        else:
-            # Upload + Name
-            body["documentSourceIdentifier"] = {
-                "uploadRequestId": st.session_state.level2_params["param_upload_id"],
-                "documentName": st.session_state.level2_params["param_doc_name"]
-            }
-    elif st.session_state.level2_params.get("param_zip_id") and st.session_state.level2_params.get("param_doc_name"):
-        # Zip + Name
-        body["documentSourceIdentifier"] = {
-            "zipId": st.session_state.level2_params["param_zip_id"],
-            "documentName": st.session_state.level2_params["param_doc_name"]
-        }
-    
-    # Add recipients
-    if st.session_state.address_entries:
-        recipients = []
-        for entry in st.session_state.address_entries:
-            if entry['type'] == 'addressListId' and entry.get('value'):
-                recipients.append({"addressListId": entry['value']})
-            elif entry['type'] == 'addressId' and entry.get('value'):
-                recipients.append({"addressId": entry['value']})
-            elif entry['type'] == 'newAddress' and entry.get('address_data'):
-                addr = entry['address_data']
-                if addr.get('firstName') and addr.get('lastName'):
-                    recipients.append({
-                        "recipientAddress": {
-                            "firstName": addr['firstName'],
-                            "lastName": addr['lastName'],
-                            "address1": addr.get('address1', ''),
-                            "city": addr.get('city', ''),
-                            "state": addr.get('state', ''),
-                            "zip": addr.get('zip', ''),
-                            "country": addr.get('country', 'USA')
-                        }
-                    })
+    with st.form("level2_form"):
+        if doc_method:
+            render_document_fields(doc_method)
         
-        if recipients:
-            body["recipientAddressSources"] = recipients
-    
-    # Add template - prefer ID over name
-    if st.session_state.level2_params.get("param_template_id"):
-        body["jobTemplate"] = st.session_state.level2_params["param_template_id"]
-    elif st.session_state.level2_params.get("param_template_name"):
-        body["jobTemplate"] = st.session_state.level2_params["param_template_name"]
-    
-    # Add payment details with proper structure
-    if st.session_state.level2_params.get("param_payment"):
-        payment_type = st.session_state.level2_params["param_payment"]
-        payment_details = {"type": payment_type}
+        if needs_addresses:
+            render_address_inputs()
         
-        if payment_type == "CREDIT_CARD":
-            if st.session_state.level2_params.get("param_cardnum"):
-                payment_details["creditCardDetails"] = {
-                    "cardNumber": st.session_state.level2_params.get("param_cardnum", ""),
-                    "cardType": st.session_state.level2_params.get("param_cardtype", ""),
-                    "expirationDate": st.session_state.level2_params.get("param_exp", ""),
-                    "cvv": st.session_state.level2_params.get("param_cvv", "")
-                }
-        elif payment_type == "INVOICE":
-            if st.session_state.level2_params.get("param_invoice_num"):
-                payment_details["invoiceDetails"] = {
-                    "invoiceNumber": st.session_state.level2_params["param_invoice_num"]
-                }
-        elif payment_type == "ACH":
-            if st.session_state.level2_params.get("param_routing"):
-                payment_details["achDetails"] = {
-                    "routingNumber": st.session_state.level2_params.get("param_routing", ""),
-                    "accountNumber": st.session_state.level2_params.get("param_account", "")
-                }
-        elif payment_type == "USER_CREDIT":
-            if st.session_state.level2_params.get("param_credit_amount"):
-                payment_details["creditAmount"] = st.session_state.level2_params["param_credit_amount"]
+        if endpoint == "/jobs/single-doc-job-template":
+            # Always need template ID and optionally name
+            col1, col2 = st.columns(2)
+            with col1:
+                param_widget(
+                    st.text_input, "📋 Job Template ID", key="param_template_id",
+                    placeholder="template_12345", help="Required: Unique identifier for the template"
+                )
+            with col2:
+                param_widget(
+                    st.text_input, "📝 Job Template Name", key="param_template_name",
+                    placeholder="My Template", help="Optional: Human-readable name for the template"
+                )
         
-        body["paymentDetails"] = payment_details
-    
-    # Add tags
-    if st.session_state.level2_params.get("param_tags"):
-        tags = [t.strip() for t in st.session_state.level2_params["param_tags"].split(",")]
-        if tags:
-            body["tags"] = tags
+        elif endpoint == "/jobs/single-doc":
+            # Job options
+            col1, col2 = st.columns(2)
+            with col1:
+                param_widget(st.selectbox, "Document Class", ["businessLetter", "personalLetter"], key="param_docclass")
+                param_widget(st.selectbox, "Layout", ["portrait", "landscape"], key="param_layout")
+                param_widget(
+                    st.selectbox, "Mail Class", ["firstClassMail", "priorityMail", "largeEnvelope"],
+                    key="param_mailclass"
+                )
+            with col2:
+                param_widget(st.selectbox, "Paper Type", ["letter", "legal", "postcard"], key="param_paper")
+                param_widget(st.selectbox, "Print Option", ["color", "grayscale", "none"], key="param_print")
+                param_widget(
+                    st.selectbox, "Envelope", ["flat", "windowedFlat", "letter", "legal", "postcard"],
+                    key="param_envelope"
+                )
+        
+        # Payment details
+        st.subheader("💳 Payment Details")
+        render_payment_fields(payment_type)
+        
+        # Tags
+        param_widget(
+            st.text_input, "🏷️ Tags (comma-separated)", key="param_tags",
+            placeholder="campaign2024, bulk-mail"
+        )
+        
+        # Generate button submits the whole form in a single rerun
+        generate = st.form_submit_button("🚀 Generate API Call & Code", type="primary", use_container_width=True)
     
-    return body
+    if generate:
+        st.session_state.current_step = "generate"
+        st.rerun()
 
-def generate_full_python_code(endpoint: str, body: dict) -> str:
-    """Generate complete Python code with authentication flow"""
-    endpoint_name = endpoint.replace("/", "_").strip("_")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Define auth service URLs
-    AUTH_BASE_URL = "https://j0dos52r5e.execute-api.us-east-1.amazonaws.com/dev"
-    # Get API base URL from session state (set by Postman integration) or use default
-    API_BASE_URL = st.session_state.get('mock_server_url', "https://cd140b74-ed23-4980-834b-a966ac3393c1.mock.pstmn.io")
+@TRACE.wrap
+def generate_api_call():
+    """Generate the request body preview and the total recipient count
     
-    return f'''#!/usr/bin/env python3
-"""
-C2M API - {endpoint}
-Generated: {timestamp}
-"""
+    Only the sections whose parameters changed are rebuilt, and the body
+    carries at most the first few recipients - the complete body goes to
+    the payload file.
+    """
+    return get_param_store().preview_body(st.session_state.address_store)
 
-import requests
-import json
-from typing import Dict, Any
+@TRACE.wrap
+def write_payload_file(workspace: SessionWorkspace) -> dict:
+    """Stream the full request body to the workspace payload file when parameters changed"""
+    store = get_param_store()
+    payload = st.session_state.get("payload_info")
+    if payload and payload["revision"] == store.revision and Path(payload["path"]).exists():
+        return payload
+    
+    with workspace.open_atomic(PAYLOAD_FILE_NAME, binary=True) as f:
+        stats = write_payload(f, store.iter_body(st.session_state.address_store))
+    
+    payload = {"path": workspace.path / PAYLOAD_FILE_NAME, "bytes": stats["bytes"], "revision": store.revision}
+    st.session_state.payload_info = payload
+    return payload
 
-# Configuration
-API_BASE_URL = "{API_BASE_URL}"  # Mock server or production API endpoint
-AUTH_BASE_URL = "{AUTH_BASE_URL}"  # C2M Auth service (always use this)
-# Note: Using test credentials for the mock server
-CLIENT_ID = "test-client-123"  # Replace with your client ID if using production
-CLIENT_SECRET = "super-secret-password-123"  # Replace with your client secret if using production
+def get_api_base_url() -> str:
+    """API base URL for generated code - set by Postman integration or the default mock"""
+    return st.session_state.get('mock_server_url', DEFAULT_API_BASE_URL)
 
+@TRACE.wrap
+def generate_full_python_code(endpoint: str, body: dict, payload_file: Optional[str] = None) -> str:
+    """Generate complete Python code with authentication flow, plus the document upload if needed"""
+    return core.generate_full_python_code(endpoint, body, payload_file, get_api_base_url())
 
-def print_request(method: str, url: str, headers: Dict, body: Any = None):
-    """Pretty print HTTP request"""
-    print("\\n" + "="*60)
-    print("📤 REQUEST")
-    print("="*60)
-    print(f"{{method}} {{url}}")
-    print("\\nHEADERS:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization' and len(value) > 50:
-            print(f"  {{key}}: Bearer {{value[7:27]}}...")
-        else:
-            print(f"  {{key}}: {{value}}")
-    if body:
-        print("\\nBODY:")
-        print(json.dumps(body, indent=2))
-    print("="*60)
+@TRACE.wrap
+def generate_python_preview(endpoint: str, body: dict, payload_file: Optional[str] = None) -> str:
+    """Generate the short Python snippet shown in the Python tab"""
+    return core.generate_python_preview(endpoint, body, payload_file, get_api_base_url())
 
-def print_response(response: requests.Response):
-    """Pretty print HTTP response"""
-    print("\\n" + "-"*60)
-    print("📥 RESPONSE")
-    print("-"*60)
-    print(f"Status: {{response.status_code}} {{response.reason}}")
-    print("\\nHEADERS:")
-    for key, value in response.headers.items():
-        print(f"  {{key}}: {{value}}")
-    print("\\nBODY:")
-    try:
-        print(json.dumps(response.json(), indent=2))
-    except:
-        print(response.text)
-    print("-"*60 + "\\n")
+@TRACE.wrap
+def generate_javascript_preview(endpoint: str, body: dict, payload_file: Optional[str] = None) -> str:
+    """Generate JavaScript fetch example"""
+    return core.generate_javascript_preview(endpoint, body, payload_file, get_api_base_url())
 
-def revoke_existing_tokens(client_id: str, client_secret: str):
-    """Revoke any existing tokens to ensure fresh authentication"""
-    revoke_url = f"{{AUTH_BASE_URL}}/auth/tokens/revoke"
-    
-    print("\\n🔄 Attempting to revoke any existing tokens...")
-    
-    headers = {{
-        "Content-Type": "application/json"
-    }}
-    
-    # Try to revoke using client credentials
-    payload = {{
-        "client_id": client_id,
-        "client_secret": client_secret
-    }}
-    
-    print_request("POST", revoke_url, headers, payload)
-    
-    try:
-        response = requests.post(revoke_url, json=payload, headers=headers)
-        print_response(response)
-        if response.status_code == 200:
-            print("✅ Existing tokens revoked successfully")
-        else:
-            print("⚠️  Token revocation returned status:", response.status_code)
-    except Exception as e:
-        print(f"⚠️  Could not revoke tokens: {{e}}")
+@TRACE.wrap
+def generate_curl_command(endpoint: str, body: dict, payload_file: Optional[str] = None) -> str:
+    """Generate cURL commands including the token exchange"""
+    return core.generate_curl_command(endpoint, body, payload_file, get_api_base_url())
 
-def get_access_token(client_id: str, client_secret: str) -> str:
-    """Get an access token using client credentials"""
-    # First, revoke any existing tokens
-    revoke_existing_tokens(client_id, client_secret)
-    
-    # Step 1: Get long-term token
-    print("\\n🔐 Getting long-term token...")
-    auth_url = f"{{AUTH_BASE_URL}}/auth/tokens/long"
-    
-    if "mock.pstmn.io" in API_BASE_URL:
-        print("📍 Using mock server for API calls")
-        print("🔐 Getting fresh tokens from C2M Auth service...")
-    
-    headers = {{
-        "Content-Type": "application/json"
-    }}
-    
-    payload = {{
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "client_secret": client_secret
-    }}
-    
-    print_request("POST", auth_url, headers, payload)
-    
-    try:
-        response = requests.post(auth_url, json=payload, headers=headers)
-        print_response(response)
-        response.raise_for_status()
-        
-        long_token_data = response.json()
-        long_token = long_token_data.get("access_token", "")
-        
-        print("\\n✅ Long-term token obtained!")
-        print(f"🔑 Long token (30-90 days): {{long_token[:30]}}...")
-        print(f"⏱️  Expires in: {{long_token_data.get('expires_in', 'unknown')}} seconds")
-        
-        # Step 2: Exchange for short-term token
-        print("\\n🔄 Exchanging for short-term token...")
-        short_url = f"{{AUTH_BASE_URL}}/auth/tokens/short"
-        
-        short_headers = {{
-            "Authorization": f"Bearer {{long_token}}",
-            "Content-Type": "application/json"
-        }}
-        
-        short_payload = {{}}  # Can optionally narrow scopes here
-        
-        print_request("POST", short_url, short_headers, short_payload)
-        
-        response = requests.post(short_url, json=short_payload, headers=short_headers)
-        print_response(response)
-        response.raise_for_status()
-        
-        short_token_data = response.json()
-        short_token = short_token_data.get("access_token", "")
-        
-        print("\\n✅ Short-term token obtained!")
-        print(f"🔑 Short token (15 min): {{short_token[:30]}}...")
-        print(f"⏱️  Expires in: {{short_token_data.get('expires_in', 'unknown')}} seconds")
-        
-        return short_token
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            print("\\n❌ Authentication failed. Check your client_id and client_secret.")
-        else:
-            print(f"\\n❌ Auth error: {{e}}")
-        raise
-
-
-def submit_request(token: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    """Submit API request to {endpoint}
-    
-    Args:
-        token: Bearer token for authentication
-        payload: Request payload
-        
-    Returns:
-        API response as dictionary
-    """
-    url = f"{{API_BASE_URL}}{endpoint}"
-    
-    headers = {{
-        "Authorization": f"Bearer {{token}}",
-        "Content-Type": "application/json"
-    }}
-    
-    print_request("POST", url, headers, payload)
-    response = requests.post(url, json=payload, headers=headers)
-    print_response(response)
-    response.raise_for_status()
+@TRACE.wrap
+def render_job_split(workspace: SessionWorkspace, endpoint: str, recipient_count: int, payload: dict):
+    """Offer to split an oversized recipient list into parallel, retryable jobs"""
+    split_config = CONFIG.get("job_splitting", {})
+    max_recipients = int(split_config.get("max_recipients_per_job", DEFAULT_MAX_RECIPIENTS))
+    max_bytes = int(split_config.get("max_payload_bytes", DEFAULT_MAX_BYTES))
+    if recipient_count <= max_recipients and payload["bytes"] <= max_bytes:
+        return
     
-    return response.json()
+    store = get_param_store()
+    st.markdown("### ✂️ Split Into Parallel Jobs")
+    st.warning(f"⚠️ {recipient_count:,} recipients ({payload['bytes']:,} bytes) is more than one request should carry. "
+               f"Jobs are limited to {max_recipients:,} recipients and {max_bytes:,} bytes each.")
+    
+    if st.button("✂️ Split Into Jobs", key="split_jobs"):
+        try:
+            jobs_dir = workspace.path / workspace.unique_name("jobs", "")
+            manifest = split_jobs(jobs_dir, endpoint, lambda: store.iter_body(st.session_state.address_store),
+                                  max_recipients, max_bytes)
+            script = CODE_TEMPLATES.render("python_batch", endpoint, server=get_api_base_url(),
+                                           payload_file=MANIFEST_FILE)
+            script_path = atomic_write(jobs_dir / "submit_jobs.py", script)
+            st.session_state.job_split = {"manifest": manifest, "script": script_path, "revision": store.revision}
+        except ValueError as e:
+            st.error(f"❌ Could not split jobs: {str(e)}")
+    
+    # A plan made before the parameters last changed no longer matches the request
+    split = st.session_state.get("job_split")
+    if split and split["revision"] == store.revision:
+        jobs = split["manifest"]["jobs"]
+        st.success(f"✅ {len(jobs)} job payloads written to: {split['script'].parent}")
+        st.dataframe(pd.DataFrame(jobs), hide_index=True, use_container_width=True)
+        st.markdown("Submit them concurrently (re-running retries only the failed jobs):")
+        st.code(f"python {split['script']}", language="bash")
+        st.download_button(
+            label="⬇️ Download Submission Script",
+            data=split["script"].read_text(encoding="utf-8"),
+            file_name=split["script"].name,
+            mime="text/x-python",
+            key="download_batch_script"
+        )
 
-
-if __name__ == "__main__":
-    # Get access token
-    print("\\n🔐 Getting access token...")
-    token = get_access_token(CLIENT_ID, CLIENT_SECRET)
-    print(f"✅ Access token obtained: {{token[:20]}}..." if len(token) > 20 else f"✅ Access token: {{token}}")
-    
-    # Prepare payload
-    payload = {json.dumps(body, indent=4)}
-    
-    # Submit request
-    print(f"\\n📤 Sending request to: {{API_BASE_URL}}{endpoint}")
-    print("📦 Payload:")
-    print(json.dumps(payload, indent=2))
+@TRACE.wrap
+def render_pdf_preflight(workspace: SessionWorkspace, recipient_count: int):
+    """Check an uploaded combined PDF's page count and split ranges before submitting"""
+    st.markdown("### 🔍 PDF Preflight")
+    st.caption("Reads only the cross-reference data of the PDF, so even very large files are checked instantly")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        # Uploaded, never a server path: browser users must not be able to probe the host's files
+        uploaded = st.file_uploader("Combined PDF", type=["pdf"], key="preflight_upload")
+    with col2:
+        pages_per_recipient = st.number_input("Pages per recipient", min_value=0, value=0, step=1,
+                                              key="preflight_pages",
+                                              help="0 divides the pages evenly among the recipients entered above")
+    
+    if st.button("🔍 Run Preflight", key="run_preflight"):
+        try:
+            if uploaded is None:
+                raise ValueError("Upload the combined PDF first")
+            # Copied into the session workspace so it can be memory-mapped like any local file
+            uploaded.seek(0)
+            with workspace.open_atomic("preflight.pdf", binary=True) as f:
+                shutil.copyfileobj(uploaded, f)
+            st.session_state.pdf_preflight = preflight(
+                workspace.path / "preflight.pdf",
+                recipients=recipient_count if not pages_per_recipient else None,
+                pages_per_recipient=int(pages_per_recipient) or None
+            )
+        except ValueError as e:
+            st.session_state.pdf_preflight = None
+            st.error(f"❌ {str(e)}")
     
-    try:
-        result = submit_request(token, payload)
-        print("\\n✅ Success! Response:")
-        print(json.dumps(result, indent=2))
-    except requests.exceptions.RequestException as e:
-        print(f"\\n❌ Error: {{e}}")
-'''
+    report = st.session_state.get("pdf_preflight")
+    if report:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Pages", f"{report['pages']:,}")
+        col2.metric("Size", f"{report['bytes'] / (1024 * 1024):,.1f} MB")
+        col3.metric("Checked in", f"{report['seconds'] * 1000:.1f} ms")
+        if report["ranges"]:
+            st.dataframe(pd.DataFrame(report["ranges"]), hide_index=True, use_container_width=True)
+            st.code(json.dumps([{"pageRange": r} for r in report["ranges"]], indent=2), language="json")
 
+@TRACE.wrap
 def render_code_generation():
     """Render generated code"""
     st.header("🚀 Your Generated API Call")
     
+    # Each session writes into its own workspace so concurrent users never share files
+    workspace = get_session_workspace()
+    
+    saved = st.session_state.get("postage_pieces_saved", 0)
+    lists = st.session_state.get("lists_skipped", 0)
+    if saved or lists:
+        st.success(f"♻️ Deduplication saved {saved:,} postage pieces"
+                   + (f" and {lists:,} repeated address lists" if lists else ""))
+    
     # Generate API call body first
     try:
-        body = generate_api_call()
+        body, recipient_count = generate_api_call()
+        payload = write_payload_file(workspace)
         endpoint = st.session_state.endpoint
+        
+        # Generated code embeds small bodies; anything the preview cut short, or
+        # too big to read comfortably, is streamed from the payload file instead
+        shown = len(body.get("recipientAddressSources", []))
+        streamed = recipient_count > shown or payload["bytes"] > INLINE_PAYLOAD_LIMIT
+        payload_file = PAYLOAD_FILE_NAME if streamed else None
     except Exception as e:
         st.error(f"Error generating API call: {str(e)}")
         return
     
-    # Create output directory
-    output_dir = Path("generated_code")
-    output_dir.mkdir(exist_ok=True)
-    
-    # Generate timestamp for unique filenames
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Format selector instead of st.tabs: tabs render every panel on each rerun,
+    # this only renders the format the user is actually looking at
+    code_format = st.radio(
+        "Output format",
+        ["📋 JSON", "🐍 Python", "🟨 JavaScript", "🔧 cURL"],
+        horizontal=True,
+        key="code_format",
+        label_visibility="collapsed"
+    )
     
-    # Create tabs for different code formats
-    tab1, tab2, tab3, tab4 = st.tabs(["📋 JSON", "🐍 Python", "🟨 JavaScript", "🔧 cURL"])
+    if payload_file and code_format != "📋 JSON":
+        st.info(f"📄 This request body is too large to embed - the code streams it from {PAYLOAD_FILE_NAME}. "
+                "Download it from the JSON tab and keep it next to the code.")
     
-    with tab1:
+    if code_format == "📋 JSON":
         st.subheader("Request Body")
+        if recipient_count > shown:
+            st.caption(f"Showing the first {shown} of {recipient_count:,} recipients - the payload file has them all")
         st.json(body)
         
-        # Add button to save JSON
-        if st.button("💾 Save JSON to File", key="save_json"):
-            json_file = output_dir / f"c2m_api_request_{timestamp}.json"
-            try:
-                with open(json_file, "w") as f:
-                    json.dump(body, f, indent=2)
-                st.success(f"✅ Saved to: {json_file}")
-            except Exception as e:
-                st.error(f"Error saving JSON: {str(e)}")
+        st.success(f"✅ Saved to: {payload['path']} ({payload['bytes']:,} bytes, {recipient_count:,} recipients)")
+        with open(payload["path"], "rb") as payload_data:
+            st.download_button(
+                label="⬇️ Download Payload JSON",
+                data=payload_data,
+                file_name=PAYLOAD_FILE_NAME,
+                mime="application/json",
+                key="download_payload"
+            )
     
-    with tab2:
+    elif code_format == "🐍 Python":
         st.subheader("Python Code (Preview)")
         # Show preview of main function
-        python_preview = f'''def submit_request(token: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    """Submit API request to {endpoint}"""
-    url = f"{{API_BASE_URL}}{endpoint}"
-    
-    headers = {{
-        "Authorization": f"Bearer {{token}}",
-        "Content-Type": "application/json"
-    }}
-    
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    
-    return response.json()
-
-# Main execution
-if __name__ == "__main__":
-    token = get_access_token(CLIENT_ID, CLIENT_SECRET)
-    payload = {json.dumps(body, indent=4)}
-    result = submit_request(token, payload)'''
+        python_preview = generate_python_preview(endpoint, body, payload_file)
         st.code(python_preview, language="python")
+        if uses_upload(body):
+            st.info("📤 The complete script uploads your local document first, in parallel parts that resume "
+                    "if interrupted: `python <script>.py <file-to-upload>`")
+        if uses_zip_bundle(endpoint, body):
+            st.info("🗜️ Bundle your local documents into the zip for `zipId` in one streaming pass; "
+                    "the script prints the matching `documentSourceIdentifier` entries: "
+                    "`python bundle_documents.py documents.zip *.pdf`")
+            st.download_button(
+                label="⬇️ Download Zip Bundler",
+                data=CODE_TEMPLATES.render("python_bundle", endpoint),
+                file_name="bundle_documents.py",
+                mime="text/x-python",
+                key="download_bundler"
+            )
         
         # Generate button and file operations
         col1, col2 = st.columns(2)
@@ -1132,10 +897,9 @@ if __name__ == "__main__":
             if st.button("🔨 Generate Complete Python Script", key="gen_python"):
                 try:
                     # Generate and save full code
-                    full_python = generate_full_python_code(endpoint, body)
-                    python_file = output_dir / f"c2m_{endpoint.replace('/', '_').strip('_')}_{timestamp}.py"
-                    with open(python_file, "w") as f:
-                        f.write(full_python)
+                    full_python = generate_full_python_code(endpoint, body, payload_file)
+                    python_name = workspace.unique_name(f"c2m_{endpoint.replace('/', '_').strip('_')}", ".py")
+                    python_file = workspace.write_text(python_name, full_python)
                     st.success(f"✅ Generated: {python_file}")
                     st.session_state.python_file_generated = True
                     st.session_state.python_file_path = python_file
@@ -1168,13 +932,24 @@ if __name__ == "__main__":
                 if st.session_state.get('execute_code', False):
                     with st.spinner("Running code..."):
                         try:
+                            # Only ever run a script this session generated itself
+                            if not workspace.contains(st.session_state.python_file_path):
+                                raise RuntimeError("Generated script is not in this session's workspace")
+                            # A session idle past the TTL was swept; restore the script it generated
+                            if not Path(st.session_state.python_file_path).exists():
+                                workspace.write_text(Path(st.session_state.python_file_path).name,
+                                                     st.session_state.python_file_content)
+                            
                             # Run the generated Python script
-                            result = subprocess.run(
-                                [sys.executable, str(st.session_state.python_file_path)],
-                                capture_output=True,
-                                text=True,
-                                timeout=30
-                            )
+                            with TRACE.span("execute_code"), CODE_EXECUTION_SECONDS.time():
+                                result = subprocess.run(
+                                    [sys.executable, str(st.session_state.python_file_path)],
+                                    capture_output=True,
+                                    text=True,
+                                    timeout=30,
+                                    cwd=str(workspace.path)
+                                )
+                            CODE_EXECUTIONS.inc(result="success" if result.returncode == 0 else "failure")
                             
                             # Display results
                             if result.returncode == 0:
@@ -1188,104 +963,92 @@ if __name__ == "__main__":
                                     st.markdown("**Error:**")
                                     st.code(result.stderr)
                         except subprocess.TimeoutExpired:
+                            CODE_EXECUTIONS.inc(result="timeout")
                             st.error("❌ Execution timed out after 30 seconds")
                         except Exception as e:
+                            CODE_EXECUTIONS.inc(result="error")
                             st.error(f"❌ Error executing code: {str(e)}")
     
-    with tab3:
+    elif code_format == "🟨 JavaScript":
         st.subheader("JavaScript Code (Preview)")
-        js_preview = f'''async function submitRequest(token, payload) {{
-    const url = 'https://api.c2m.com/v2{endpoint}';
-    
-    const response = await fetch(url, {{
-        method: 'POST',
-        headers: {{
-            'Authorization': `Bearer ${{token}}`,
-            'Content-Type': 'application/json'
-        }},
-        body: JSON.stringify(payload)
-    }});
-    
-    return response.json();
-}}
-
-// Main execution
-const token = await getAccessToken(CLIENT_ID, CLIENT_SECRET);
-const payload = {json.dumps(body, indent=2)};
-const result = await submitRequest(token, payload);'''
+        js_preview = generate_javascript_preview(endpoint, body, payload_file)
         st.code(js_preview, language="javascript")
         st.info("🛠️ Full JavaScript implementation with auth flow available in next release")
     
-    with tab4:
+    elif code_format == "🔧 cURL":
         st.subheader("cURL Command")
-        AUTH_BASE_URL = "https://j0dos52r5e.execute-api.us-east-1.amazonaws.com/dev"
-        API_BASE_URL = st.session_state.get('mock_server_url', "https://cd140b74-ed23-4980-834b-a966ac3393c1.mock.pstmn.io")
-        curl_cmd = f'''# Get long-term token
-LONG_TOKEN=$(curl -X POST {AUTH_BASE_URL}/auth/tokens/long \\
-  -H "Content-Type: application/json" \\
-  -d '{{
-    "grant_type": "client_credentials",
-    "client_id": "test-client-123",
-    "client_secret": "super-secret-password-123"
-  }}' | jq -r '.access_token')
+        curl_cmd = generate_curl_command(endpoint, body, payload_file)
+        st.code(curl_cmd, language="bash")
+    
+    if endpoint in SPLITTABLE_ENDPOINTS:
+        render_job_split(workspace, endpoint, recipient_count, payload)
+    elif endpoint in SPLIT_ENDPOINTS:
+        render_pdf_preflight(workspace, recipient_count)
 
-# Exchange for short-term token  
-SHORT_TOKEN=$(curl -X POST {AUTH_BASE_URL}/auth/tokens/short \\
-  -H "Authorization: Bearer $LONG_TOKEN" \\
-  -H "Content-Type: application/json" \\
-  -d '{{}}' | jq -r '.access_token')
+@TRACE.wrap
+def render_trace_panel():
+    """Sidebar table of the previous rerun's spans"""
+    trace = st.session_state.get("last_trace")
+    with st.sidebar.expander("⏱️ Last Rerun Timing", expanded=False):
+        if not trace:
+            st.caption("Timings appear after the first rerun")
+            return
+        st.metric("Rerun", f"{trace['duration_ms']:.1f} ms",
+                  help=f"Step: {trace['step']}, ended by: {trace['outcome']}")
+        st.dataframe(
+            pd.DataFrame([{"span": "  " * span["depth"] + span["name"], "start (ms)": span["start_ms"],
+                           "duration (ms)": span["duration_ms"]} for span in trace["spans"]]),
+            hide_index=True,
+            use_container_width=True
+        )
 
-# Make API request
-curl -X POST {API_BASE_URL}{endpoint} \\
-  -H "Authorization: Bearer $SHORT_TOKEN" \\
-  -H "Content-Type: application/json" \\
-  -d '{json.dumps(body)}'
-'''
-        st.code(curl_cmd, language="bash")
+def finish_trace(outcome: str):
+    """Summarize this rerun's spans for the debug panel and append them to the trace file"""
+    if not TRACE.enabled:
+        return
+    record = TRACE.summary(step=TRACE_STEP, outcome=outcome)
+    st.session_state.last_trace = record
+    append_trace(record, Path(TRACING.get("trace_file", DEFAULT_TRACE_FILE)))
+
+def cache_requests() -> Dict[tuple, int]:
+    """Hits and misses of the process-wide render caches, from their own statistics"""
+    templates = CODE_TEMPLATES.cache_info()
+    cards = choice_cards.cache_info()
+    return {
+        ("code_templates", "hit"): templates["hits"],
+        ("code_templates", "miss"): templates["misses"],
+        ("choice_cards", "hit"): cards.hits,
+        ("choice_cards", "miss"): cards.misses,
+    }
+
+@st.cache_resource
+def start_metrics() -> Optional[TextfileExporter]:
+    """Start the /metrics endpoint once per server process; returns the textfile exporter if configured"""
+    settings = CONFIG.get("metrics", {})
+    METRICS.register(CallbackCounter("c2m_cache_requests_total", "Render cache lookups", ["cache", "result"],
+                                     cache_requests))
+    if settings.get("port"):
+        METRICS.serve(settings.get("host", "0.0.0.0"), settings["port"])
+    if settings.get("textfile_dir"):
+        return TextfileExporter(METRICS, Path(settings["textfile_dir"]), settings.get("textfile_interval_seconds", 15))
+    return None
+
+def finish_metrics():
+    """Record this rerun's duration under its wizard step and refresh the textfile"""
+    if not CONFIG.get("metrics", {}).get("enabled", False):
+        return
+    WIZARD_STEP_SECONDS.observe(time.perf_counter() - RERUN_STARTED, step=TRACE_STEP)
+    exporter = start_metrics()
+    if exporter:
+        exporter.maybe_write()
 
 def main():
+    # Heartbeat on every rerun, so a session still on the wizard is never swept as idle
+    get_session_workspace()
     st.title("🎯 Click2Endpoint - C2M API v2")
     
     # Show mock server info in sidebar with expanded width
     with st.sidebar:
-        # Force sidebar to be wider and fix font sizes
-        st.markdown("""
-        <style>
-            section[data-testid="stSidebar"] {
-                width: 400px !important;
-            }
-            .stSelectbox label {
-                font-size: 16px !important;
-                color: #FF6B35 !important;
-            }
-            .sidebar .stMarkdown {
-                font-size: 16px !important;
-            }
-            .stInfo {
-                font-size: 14px !important;
-            }
-            /* All buttons text color - aquamarine */
-            .stButton > button {
-                color: aquamarine !important;
-            }
-            /* Keep the radio label (Select Workspace:) default color */
-            .stRadio > label {
-                color: white !important;
-            }
-            /* Force radio OPTIONS to aquamarine */
-            .stRadio > div * {
-                color: aquamarine !important;
-            }
-            /* Target the radio options container specifically */
-            .stRadio [role="radiogroup"] * {
-                color: aquamarine !important;
-            }
-            div[data-baseweb="radio"] * {
-                color: aquamarine !important;
-            }
-        </style>
-        """, unsafe_allow_html=True)
-        
         st.subheader("🔧 Configuration")
         
         # Mock server selection
@@ -1376,7 +1139,7 @@ def main():
                     })
         
         # Add default option
-        default_url = CONFIG.get("api", {}).get("mock_server_url", "https://cd140b74-ed23-4980-834b-a966ac3393c1.mock.pstmn.io")
+        default_url = default_mock_server_url(CONFIG)
         mock_options.append({
             "name": "🌐 Default Mock Server",
             "url": default_url,
@@ -1434,10 +1197,6 @@ def main():
     elif st.session_state.current_step == "level2":
         render_level2_parameters()
     elif st.session_state.current_step == "generate":
-        # Store Level 2 params before generating
-        for key in st.session_state:
-            if key.startswith("param_"):
-                st.session_state.level2_params[key] = st.session_state[key]
         render_code_generation()
     
     # Back button
@@ -1462,6 +1221,20 @@ def main():
             elif st.session_state.current_step == "generate":
                 st.session_state.current_step = "level2"
             st.rerun()
+    
+    if TRACE.enabled and TRACING.get("debug_panel", True):
+        render_trace_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    outcome = "completed"
+    try:
+        main()
+    except BaseException as e:
+        # st.rerun() ends a run by raising, so this is usually not an error
+        outcome = type(e).__name__
+        raise
+    finally:
+        if WATCH_TOKEN is not None:
+            start_watchdog().finish(WATCH_TOKEN)
+        finish_trace(outcome)
+        finish_metrics()
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""
+Benchmark Suite
+Offline timings of the hot paths, compared against per-machine baselines kept in the repo
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from streamlit_app.address_store import AddressStore
+from streamlit_app.code_templates import CODE_TEMPLATES
+from streamlit_app.core.codegen import CODE_GENERATORS
+from streamlit_app.core.endpoints import get_endpoint
+from streamlit_app.core.postman import resolve_mock_server
+from streamlit_app.param_store import ParameterStore
+from streamlit_app.payload_writer import write_payload
+from streamlit_app.session_workspace import atomic_write
+from streamlit_app.static_export import QA_TREE_PATH, iter_paths, load_questions
+
+REPO_ROOT = Path(__file__).parent.parent
+BASELINE_DIR = REPO_ROOT / "benchmarks" / "baselines"
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+# A run fails when a benchmark is this much slower than its baseline
+DEFAULT_TOLERANCE = 0.25
+
+RECIPIENT_COUNTS = (10, 1000, 100000)
+
+# Size of the synthetic session log the training data builder reads
+TRAINING_LOG_BYTES = 1024 * 1024
+
+
+class Benchmark(NamedTuple):
+    """setup() builds the inputs and returns the call to time; units/unit give its throughput"""
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    units: float = 1
+    unit: str = "call"
+
+
+def machine_id() -> str:
+    """Name of this machine's baseline file: OS, architecture, Python version and CPU count
+
+    Timings are only comparable on the same hardware, so each machine (or
+    CI runner class) keeps its own baseline; C2M_BENCH_MACHINE overrides it.
+    """
+    override = os.environ.get("C2M_BENCH_MACHINE")
+    if override:
+        return override
+    version = sys.version_info
+    return f"{platform.system()}-{platform.machine()}-py{version.major}{version.minor}-{os.cpu_count()}cpu".lower()
+
+
+def sample_addresses(count: int) -> AddressStore:
+    """Address store with count complete newAddress recipients"""
+    store = AddressStore()
+    store.extend_columns({
+        "firstName": [f"First{i}" for i in range(count)],
+        "lastName": [f"Last{i}" for i in range(count)],
+        "address1": [f"{i} Main St" for i in range(count)],
+        "city": ["Anytown"] * count,
+        "state": ["CA"] * count,
+        "zip": ["90210"] * count,
+    }, coerce=False)
+    return store
+
+
+def sample_params() -> ParameterStore:
+    """Parameters filled in as for a typical single-doc job with invoice payment and tags"""
+    params = ParameterStore()
+    params.set("zip_id", "zip_456")
+    params.set("doc_name", "contract.pdf")
+    params.set("payment", "INVOICE")
+    params.set("invoice_num", "INV-12345")
+    params.set("tags", "campaign2024, bulk-mail")
+    return params
+
+
+def _endpoint_resolution() -> Callable[[], Any]:
+    paths = list(iter_paths(load_questions()))
+    return lambda: [get_endpoint(answers) for answers in paths]
+
+
+def _generate_api_call(count: int) -> Callable[[], Any]:
+    addresses = sample_addresses(count)
+
+    def run():
+        # A new store has every section dirty, as after a Level 2 submit
+        return sample_params().preview_body(addresses)
+
+    return run
+
+
+def _write_payload(count: int) -> Callable[[], Any]:
+    addresses = sample_addresses(count)
+    params = sample_params()
+    return lambda: write_payload(io.BytesIO(), params.iter_body(addresses))
+
+
+def _codegen(language: str) -> Callable[[], Any]:
+    generator = CODE_GENERATORS[language]
+    body, _count = sample_params().preview_body(sample_addresses(10))
+    generator("/jobs/single-doc", body)  # Load the snippet matrix outside the timing
+
+    def run():
+        CODE_TEMPLATES.clear()
+        return generator("/jobs/single-doc", body)
+
+    return run
+
+
+def _load_script(name: str):
+    """A module from scripts/, which is not a package"""
+    spec = importlib.util.spec_from_file_location(f"benchmark_{name}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _training_data() -> Callable[[], Any]:
+    builder_module = _load_script("build_training_file")
+    paths = [(answers, get_endpoint(answers)) for answers in iter_paths(load_questions())]
+    endpoint_ids = {entry["path"]: entry["id"]
+                    for entry in json.loads((REPO_ROOT / "data" / "endpoints.json").read_text())["endpoints"]}
+    rng = random.Random(0)
+
+    directory = tempfile.TemporaryDirectory()
+    log_file = Path(directory.name) / "sessions.jsonl"
+    with open(log_file, "w", encoding="utf-8") as f:
+        while f.tell() < TRAINING_LOG_BYTES:
+            answers, endpoint = rng.choice(paths)
+            f.write(json.dumps({
+                "timestamp": datetime(2025, 1, 1).isoformat(),
+                "session_log": [{"question": field, "field": field, "answer": value}
+                                for field, value in answers.items()],
+                "answers": answers,
+                "recommended_endpoint": endpoint,
+                "endpoint_id": endpoint_ids.get(endpoint, ""),
+            }) + "\n")
+
+    def run():
+        builder = builder_module.TrainingDataBuilder(log_file, Path(directory.name) / "training.jsonl")
+        with contextlib.redirect_stdout(io.StringIO()):
+            builder.build_training_data()
+        return directory  # Keeps the directory alive as long as the benchmark
+
+    return run
+
+
+def _decision_tree_parsing() -> Callable[[], Any]:
+    return lambda: list(iter_paths(load_questions(QA_TREE_PATH)))
+
+
+def _mock_server_lookup() -> Callable[[], Any]:
+    # The Postman API is off, so this is the lookup every session makes offline
+    config = {"postman": {"enabled": False}}
+    return lambda: resolve_mock_server(config=config)
+
+
+def default_benchmarks() -> List[Benchmark]:
+    """Every benchmark, named "area[variant]" """
+    benchmarks = [Benchmark("endpoint_resolution", _endpoint_resolution, 33, "paths")]
+    for count in RECIPIENT_COUNTS:
+        benchmarks.append(Benchmark(f"generate_api_call[{count}]", lambda count=count: _generate_api_call(count),
+                                    count, "recipients"))
+        benchmarks.append(Benchmark(f"write_payload[{count}]", lambda count=count: _write_payload(count),
+                                    count, "recipients"))
+    for language in CODE_GENERATORS:
+        benchmarks.append(Benchmark(f"codegen[{language}]", lambda language=language: _codegen(language)))
+    benchmarks.extend([
+        Benchmark("training_data[openai]", _training_data, TRAINING_LOG_BYTES / (1024 * 1024), "MB"),
+        Benchmark("decision_tree_parsing", _decision_tree_parsing),
+        Benchmark("mock_server_lookup", _mock_server_lookup),
+    ])
+    return benchmarks
+
+
+def measure(func: Callable[[], Any], repeats: int = 5) -> Dict[str, float]:
+    """Best and median seconds per call over repeats rounds of at least 0.2s each"""
+    func()
+    timer = timeit.Timer(func)
+    number, _elapsed = timer.autorange()
+    rounds = [elapsed / number for elapsed in timer.repeat(repeats, number)]
+    return {"seconds": min(rounds), "median": statistics.median(rounds), "number": number}
+
+
+def run_benchmarks(benchmarks: Iterable[Benchmark], repeats: int = 5,
+                   on_result: Optional[Callable[[Benchmark, Dict[str, Any]], None]] = None
+                   ) -> Dict[str, Dict[str, Any]]:
+    """Results keyed by benchmark name; on_result is called as each one finishes"""
+    results = {}
+    for benchmark in benchmarks:
+        result = measure(benchmark.setup(), repeats)
+        result.update(units=benchmark.units, unit=benchmark.unit)
+        results[benchmark.name] = result
+        if on_result:
+            on_result(benchmark, result)
+    return results
+
+
+def baseline_path(machine: Optional[str] = None) -> Path:
+    return BASELINE_DIR / f"{machine or machine_id()}.json"
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """A saved baseline, or None when this machine has none yet"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: Path, machine: Optional[str] = None) -> Path:
+    data = {
+        "machine": machine or machine_id(),
+        "python": platform.python_version(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+    return atomic_write(path, json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """Benchmarks whose median time is more than tolerance slower than the baseline's
+
+    Medians, not best rounds, so one lucky round in the baseline does not
+    make every later run look slow. Benchmarks missing from the baseline are
+    new and never fail.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > 1 + tolerance:
+            regressions.append({"name": name, "baseline": before["median"], "current": result["median"],
+                                "ratio": ratio})
+    return regressions
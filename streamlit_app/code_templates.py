@@ -0,0 +1,1056 @@
+"""
+Code Templates
+Precompiled code-generation templates for every output language, with a memoized registry
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+AUTH_BASE_URL = "https://j0dos52r5e.execute-api.us-east-1.amazonaws.com/dev"
+DEFAULT_API_BASE_URL = "https://cd140b74-ed23-4980-834b-a966ac3393c1.mock.pstmn.io"
+
+# Payload file read by the *_file targets, which stream the body instead of embedding it
+DEFAULT_PAYLOAD_FILE = "payload.json"
+
+# Placeholders look like {{ name }}; every other brace is literal code
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Stands in for the timestamp in cached output; JSON escapes NUL, so no body can contain it
+TIMESTAMP_MARKER = "\x00timestamp\x00"
+
+# Python client pieces: the inline and file-backed variants share the auth helpers
+_PYTHON_HEADER = '''#!/usr/bin/env python3
+"""
+C2M API - {{ endpoint }}
+Generated: {{ timestamp }}
+"""
+
+import requests
+import json
+from typing import Dict, Any
+
+# Configuration
+API_BASE_URL = "{{ api_base_url }}"  # Mock server or production API endpoint
+AUTH_BASE_URL = "{{ auth_base_url }}"  # C2M Auth service (always use this)
+# Note: Using test credentials for the mock server
+CLIENT_ID = "test-client-123"  # Replace with your client ID if using production
+CLIENT_SECRET = "super-secret-password-123"  # Replace with your client secret if using production
+
+
+'''
+
+_PYTHON_FILE_HEADER = '''#!/usr/bin/env python3
+"""
+C2M API - {{ endpoint }}
+Generated: {{ timestamp }}
+"""
+
+import requests
+import json
+from pathlib import Path
+from typing import Dict, Any
+
+# Configuration
+API_BASE_URL = "{{ api_base_url }}"  # Mock server or production API endpoint
+AUTH_BASE_URL = "{{ auth_base_url }}"  # C2M Auth service (always use this)
+# Note: Using test credentials for the mock server
+CLIENT_ID = "test-client-123"  # Replace with your client ID if using production
+CLIENT_SECRET = "super-secret-password-123"  # Replace with your client secret if using production
+# Request body is streamed from this file; keep it next to the script
+PAYLOAD_FILE = Path(__file__).with_name("{{ payload_file }}")
+
+
+'''
+
+_PYTHON_AUTH_HELPERS = '''def print_request(method: str, url: str, headers: Dict, body: Any = None):
+    """Pretty print HTTP request"""
+    print("\\n" + "="*60)
+    print("📤 REQUEST")
+    print("="*60)
+    print(f"{method} {url}")
+    print("\\nHEADERS:")
+    for key, value in headers.items():
+        if key.lower() == 'authorization' and len(value) > 50:
+            print(f"  {key}: Bearer {value[7:27]}...")
+        else:
+            print(f"  {key}: {value}")
+    if body:
+        print("\\nBODY:")
+        print(json.dumps(body, indent=2))
+    print("="*60)
+
+def print_response(response: requests.Response):
+    """Pretty print HTTP response"""
+    print("\\n" + "-"*60)
+    print("📥 RESPONSE")
+    print("-"*60)
+    print(f"Status: {response.status_code} {response.reason}")
+    print("\\nHEADERS:")
+    for key, value in response.headers.items():
+        print(f"  {key}: {value}")
+    print("\\nBODY:")
+    try:
+        print(json.dumps(response.json(), indent=2))
+    except:
+        print(response.text)
+    print("-"*60 + "\\n")
+
+def revoke_existing_tokens(client_id: str, client_secret: str):
+    """Revoke any existing tokens to ensure fresh authentication"""
+    revoke_url = f"{AUTH_BASE_URL}/auth/tokens/revoke"
+    
+    print("\\n🔄 Attempting to revoke any existing tokens...")
+    
+    headers = {
+        "Content-Type": "application/json"
+    }
+    
+    # Try to revoke using client credentials
+    payload = {
+        "client_id": client_id,
+        "client_secret": client_secret
+    }
+    
+    print_request("POST", revoke_url, headers, payload)
+    
+    try:
+        response = requests.post(revoke_url, json=payload, headers=headers)
+        print_response(response)
+        if response.status_code == 200:
+            print("✅ Existing tokens revoked successfully")
+        else:
+            print("⚠️  Token revocation returned status:", response.status_code)
+    except Exception as e:
+        print(f"⚠️  Could not revoke tokens: {e}")
+
+def get_access_token(client_id: str, client_secret: str) -> str:
+    """Get an access token using client credentials"""
+    # First, revoke any existing tokens
+    revoke_existing_tokens(client_id, client_secret)
+    
+    # Step 1: Get long-term token
+    print("\\n🔐 Getting long-term token...")
+    auth_url = f"{AUTH_BASE_URL}/auth/tokens/long"
+    
+    if "mock.pstmn.io" in API_BASE_URL:
+        print("📍 Using mock server for API calls")
+        print("🔐 Getting fresh tokens from C2M Auth service...")
+    
+    headers = {
+        "Content-Type": "application/json"
+    }
+    
+    payload = {
+        "grant_type": "client_credentials",
+        "client_id": client_id,
+        "client_secret": client_secret
+    }
+    
+    print_request("POST", auth_url, headers, payload)
+    
+    try:
+        response = requests.post(auth_url, json=payload, headers=headers)
+        print_response(response)
+        response.raise_for_status()
+        
+        long_token_data = response.json()
+        long_token = long_token_data.get("access_token", "")
+        
+        print("\\n✅ Long-term token obtained!")
+        print(f"🔑 Long token (30-90 days): {long_token[:30]}...")
+        print(f"⏱️  Expires in: {long_token_data.get('expires_in', 'unknown')} seconds")
+        
+        # Step 2: Exchange for short-term token
+        print("\\n🔄 Exchanging for short-term token...")
+        short_url = f"{AUTH_BASE_URL}/auth/tokens/short"
+        
+        short_headers = {
+            "Authorization": f"Bearer {long_token}",
+            "Content-Type": "application/json"
+        }
+        
+        short_payload = {}  # Can optionally narrow scopes here
+        
+        print_request("POST", short_url, short_headers, short_payload)
+        
+        response = requests.post(short_url, json=short_payload, headers=short_headers)
+        print_response(response)
+        response.raise_for_status()
+        
+        short_token_data = response.json()
+        short_token = short_token_data.get("access_token", "")
+        
+        print("\\n✅ Short-term token obtained!")
+        print(f"🔑 Short token (15 min): {short_token[:30]}...")
+        print(f"⏱️  Expires in: {short_token_data.get('expires_in', 'unknown')} seconds")
+        
+        return short_token
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 401:
+            print("\\n❌ Authentication failed. Check your client_id and client_secret.")
+        else:
+            print(f"\\n❌ Auth error: {e}")
+        raise
+
+
+'''
+
+_PYTHON_MAIN = '''def submit_request(token: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Submit API request to {{ endpoint }}
+    
+    Args:
+        token: Bearer token for authentication
+        payload: Request payload
+        
+    Returns:
+        API response as dictionary
+    """
+    url = f"{API_BASE_URL}{{ endpoint }}"
+    
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+    
+    print_request("POST", url, headers, payload)
+    response = requests.post(url, json=payload, headers=headers)
+    print_response(response)
+    response.raise_for_status()
+    
+    return response.json()
+
+
+if __name__ == "__main__":
+    # Get access token
+    print("\\n🔐 Getting access token...")
+    token = get_access_token(CLIENT_ID, CLIENT_SECRET)
+    print(f"✅ Access token obtained: {token[:20]}..." if len(token) > 20 else f"✅ Access token: {token}")
+    
+    # Prepare payload
+    payload = {{ body_json }}
+    
+    # Submit request
+    print(f"\\n📤 Sending request to: {API_BASE_URL}{{ endpoint }}")
+    print("📦 Payload:")
+    print(json.dumps(payload, indent=2))
+    
+    try:
+        result = submit_request(token, payload)
+        print("\\n✅ Success! Response:")
+        print(json.dumps(result, indent=2))
+    except requests.exceptions.RequestException as e:
+        print(f"\\n❌ Error: {e}")
+'''
+
+
+_PYTHON_FILE_MAIN = '''def submit_request(token: str, payload_path: Path) -> Dict[str, Any]:
+    """Submit API request to {{ endpoint }}
+    
+    Args:
+        token: Bearer token for authentication
+        payload_path: JSON file holding the request payload
+        
+    Returns:
+        API response as dictionary
+    """
+    url = f"{API_BASE_URL}{{ endpoint }}"
+    
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+    
+    print_request("POST", url, headers)
+    print(f"BODY: streamed from {payload_path.name} ({payload_path.stat().st_size:,} bytes)")
+    # requests streams an open file instead of reading it into memory
+    with open(payload_path, "rb") as payload:
+        response = requests.post(url, data=payload, headers=headers)
+    print_response(response)
+    response.raise_for_status()
+    
+    return response.json()
+
+
+if __name__ == "__main__":
+    # Get access token
+    print("\\n🔐 Getting access token...")
+    token = get_access_token(CLIENT_ID, CLIENT_SECRET)
+    print(f"✅ Access token obtained: {token[:20]}..." if len(token) > 20 else f"✅ Access token: {token}")
+    
+    # Submit request
+    print(f"\\n📤 Sending request to: {API_BASE_URL}{{ endpoint }}")
+    print(f"📦 Payload: {PAYLOAD_FILE.name} ({PAYLOAD_FILE.stat().st_size:,} bytes)")
+    
+    try:
+        result = submit_request(token, PAYLOAD_FILE)
+        print("\\n✅ Success! Response:")
+        print(json.dumps(result, indent=2))
+    except requests.exceptions.RequestException as e:
+        print(f"\\n❌ Error: {e}")
+'''
+
+_PYTHON_BATCH_HEADER = '''#!/usr/bin/env python3
+"""
+C2M API - {{ endpoint }} (split into parallel jobs)
+Generated: {{ timestamp }}
+
+Submits every job listed in the manifest concurrently. Completed jobs are
+recorded in results.json, so re-running the script only retries failures.
+"""
+
+import os
+import random
+import threading
+import time
+import requests
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Configuration
+API_BASE_URL = "{{ api_base_url }}"  # Mock server or production API endpoint
+AUTH_BASE_URL = "{{ auth_base_url }}"  # C2M Auth service (always use this)
+# Note: Using test credentials for the mock server
+CLIENT_ID = "test-client-123"  # Replace with your client ID if using production
+CLIENT_SECRET = "super-secret-password-123"  # Replace with your client secret if using production
+# Manifest listing one payload file per job; keep the job files next to it
+MANIFEST_FILE = Path(__file__).with_name("{{ payload_file }}")
+RESULTS_FILE = MANIFEST_FILE.with_name("results.json")
+MAX_WORKERS = int(os.environ.get("C2M_MAX_WORKERS", "4"))  # Concurrent submissions
+MAX_ATTEMPTS = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+'''
+
+# Token shared by concurrent workers: fetched once, refreshed when a request reports it expired
+_PYTHON_TOKEN_CACHE = '''_token_lock = threading.Lock()
+_token: Dict[str, Optional[str]] = {"value": None}
+
+
+def current_token(expired: Optional[str] = None) -> str:
+    """Shared access token, fetched once and refreshed when a job reports it expired"""
+    with _token_lock:
+        if _token["value"] is None or _token["value"] == expired:
+            _token["value"] = get_access_token(CLIENT_ID, CLIENT_SECRET)
+        return _token["value"]
+
+
+'''
+
+_PYTHON_BATCH_MAIN = '''def submit_job(payload_path: Path) -> Dict[str, Any]:
+    """Submit one job payload, retrying throttled and transient failures with backoff"""
+    url = f"{API_BASE_URL}{{ endpoint }}"
+    error = ""
+    
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        token = current_token()
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        
+        try:
+            with open(payload_path, "rb") as payload:
+                response = requests.post(url, data=payload, headers=headers, timeout=120)
+            if response.status_code == 401:
+                current_token(expired=token)
+                error = "HTTP 401"
+                continue
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                return response.json()
+            error = f"HTTP {response.status_code}"
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = str(e)
+        
+        if attempt < MAX_ATTEMPTS:
+            # Exponential backoff with jitter so parallel workers do not retry in lockstep
+            time.sleep(min(60, 2 ** attempt) + random.uniform(0, 1))
+    
+    raise RuntimeError(f"{payload_path.name}: giving up after {MAX_ATTEMPTS} attempts ({error})")
+
+
+def load_results() -> Dict[str, Any]:
+    """Responses of jobs completed by earlier runs"""
+    if RESULTS_FILE.exists():
+        return json.loads(RESULTS_FILE.read_text())
+    return {}
+
+
+def save_results(results: Dict[str, Any]):
+    """Record completed jobs atomically so an interrupted run can resume"""
+    tmp_file = RESULTS_FILE.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps(results, indent=2))
+    tmp_file.replace(RESULTS_FILE)
+
+
+if __name__ == "__main__":
+    manifest = json.loads(MANIFEST_FILE.read_text())
+    results = load_results()
+    pending = [job for job in manifest["jobs"] if job["file"] not in results]
+    
+    print(f"\\n📦 {len(manifest['jobs'])} jobs for {manifest['total_recipients']:,} recipients")
+    done = len(manifest["jobs"]) - len(pending)
+    print(f"⏭️  {done} already submitted, {len(pending)} to go ({MAX_WORKERS} at a time)")
+    
+    current_token()
+    failed = 0
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {pool.submit(submit_job, MANIFEST_FILE.with_name(job["file"])): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results[job["file"]] = future.result()
+                save_results(results)
+                print(f"✅ {job['file']} ({job['recipients']:,} recipients)")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {e}")
+    
+    print(f"\\n📊 {len(results)}/{len(manifest['jobs'])} jobs submitted")
+    if failed:
+        print("🔁 Run this script again to retry the failed jobs")
+        raise SystemExit(1)
+'''
+
+_PYTHON_UPLOAD_HEADER = '''#!/usr/bin/env python3
+"""
+C2M API - {{ endpoint }} (with document upload)
+Generated: {{ timestamp }}
+
+Uploads the local document in parallel parts before submitting the job.
+Progress is kept in <file>.upload.json, so an interrupted run resumes with
+only the missing parts.
+"""
+
+import base64
+import hashlib
+import mmap
+import os
+import random
+import sys
+import threading
+import time
+import requests
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Configuration
+API_BASE_URL = "{{ api_base_url }}"  # Mock server or production API endpoint
+AUTH_BASE_URL = "{{ auth_base_url }}"  # C2M Auth service (always use this)
+# Note: Using test credentials for the mock server
+CLIENT_ID = "test-client-123"  # Replace with your client ID if using production
+CLIENT_SECRET = "super-secret-password-123"  # Replace with your client secret if using production
+'''
+
+_PYTHON_UPLOAD_PAYLOAD_FILE = '''# Request body is read from this file; keep it next to the script
+PAYLOAD_FILE = Path(__file__).with_name("{{ payload_file }}")
+'''
+
+_PYTHON_UPLOAD_SETTINGS = '''UPLOAD_PATH = "/uploads"  # Upload request resource
+PART_SIZE = 8 * 1024 * 1024  # Bytes per uploaded part
+READ_SIZE = 1024 * 1024  # Bytes read from the mapped file at a time
+UPLOAD_WORKERS = int(os.environ.get("C2M_UPLOAD_WORKERS", "4"))  # Concurrent part uploads
+MAX_ATTEMPTS = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+'''
+
+_PYTHON_UPLOAD_STAGE = '''def request_with_retry(method: str, url: str, data: Any = None,
+                       **kwargs) -> requests.Response:
+    """Send an authenticated request, retrying throttled and transient failures with backoff"""
+    extra_headers = kwargs.pop("headers", {})
+    error = ""
+    
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        token = current_token()
+        headers = {"Authorization": f"Bearer {token}", **extra_headers}
+        if hasattr(data, "seek"):
+            data.seek(0)
+        
+        try:
+            response = requests.request(method, url, data=data, headers=headers, timeout=300, **kwargs)
+            if response.status_code == 401:
+                current_token(expired=token)
+                error = "HTTP 401"
+                continue
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                return response
+            error = f"HTTP {response.status_code}"
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = str(e)
+        
+        if attempt < MAX_ATTEMPTS:
+            # Exponential backoff with jitter so parallel workers do not retry in lockstep
+            time.sleep(min(60, 2 ** attempt) + random.uniform(0, 1))
+    
+    raise RuntimeError(f"{method} {url}: giving up after {MAX_ATTEMPTS} attempts ({error})")
+
+
+class MappedPart:
+    """Read-only file object over one part of a memory-mapped file
+
+    Bytes are copied out READ_SIZE at a time as the request is sent, so a
+    part never has to sit in memory as a whole.
+    """
+    
+    def __init__(self, mapped: mmap.mmap, start: int, end: int):
+        self.mapped = mapped
+        self.start = start
+        self.end = end
+        self.position = start
+    
+    def __len__(self) -> int:
+        return self.end - self.start
+    
+    def read(self, size: int = -1) -> bytes:
+        stop = self.end if size is None or size < 0 else min(self.end, self.position + size)
+        chunk = self.mapped[self.position:stop]
+        self.position = stop
+        return chunk
+    
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = {0: self.start, 1: self.position, 2: self.end}[whence]
+        self.position = max(self.start, min(self.end, base + offset))
+        return self.position - self.start
+    
+    def tell(self) -> int:
+        return self.position - self.start
+    
+    def checksum(self) -> str:
+        """Base64 MD5 of the part, for the Content-MD5 header"""
+        digest = hashlib.md5()
+        self.seek(0)
+        for chunk in iter(lambda: self.read(READ_SIZE), b""):
+            digest.update(chunk)
+        return base64.b64encode(digest.digest()).decode("ascii")
+
+
+def manifest_path(document: Path) -> Path:
+    """Resume manifest kept next to the uploaded file"""
+    return document.with_name(document.name + ".upload.json")
+
+
+def load_manifest(document: Path) -> Dict[str, Any]:
+    """Progress of an earlier run, if it was uploading this exact file"""
+    stat = document.stat()
+    identity = {"file": document.name, "size": stat.st_size, "mtime": stat.st_mtime_ns, "partSize": PART_SIZE}
+    path = manifest_path(document)
+    if path.exists():
+        manifest = json.loads(path.read_text())
+        if all(manifest.get(key) == value for key, value in identity.items()):
+            return manifest
+        print("♻️  File changed since the last run; starting a fresh upload")
+    return {**identity, "uploadRequestId": None, "parts": {}, "completed": False}
+
+
+def save_manifest(document: Path, manifest: Dict[str, Any]):
+    """Record upload progress atomically so an interrupted run can resume"""
+    path = manifest_path(document)
+    tmp_file = path.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps(manifest, indent=2))
+    tmp_file.replace(path)
+
+
+def upload_part(upload_id: str, number: int, part: MappedPart) -> str:
+    """Upload one part and return the tag the server assigned it"""
+    checksum = part.checksum()
+    response = request_with_retry(
+        "PUT",
+        f"{API_BASE_URL}{UPLOAD_PATH}/{upload_id}/parts/{number}",
+        data=part,
+        headers={"Content-Type": "application/octet-stream", "Content-MD5": checksum}
+    )
+    return response.headers.get("ETag", checksum)
+
+
+def upload_document(document: Path) -> str:
+    """Upload a local file in concurrent parts, resuming from the manifest
+
+    The file is memory-mapped and each part is read in small pieces while
+    it is sent, so even very large PDFs are never loaded into RAM.
+    Returns the uploadRequestId to reference in the job.
+    """
+    manifest = load_manifest(document)
+    if manifest["completed"]:
+        print(f"⏭️  {document.name} was already uploaded")
+        return manifest["uploadRequestId"]
+    
+    size = manifest["size"]
+    if size == 0:
+        raise RuntimeError(f"{document} is empty")
+    part_count = -(-size // PART_SIZE)
+    
+    if not manifest["uploadRequestId"]:
+        response = request_with_retry(
+            "POST",
+            f"{API_BASE_URL}{UPLOAD_PATH}",
+            json={"fileName": document.name, "size": size, "partSize": PART_SIZE, "partCount": part_count}
+        )
+        manifest["uploadRequestId"] = response.json()["uploadRequestId"]
+        save_manifest(document, manifest)
+    upload_id = manifest["uploadRequestId"]
+    
+    pending = [number for number in range(1, part_count + 1) if str(number) not in manifest["parts"]]
+    print(f"📦 {part_count} parts of {PART_SIZE // (1024 * 1024)} MiB, {part_count - len(pending)} already uploaded")
+    
+    manifest_lock = threading.Lock()
+    started = time.perf_counter()
+    sent = 0
+    
+    failed = []
+    
+    with open(document, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            # Let the OS read ahead and drop pages behind the upload
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            futures = {}
+            for number in pending:
+                start = (number - 1) * PART_SIZE
+                part = MappedPart(mapped, start, min(size, start + PART_SIZE))
+                futures[pool.submit(upload_part, upload_id, number, part)] = (number, len(part))
+            
+            for future in as_completed(futures):
+                number, length = futures[future]
+                try:
+                    tag = future.result()
+                except Exception as e:
+                    # Keep recording the parts that do succeed, so the next run skips them
+                    failed.append(f"part {number}: {e}")
+                    continue
+                with manifest_lock:
+                    manifest["parts"][str(number)] = tag
+                    save_manifest(document, manifest)
+                sent += length
+                rate = sent / max(time.perf_counter() - started, 1e-6) / (1024 * 1024)
+                print(f"  ✅ part {number}/{part_count} ({rate:.1f} MiB/s)")
+    
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(pending)} parts failed ({failed[0]})")
+    
+    request_with_retry(
+        "POST",
+        f"{API_BASE_URL}{UPLOAD_PATH}/{upload_id}/complete",
+        json={"parts": [{"partNumber": number, "tag": manifest["parts"][str(number)]}
+                        for number in range(1, part_count + 1)]}
+    )
+    manifest["completed"] = True
+    save_manifest(document, manifest)
+    return upload_id
+
+
+'''
+
+_PYTHON_UPLOAD_MAIN = '''if __name__ == "__main__":
+    payload = {{ body_json }}
+'''
+
+_PYTHON_UPLOAD_FILE_MAIN = '''if __name__ == "__main__":
+    payload = json.loads(PAYLOAD_FILE.read_text(encoding="utf-8"))
+'''
+
+_PYTHON_UPLOAD_RUN = '''    source = payload.get("documentSourceIdentifier")
+    if not isinstance(source, dict):
+        raise SystemExit("❌ This request does not reference an uploaded document")
+    
+    # The uploaded file is the zip archive when the document lives inside one
+    default_name = f"{source['zipId']}.zip" if source.get("zipId") else source.get("documentName", "")
+    document = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).with_name(default_name)
+    if not document.is_file():
+        raise SystemExit(f"❌ File to upload not found: {document}\\n"
+                         f"Usage: python {Path(__file__).name} <file-to-upload>")
+    
+    print("\\n🔐 Getting access token...")
+    current_token()
+    
+    try:
+        print(f"\\n📤 Uploading {document} ({document.stat().st_size:,} bytes, {UPLOAD_WORKERS} parts at a time)")
+        source["uploadRequestId"] = upload_document(document)
+        print(f"✅ Upload complete: {source['uploadRequestId']}")
+        
+        print(f"\\n📤 Sending request to: {API_BASE_URL}{{ endpoint }}")
+        response = request_with_retry("POST", f"{API_BASE_URL}{{ endpoint }}", json=payload)
+        print("\\n✅ Success! Response:")
+        print(json.dumps(response.json(), indent=2))
+    except (requests.exceptions.RequestException, RuntimeError) as e:
+        print(f"\\n❌ Error: {e}")
+        print("🔁 Run this script again to resume the upload")
+        raise SystemExit(1)
+'''
+
+# Full Python client with the complete authentication flow, body embedded or streamed from the payload file
+PYTHON_TEMPLATE = _PYTHON_HEADER + _PYTHON_AUTH_HELPERS + _PYTHON_MAIN
+PYTHON_FILE_TEMPLATE = _PYTHON_FILE_HEADER + _PYTHON_AUTH_HELPERS + _PYTHON_FILE_MAIN
+
+# Concurrent submission of a recipient list split into several jobs
+PYTHON_BATCH_TEMPLATE = _PYTHON_BATCH_HEADER + _PYTHON_AUTH_HELPERS + _PYTHON_TOKEN_CACHE + _PYTHON_BATCH_MAIN
+
+# Upload stage ahead of the job: parallel, resumable part uploads of the local document
+_PYTHON_UPLOAD_STAGES = _PYTHON_UPLOAD_SETTINGS + _PYTHON_AUTH_HELPERS + _PYTHON_TOKEN_CACHE + _PYTHON_UPLOAD_STAGE
+PYTHON_UPLOAD_TEMPLATE = _PYTHON_UPLOAD_HEADER + _PYTHON_UPLOAD_STAGES + _PYTHON_UPLOAD_MAIN + _PYTHON_UPLOAD_RUN
+PYTHON_UPLOAD_FILE_TEMPLATE = (_PYTHON_UPLOAD_HEADER + _PYTHON_UPLOAD_PAYLOAD_FILE + _PYTHON_UPLOAD_STAGES
+                               + _PYTHON_UPLOAD_FILE_MAIN + _PYTHON_UPLOAD_RUN)
+
+# Standalone bundler shipped with multi-document and zipId clients
+PYTHON_BUNDLE_TEMPLATE = '''#!/usr/bin/env python3
+"""
+C2M API - {{ endpoint }} document bundle
+Generated: {{ timestamp }}
+
+Streams local documents into a zip archive for a zipId submission and
+prints the documentSourceIdentifier entries that reference them. Files are
+copied and hashed in small chunks, so any number of large PDFs is bundled
+in one pass with constant memory.
+
+Usage: python bundle_documents.py <archive.zip> <document> [<document> ...]
+"""
+
+import hashlib
+import json
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict, Any, List
+
+COPY_CHUNK_SIZE = 1024 * 1024  # Bytes copied into the archive at a time
+
+
+def member_names(paths: List[Path]) -> List[str]:
+    """Flat, unique member name for every document"""
+    seen = set()
+    names = []
+    for path in paths:
+        name = path.name
+        counter = 2
+        while name.lower() in seen:
+            name = f"{path.stem}_{counter}{path.suffix}"
+            counter += 1
+        seen.add(name.lower())
+        names.append(name)
+    return names
+
+
+def bundle(archive_path: Path, paths: List[Path]) -> Dict[str, Any]:
+    """Stream every document into the archive and return the member index"""
+    members = []
+    tmp_file = archive_path.with_suffix(".tmp")
+    
+    with zipfile.ZipFile(tmp_file, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for path, name in zip(paths, member_names(paths)):
+            digest = hashlib.sha256()
+            size = 0
+            with open(path, "rb") as source, archive.open(name, "w", force_zip64=True) as member:
+                for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    member.write(chunk)
+                    size += len(chunk)
+            members.append({"documentName": name, "size": size, "sha256": digest.hexdigest()})
+            print(f"  ✅ {name} ({size:,} bytes)", file=sys.stderr)
+    
+    tmp_file.replace(archive_path)
+    return {"zipId": archive_path.stem, "archive": archive_path.name, "members": members}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        raise SystemExit(f"Usage: python {Path(__file__).name} <archive.zip> <document> [<document> ...]")
+    
+    archive_path = Path(sys.argv[1])
+    documents = [Path(p) for p in sys.argv[2:]]
+    missing = [str(p) for p in documents if not p.is_file()]
+    if missing:
+        raise SystemExit(f"❌ Documents not found: {', '.join(missing)}")
+    
+    print(f"📦 Bundling {len(documents)} documents into {archive_path}", file=sys.stderr)
+    index = bundle(archive_path, documents)
+    archive_path.with_name(archive_path.name + ".index.json").write_text(json.dumps(index, indent=2))
+    
+    # Upload the archive, then use these entries as the documentSourceIdentifier values
+    # (replace zipId with the id the upload returns if it differs)
+    sources = [{"zipId": index["zipId"], "documentName": m["documentName"]} for m in index["members"]]
+    print(json.dumps(sources, indent=2))
+'''
+
+# Short Python snippet shown in the Python tab
+PYTHON_PREVIEW_TEMPLATE = '''def submit_request(token: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Submit API request to {{ endpoint }}"""
+    url = f"{API_BASE_URL}{{ endpoint }}"
+    
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+    
+    response = requests.post(url, json=payload, headers=headers)
+    response.raise_for_status()
+    
+    return response.json()
+
+# Main execution
+if __name__ == "__main__":
+    token = get_access_token(CLIENT_ID, CLIENT_SECRET)
+    payload = {{ body_json }}
+    result = submit_request(token, payload)'''
+
+JAVASCRIPT_TEMPLATE = '''async function submitRequest(token, payload) {
+    const url = 'https://api.c2m.com/v2{{ endpoint }}';
+    
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(payload)
+    });
+    
+    return response.json();
+}
+
+// Main execution
+const token = await getAccessToken(CLIENT_ID, CLIENT_SECRET);
+const payload = {{ body_json }};
+const result = await submitRequest(token, payload);'''
+
+_CURL_AUTH = '''# Get long-term token
+LONG_TOKEN=$(curl -X POST {{ auth_base_url }}/auth/tokens/long \\
+  -H "Content-Type: application/json" \\
+  -d '{
+    "grant_type": "client_credentials",
+    "client_id": "test-client-123",
+    "client_secret": "super-secret-password-123"
+  }' | jq -r '.access_token')
+
+# Exchange for short-term token
+SHORT_TOKEN=$(curl -X POST {{ auth_base_url }}/auth/tokens/short \\
+  -H "Authorization: Bearer $LONG_TOKEN" \\
+  -H "Content-Type: application/json" \\
+  -d '{}' | jq -r '.access_token')
+
+'''
+
+CURL_TEMPLATE = _CURL_AUTH + '''# Make API request
+curl -X POST {{ api_base_url }}{{ endpoint }} \\
+  -H "Authorization: Bearer $SHORT_TOKEN" \\
+  -H "Content-Type: application/json" \\
+  -d '{{ body_json }}'
+'''
+
+# Variants for payloads too large to embed: the body is streamed from the payload file
+PYTHON_PREVIEW_FILE_TEMPLATE = '''def submit_request(token: str, payload: BinaryIO) -> Dict[str, Any]:
+    """Submit API request to {{ endpoint }}, streaming the payload file"""
+    url = f"{API_BASE_URL}{{ endpoint }}"
+    
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+    
+    response = requests.post(url, data=payload, headers=headers)
+    response.raise_for_status()
+    
+    return response.json()
+
+# Main execution
+if __name__ == "__main__":
+    token = get_access_token(CLIENT_ID, CLIENT_SECRET)
+    with open("{{ payload_file }}", "rb") as payload:
+        result = submit_request(token, payload)'''
+
+JAVASCRIPT_FILE_TEMPLATE = '''import { createReadStream } from 'node:fs';
+
+async function submitRequest(token, payloadPath) {
+    const url = 'https://api.c2m.com/v2{{ endpoint }}';
+    
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        },
+        // Stream the payload file instead of building the body in memory
+        body: createReadStream(payloadPath),
+        duplex: 'half'
+    });
+    
+    return response.json();
+}
+
+// Main execution
+const token = await getAccessToken(CLIENT_ID, CLIENT_SECRET);
+const result = await submitRequest(token, '{{ payload_file }}');'''
+
+CURL_FILE_TEMPLATE = _CURL_AUTH + '''# Make API request
+curl -X POST {{ api_base_url }}{{ endpoint }} \\
+  -H "Authorization: Bearer $SHORT_TOKEN" \\
+  -H "Content-Type: application/json" \\
+  --data-binary @{{ payload_file }}
+'''
+
+
+def compile_template(source: str) -> Callable[[Dict[str, str]], str]:
+    """Compile a template source once into a render function
+
+    Literal braces are escaped and placeholders are turned into str.format
+    fields up front, so rendering is a single format_map call.
+    """
+    pieces = _PLACEHOLDER.split(source)
+    literals = pieces[0::2]
+    names = pieces[1::2]
+
+    format_parts = [literals[0].replace("{", "{{").replace("}", "}}")]
+    for name, literal in zip(names, literals[1:]):
+        format_parts.append("{" + name + "}")
+        format_parts.append(literal.replace("{", "{{").replace("}", "}}"))
+    format_string = "".join(format_parts)
+
+    def render(context: Dict[str, str]) -> str:
+        return format_string.format_map(context)
+
+    render.placeholders = tuple(sorted(set(names)))
+    return render
+
+
+def generated_timestamp() -> str:
+    """The "Generated:" time stamped into rendered code"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def body_digest(body: Any) -> str:
+    """Stable hash of a request body; key order is kept because it shows in the output"""
+    return hashlib.sha1(json.dumps(body).encode("utf-8")).hexdigest()
+
+
+class TemplateRegistry:
+    """Registry of compiled templates with a bounded cache of rendered output
+
+    Rendered code is memoized per (target, endpoint, body hash, server,
+    payload file), so a Streamlit rerun with unchanged inputs costs one hash
+    and one dict lookup. The timestamp is left out of the cached text and
+    filled in on every render.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._templates: Dict[str, Tuple[Callable[[Dict[str, str]], str], Optional[int]]] = {}
+        self._sources: Dict[str, str] = {}
+        self._cache: "OrderedDict[Tuple[str, str, str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, target: str, source: str, body_indent: Optional[int] = None):
+        """Compile and register a template under a target name
+
+        body_indent controls how the request body is serialized into the
+        body_json placeholder (None means compact single-line JSON).
+        """
+        self._templates[target] = (compile_template(source), body_indent)
+        self._sources[target] = source
+        self.clear()
+
+    def targets(self) -> List[str]:
+        """Names of all registered targets"""
+        return list(self._templates)
+
+    def source(self, target: str) -> Tuple[str, Optional[int]]:
+        """Uncompiled template source of a target and its body indent"""
+        if target not in self._templates:
+            raise ValueError(f"Unknown code template: {target}")
+        return self._sources[target], self._templates[target][1]
+
+    def render(self, target: str, endpoint: str, body: Any = None,
+               server: str = DEFAULT_API_BASE_URL, payload_file: str = DEFAULT_PAYLOAD_FILE,
+               skeletons: Any = None) -> str:
+        """Render a target, reusing the cached output when the inputs are unchanged
+
+        The body is only serialized (and hashed) for templates that embed it
+        through body_json; the *_file targets reference payload_file instead.
+        On a cache miss, skeletons (a core.snippets.SnippetMatrix) is tried
+        before the full template when given.
+        """
+        if target not in self._templates:
+            raise ValueError(f"Unknown code template: {target}")
+
+        render, body_indent = self._templates[target]
+        embeds_body = "body_json" in render.placeholders
+        key = (target, endpoint, body_digest(body) if embeds_body else "", server, payload_file)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached.replace(TIMESTAMP_MARKER, generated_timestamp(), 1)
+            self.misses += 1
+
+        code = None
+        if skeletons is not None and embeds_body:
+            code = skeletons.render(target, endpoint, body, server, payload_file, timestamp=TIMESTAMP_MARKER)
+        if code is None:
+            code = render({
+                "endpoint": endpoint,
+                "api_base_url": server,
+                "auth_base_url": AUTH_BASE_URL,
+                "payload_file": payload_file,
+                "timestamp": TIMESTAMP_MARKER,
+                "body_json": json.dumps(body, indent=body_indent) if embeds_body else "",
+            })
+
+        with self._lock:
+            self._cache[key] = code
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return code.replace(TIMESTAMP_MARKER, generated_timestamp(), 1)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Cache statistics, mirroring functools.lru_cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "max_entries": self.max_entries,
+        }
+
+    def clear(self):
+        """Drop all rendered output"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def build_default_registry() -> TemplateRegistry:
+    """Registry with every built-in target compiled"""
+    registry = TemplateRegistry()
+    registry.register("python", PYTHON_TEMPLATE, body_indent=4)
+    registry.register("python_preview", PYTHON_PREVIEW_TEMPLATE, body_indent=4)
+    registry.register("javascript", JAVASCRIPT_TEMPLATE, body_indent=2)
+    registry.register("curl", CURL_TEMPLATE, body_indent=None)
+    registry.register("python_file", PYTHON_FILE_TEMPLATE)
+    registry.register("python_preview_file", PYTHON_PREVIEW_FILE_TEMPLATE)
+    registry.register("javascript_file", JAVASCRIPT_FILE_TEMPLATE)
+    registry.register("curl_file", CURL_FILE_TEMPLATE)
+    registry.register("python_batch", PYTHON_BATCH_TEMPLATE)
+    registry.register("python_upload", PYTHON_UPLOAD_TEMPLATE, body_indent=4)
+    registry.register("python_upload_file", PYTHON_UPLOAD_FILE_TEMPLATE)
+    registry.register("python_bundle", PYTHON_BUNDLE_TEMPLATE)
+    return registry
+
+
+# Shared by every session in the process; templates compile once at import
+CODE_TEMPLATES = build_default_registry()
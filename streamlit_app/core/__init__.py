@@ -0,0 +1,59 @@
+"""
+Click2Endpoint Core
+Endpoint resolution, body building, code generation and Postman lookups without Streamlit
+
+Importing this package performs no I/O: config.yaml is read on first use
+and network calls happen only when a Postman lookup is requested.
+"""
+
+from streamlit_app.address_store import AddressStore
+from streamlit_app.code_templates import CODE_TEMPLATES, DEFAULT_API_BASE_URL
+from streamlit_app.core.codegen import (
+    CODE_GENERATORS,
+    INLINE_PAYLOAD_LIMIT,
+    PAYLOAD_FILE_NAME,
+    code_target,
+    generate_curl_command,
+    generate_full_python_code,
+    generate_javascript_preview,
+    generate_python_preview,
+    uses_upload,
+    uses_zip_bundle
+)
+from streamlit_app.core.config import CONFIG_PATH, load_config
+from streamlit_app.core.endpoints import get_endpoint
+from streamlit_app.core.postman import (
+    default_mock_server_url,
+    get_all_postman_collections,
+    get_all_postman_mock_servers,
+    get_postman_mock_servers,
+    resolve_mock_server
+)
+from streamlit_app.param_store import ParameterStore
+from streamlit_app.payload_writer import write_payload
+
+__all__ = [
+    "AddressStore",
+    "CODE_GENERATORS",
+    "CODE_TEMPLATES",
+    "CONFIG_PATH",
+    "DEFAULT_API_BASE_URL",
+    "INLINE_PAYLOAD_LIMIT",
+    "PAYLOAD_FILE_NAME",
+    "ParameterStore",
+    "code_target",
+    "default_mock_server_url",
+    "generate_curl_command",
+    "generate_full_python_code",
+    "generate_javascript_preview",
+    "generate_python_preview",
+    "get_all_postman_collections",
+    "get_all_postman_mock_servers",
+    "get_endpoint",
+    "get_postman_mock_servers",
+    "load_config",
+    "resolve_mock_server",
+    "uses_upload",
+    "uses_zip_bundle",
+    "write_payload",
+]
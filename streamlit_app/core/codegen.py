@@ -0,0 +1,73 @@
+"""
+Core Code Generation
+Client code for a request body in every supported language
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+from streamlit_app.code_templates import CODE_TEMPLATES, DEFAULT_API_BASE_URL
+from streamlit_app.core.snippets import snippet_matrix
+from streamlit_app.zip_bundler import BUNDLE_ENDPOINTS
+
+# Request body file the generated code streams large bodies from
+PAYLOAD_FILE_NAME = "c2m_api_request.json"
+
+# Bodies bigger than this are streamed from the payload file instead of embedded in generated code
+INLINE_PAYLOAD_LIMIT = 64 * 1024
+
+
+def code_target(base: str, payload_file: Optional[str]) -> str:
+    """Template target for a language: inline body, or streamed from payload_file"""
+    return f"{base}_file" if payload_file else base
+
+
+def uses_upload(body: Dict[str, Any]) -> bool:
+    """Check whether the document comes from an upload request the client should perform first"""
+    source = body.get("documentSourceIdentifier")
+    return isinstance(source, dict) and "uploadRequestId" in source
+
+
+def uses_zip_bundle(endpoint: str, body: Dict[str, Any]) -> bool:
+    """Check whether the request's documents are expected to live inside a zip"""
+    source = body.get("documentSourceIdentifier")
+    return endpoint in BUNDLE_ENDPOINTS or (isinstance(source, dict) and "zipId" in source)
+
+
+def _render(target: str, endpoint: str, body: Dict[str, Any], payload_file: Optional[str], base_url: str) -> str:
+    """Render through the template cache, filling a precomputed skeleton on a miss"""
+    return CODE_TEMPLATES.render(target, endpoint, body, base_url, payload_file or PAYLOAD_FILE_NAME,
+                                 skeletons=snippet_matrix())
+
+
+def generate_full_python_code(endpoint: str, body: Dict[str, Any], payload_file: Optional[str] = None,
+                              base_url: str = DEFAULT_API_BASE_URL) -> str:
+    """Generate complete Python code with authentication flow, plus the document upload if needed"""
+    base = "python_upload" if uses_upload(body) else "python"
+    return _render(code_target(base, payload_file), endpoint, body, payload_file, base_url)
+
+
+def generate_python_preview(endpoint: str, body: Dict[str, Any], payload_file: Optional[str] = None,
+                            base_url: str = DEFAULT_API_BASE_URL) -> str:
+    """Generate the short Python snippet shown in the Python tab"""
+    return _render(code_target("python_preview", payload_file), endpoint, body, payload_file, base_url)
+
+
+def generate_javascript_preview(endpoint: str, body: Dict[str, Any], payload_file: Optional[str] = None,
+                                base_url: str = DEFAULT_API_BASE_URL) -> str:
+    """Generate JavaScript fetch example"""
+    return _render(code_target("javascript", payload_file), endpoint, body, payload_file, base_url)
+
+
+def generate_curl_command(endpoint: str, body: Dict[str, Any], payload_file: Optional[str] = None,
+                          base_url: str = DEFAULT_API_BASE_URL) -> str:
+    """Generate cURL commands including the token exchange"""
+    return _render(code_target("curl", payload_file), endpoint, body, payload_file, base_url)
+
+
+# Generator for each language offered outside the app (HTTP service, static export)
+CODE_GENERATORS: Dict[str, Callable[..., str]] = {
+    "python": generate_full_python_code,
+    "python_preview": generate_python_preview,
+    "javascript": generate_javascript_preview,
+    "curl": generate_curl_command,
+}
@@ -0,0 +1,26 @@
+"""
+Core Config
+config.yaml, read on first use instead of at import
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config.yaml"
+
+
+@lru_cache(maxsize=8)
+def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Parsed config.yaml, or {} when the file does not exist; cached per path
+
+    Callers share the returned dict, so treat it as read-only.
+    """
+    path = Path(path) if path else CONFIG_PATH
+    if not path.exists():
+        return {}
+
+    import yaml  # Only needed once per process, so kept off the import path
+
+    with open(path, "r") as f:
+        return yaml.safe_load(f) or {}
@@ -0,0 +1,36 @@
+"""
+Core Endpoints
+Endpoint resolution from the Level 1 answers
+"""
+
+from typing import Dict, Optional
+
+
+# Hardcoded endpoint mapping based on QA_TREE_ALL_PATHS.md
+def get_endpoint(answers: Dict[str, str]) -> Optional[str]:
+    """Determine endpoint based on answers - from EBNF file"""
+    doc_type = answers.get("docType")
+    template_usage = answers.get("templateUsage")
+    recipient_style = answers.get("recipientStyle")
+
+    if doc_type == "single":
+        if template_usage == "true":
+            return "/jobs/single-doc-job-template"  # Use Case 1
+        else:
+            return "/jobs/single-doc"  # Use Case 4
+    elif doc_type == "multi":
+        if template_usage == "true":
+            return "/jobs/multi-docs-job-template"  # Use Case 2
+        else:
+            return "/jobs/multi-doc"  # Use Case 5
+    elif doc_type == "merge":
+        if template_usage == "true":
+            return "/jobs/multi-doc-merge-job-template"  # Use Case 3
+        else:
+            return "/jobs/multi-doc-merge"  # Use Case 6
+    elif doc_type == "pdfSplit":
+        if recipient_style == "addressCapture":
+            return "/jobs/single-pdf-split-addressCapture"  # Use Case 8
+        else:
+            return "/jobs/single-pdf-split"  # Use Case 7
+    return None
@@ -0,0 +1,117 @@
+"""
+Core Postman
+Mock server lookups through the Postman API, with the config and repo-file fallbacks
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from streamlit_app.code_templates import DEFAULT_API_BASE_URL
+from streamlit_app.core.config import load_config
+from streamlit_app.metrics import POSTMAN_ERRORS, POSTMAN_REQUEST_SECONDS
+
+POSTMAN_API_URL = "https://api.getpostman.com"
+
+# Written by the c2m-api-repo build; relative to the working directory the app runs in
+MOCK_URL_FILE = Path("../c2m-api-repo/postman/postman_mock_url.txt")
+
+# API key environment variable per workspace type
+API_KEY_VARIABLES = {"team": "POSTMAN_API_KEY_TEAM", "personal": "POSTMAN_API_KEY_PERSONAL"}
+
+ErrorHandler = Callable[[Exception], None]
+
+
+def _get(path: str, api_key: str) -> Dict[str, Any]:
+    """GET a Postman API resource"""
+    import requests  # Deferred so importing the core package stays cheap
+
+    try:
+        with POSTMAN_REQUEST_SECONDS.time(resource=path):
+            response = requests.get(f"{POSTMAN_API_URL}/{path}", headers={"X-Api-Key": api_key}, timeout=5)
+            response.raise_for_status()
+            return response.json()
+    except Exception:
+        POSTMAN_ERRORS.inc(resource=path)
+        raise
+
+
+def get_all_postman_collections(api_key: str) -> List[Dict[str, Any]]:
+    """Get all collections from Postman"""
+    return _get("collections", api_key)["collections"]
+
+
+def get_all_postman_mock_servers(api_key: str) -> List[Dict[str, Any]]:
+    """Get all mock servers from Postman"""
+    return _get("mocks", api_key)["mocks"]
+
+
+def postman_api_key(workspace_type: str) -> str:
+    """API key for a workspace type from the environment ("" when unset)"""
+    return os.environ.get(API_KEY_VARIABLES.get(workspace_type, API_KEY_VARIABLES["personal"]), "")
+
+
+def get_postman_mock_servers(workspace_type: Optional[str] = None, config: Optional[Dict[str, Any]] = None,
+                             on_error: Optional[ErrorHandler] = None) -> Optional[List[Dict[str, str]]]:
+    """Fetch mock servers from Postman API with collection association
+
+    Returns None when the integration is disabled, no key is set or the API
+    call fails; failures are passed to on_error first, if given.
+    """
+    config = load_config() if config is None else config
+    postman = config.get("postman", {})
+    workspace_type = workspace_type or postman.get("default_workspace", "personal")
+
+    api_key = postman_api_key(workspace_type)
+    if not api_key or not postman.get("enabled", False):
+        return None
+
+    try:
+        collections = get_all_postman_collections(api_key)
+        mocks = get_all_postman_mock_servers(api_key)
+    except Exception as e:
+        if on_error:
+            on_error(e)
+        return None
+
+    # Map collection UID to name so each mock can be labelled with its collection
+    collection_names = {col["uid"]: col["name"] for col in collections}
+    return [
+        {
+            "name": f"{mock.get('name', 'Unknown')} "
+                    f"({collection_names.get(mock.get('collection'), 'Unknown Collection')})",
+            "url": mock.get("mockUrl", f"https://{mock.get('id', '')}.mock.pstmn.io"),
+            "id": mock.get("id", ""),
+            "collection": collection_names.get(mock.get("collection"), "Unknown Collection"),
+            "workspace": workspace_type
+        }
+        for mock in mocks
+    ]
+
+
+def default_mock_server_url(config: Optional[Dict[str, Any]] = None) -> str:
+    """Mock server URL from config.yaml, or the built-in default"""
+    config = load_config() if config is None else config
+    return config.get("api", {}).get("mock_server_url", DEFAULT_API_BASE_URL)
+
+
+def resolve_mock_server(workspace_type: Optional[str] = None, config: Optional[Dict[str, Any]] = None,
+                        on_error: Optional[ErrorHandler] = None) -> Tuple[str, str]:
+    """(URL, display name) of the mock server to use
+
+    Tries the Postman API first, then the URL file written by c2m-api-repo,
+    then the config default.
+    """
+    config = load_config() if config is None else config
+    if config.get("postman", {}).get("enabled", False):
+        mocks = get_postman_mock_servers(workspace_type, config, on_error)
+        if mocks:
+            # Use first C2M mock found
+            return mocks[0]["url"], mocks[0]["name"]
+
+    if MOCK_URL_FILE.exists():
+        url = MOCK_URL_FILE.read_text().strip()
+        if url:
+            return url, "From c2m-api-repo"
+
+    return default_mock_server_url(config), "Default Mock Server"
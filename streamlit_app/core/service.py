@@ -0,0 +1,216 @@
+"""
+Core Service
+Headless HTTP API for endpoint recommendations, request bodies and generated code
+"""
+
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from streamlit_app.address_store import AddressStore
+from streamlit_app.code_templates import DEFAULT_API_BASE_URL
+from streamlit_app.core.codegen import CODE_GENERATORS
+from streamlit_app.core.endpoints import get_endpoint
+from streamlit_app.param_store import FIELD_DEFAULTS, ParameterStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+# Requests bigger than this are refused before their body is read
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+class ServiceError(ValueError):
+    """A request the service cannot answer; reported to the client as a 400"""
+
+
+def _object(request: Any, field: str) -> Dict[str, Any]:
+    """A JSON object field of a request, empty when absent"""
+    value = request.get(field, {})
+    if not isinstance(value, dict):
+        raise ServiceError(f"'{field}' must be an object")
+    return value
+
+
+def _string(request: Any, field: str, default: Optional[str] = None) -> Optional[str]:
+    """A string field of a request, default when absent"""
+    value = request.get(field)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ServiceError(f"'{field}' must be a string")
+    return value
+
+
+def _check_params(params: Dict[str, Any]):
+    """Refuse unknown parameters and values of the wrong type before they reach the body builders"""
+    for field, value in params.items():
+        if field not in FIELD_DEFAULTS:
+            raise ServiceError(f"Unknown parameter: {field}")
+        if value is None:
+            continue
+        if isinstance(FIELD_DEFAULTS[field], float):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ServiceError(f"Parameter '{field}' must be a number")
+        elif not isinstance(value, str):
+            raise ServiceError(f"Parameter '{field}' must be a string")
+
+
+def recommend(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Endpoint for the Level 1 answers: {"answers": {"docType": ..., ...}}"""
+    answers = _object(request, "answers")
+    endpoint = get_endpoint(answers)
+    if endpoint is None:
+        raise ServiceError("No endpoint matches these answers")
+    return {"endpoint": endpoint}
+
+
+def build_payload(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Full request body from {"params": {field: value}, "recipients": [row, ...]}
+
+    Parameter names are the ParameterStore fields (doc_id, template_name,
+    payment, ...) and recipient rows use the address store columns.
+    """
+    values = _object(request, "params")
+    _check_params(values)
+    params = ParameterStore()
+    for field, value in values.items():
+        params.set(field, value)
+
+    recipients = request.get("recipients") or []
+    if not isinstance(recipients, list) or not all(isinstance(row, dict) for row in recipients):
+        raise ServiceError("'recipients' must be a list of objects")
+    addresses = AddressStore()
+    for row in recipients:
+        addresses.append(row)
+
+    body = params.build_body(addresses)
+    return {"body": body, "recipient_count": len(body.get("recipientAddressSources", []))}
+
+
+def generate_code(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Client code for a request
+
+    The endpoint is given directly or recommended from "answers"; the body
+    is given directly or built from "params" and "recipients".
+    """
+    language = _string(request, "language", "python")
+    generator = CODE_GENERATORS.get(language)
+    if generator is None:
+        raise ServiceError(f"Unknown language: {language} (expected one of {', '.join(CODE_GENERATORS)})")
+
+    endpoint = _string(request, "endpoint") or recommend(request)["endpoint"]
+    body = _object(request, "body") if "body" in request else build_payload(request)["body"]
+    code = generator(endpoint, body, _string(request, "payload_file"),
+                     _string(request, "base_url") or DEFAULT_API_BASE_URL)
+    return {"endpoint": endpoint, "language": language, "code": code}
+
+
+# URL path of every POST operation
+OPERATIONS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "/recommend": recommend,
+    "/payload": build_payload,
+    "/code": generate_code,
+}
+
+
+def internal_error(error: Exception) -> str:
+    """Message for a failure that is the service's fault, not the request's"""
+    return f"Internal error: {type(error).__name__}: {error}"
+
+
+def _run(operation: Callable[[Dict[str, Any]], Dict[str, Any]], request: Any) -> Dict[str, Any]:
+    if not isinstance(request, dict):
+        raise ServiceError("Each request must be a JSON object")
+    return operation(request)
+
+
+def handle(path: str, request: Any) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Answer one request, or a JSON list of requests as a batch
+
+    A failing item in a batch becomes {"error": message} in its place, so
+    one bad request, or one the service fails on, does not cost the others
+    their answers.
+    """
+    operation = OPERATIONS.get(path)
+    if operation is None:
+        raise ServiceError(f"Unknown operation: {path}")
+    if not isinstance(request, list):
+        return _run(operation, request)
+
+    results = []
+    for item in request:
+        try:
+            results.append(_run(operation, item))
+        except ValueError as e:
+            results.append({"error": str(e)})
+        except Exception as e:
+            results.append({"error": internal_error(e)})
+    return results
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP/1.1 with persistent connections"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "Click2Endpoint"
+    # Buffer each response so headers and body leave in one write, and send
+    # it at once instead of waiting on Nagle's algorithm
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok", "operations": sorted(OPERATIONS)})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self):
+        if self.path not in OPERATIONS:
+            # The unread body would be taken for the next request
+            self.close_connection = True
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Not found: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # Without a usable length the body cannot be skipped, so the connection ends here too
+            self.close_connection = True
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "Content-Length must be a non-negative integer"})
+            return
+        if length > MAX_REQUEST_BYTES:
+            self.close_connection = True
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"Request is over {MAX_REQUEST_BYTES:,} bytes"})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            self._send(HTTPStatus.OK, handle(self.path, request))
+        except ValueError as e:
+            # Malformed JSON or a ServiceError
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:
+            # Still a JSON answer, so the client gets a reason and keeps its connection
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": internal_error(e)})
+
+    def _send(self, status: HTTPStatus, payload: Any):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response_only(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any):
+        """Per-request access logs cost more than the requests themselves"""
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                handler: Optional[type] = None) -> ThreadingHTTPServer:
+    """Threaded server, one thread per connection; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), handler or ServiceHandler)
+    server.daemon_threads = True
+    return server
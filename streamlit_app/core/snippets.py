@@ -0,0 +1,221 @@
+"""
+Core Snippets
+Code skeletons precomputed for every request body shape, completed by placeholder substitution
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from itertools import count, product
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from streamlit_app.address_store import AddressStore
+from streamlit_app.code_templates import AUTH_BASE_URL, CODE_TEMPLATES, DEFAULT_API_BASE_URL, generated_timestamp
+from streamlit_app.param_store import DOC_SPEC_FIELDS, FIELD_SECTIONS, PAYMENT_TYPES, ParameterStore
+from streamlit_app.session_workspace import atomic_write
+
+# Templates that embed the request body; the *_file targets never see it
+SNIPPET_TARGETS = ("python", "python_upload", "python_preview", "javascript", "curl")
+
+# Written by scripts/build_snippet_matrix.py; built in memory on first use when absent or stale
+DEFAULT_MATRIX_PATH = Path(__file__).parent.parent.parent / "generated_code" / "snippet_matrix.json"
+
+# One sample recipient per address store entry type
+SAMPLE_RECIPIENTS = {
+    "addressListId": {"type": "addressListId", "value": "list"},
+    "addressId": {"type": "addressId", "value": "address"},
+    "newAddress": {"type": "newAddress", "firstName": "first", "lastName": "last"},
+}
+
+_BODY_JSON = re.compile(r"\{\{\s*body_json\s*\}\}")
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Nested (key, shape) tuples with None for each leaf value
+Shape = Any
+
+
+def body_shape(body: Any, leaves: List[Any]) -> Shape:
+    """Key structure of a body, appending its leaf values to leaves in document order
+
+    Lists are leaves, so a body with 3 or 300 recipients has the same shape.
+    """
+    if isinstance(body, dict):
+        return tuple((key, body_shape(value, leaves)) for key, value in body.items())
+    leaves.append(body)
+    return None
+
+
+def compile_skeleton(source: str) -> Callable[[Dict[str, str]], str]:
+    """Render function that splices placeholder values between precut literal pieces
+
+    Skeletons are mostly literal code full of braces; joining slices avoids
+    the brace unescaping str.format would do on every render.
+    """
+    pieces = _PLACEHOLDER.split(source)
+    names = pieces[1::2]
+
+    def render(context: Dict[str, str]) -> str:
+        parts = pieces.copy()
+        parts[1::2] = [context[name] for name in names]
+        return "".join(parts)
+
+    return render
+
+
+def _marked(body: Any, slots: Iterator[int]) -> Any:
+    """Copy of a body with every leaf replaced by a numbered marker string"""
+    if isinstance(body, dict):
+        return {key: _marked(value, slots) for key, value in body.items()}
+    return f"\x00{next(slots)}\x00"
+
+
+class SnippetMatrix:
+    """Lookup table of compiled skeletons keyed by (target, body shape)
+
+    A skeleton is a template with the body's keys and indentation already
+    written out; its leaves are placeholders. Rendering looks up the shape
+    and serializes only the leaf values, so the cost no longer depends on
+    walking and re-encoding the whole template context per request.
+    """
+
+    def __init__(self):
+        self._skeletons: Dict[Tuple[str, Shape], Tuple[Callable[[Dict[str, str]], str], Optional[int], List[str]]] = {}
+        self._sources: Dict[Tuple[str, Shape], Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._skeletons)
+
+    def add(self, target: str, body: Dict[str, Any]):
+        """Pre-render the skeleton of body's shape for a target"""
+        leaves: List[Any] = []
+        shape = body_shape(body, leaves)
+        if (target, shape) in self._skeletons:
+            return
+
+        template, indent = CODE_TEMPLATES.source(target)
+        body_json = json.dumps(_marked(body, count()), indent=indent)
+        pads = []
+        for slot in range(len(leaves)):
+            marker = json.dumps(f"\x00{slot}\x00")
+            position = body_json.index(marker)
+            line = body_json[body_json.rfind("\n", 0, position) + 1:position]
+            pads.append(line[:len(line) - len(line.lstrip())])
+            body_json = body_json.replace(marker, f"{{{{ v{slot} }}}}")
+
+        source = _BODY_JSON.sub(lambda match: body_json, template)
+        self._store(target, shape, {"target": target, "body": _marked(body, count()), "source": source,
+                                    "indent": indent, "pads": pads})
+
+    def _store(self, target: str, shape: Shape, entry: Dict[str, Any]):
+        self._skeletons[(target, shape)] = (compile_skeleton(entry["source"]), entry["indent"], entry["pads"])
+        self._sources[(target, shape)] = entry
+
+    def render(self, target: str, endpoint: str, body: Any, server: str = DEFAULT_API_BASE_URL,
+               payload_file: str = "", timestamp: Optional[str] = None) -> Optional[str]:
+        """Code for a body, or None when its shape was not precomputed
+
+        Output matches CODE_TEMPLATES.render for the same inputs. timestamp
+        defaults to now.
+        """
+        leaves: List[Any] = []
+        skeleton = self._skeletons.get((target, body_shape(body, leaves)))
+        if skeleton is None:
+            return None
+
+        render, indent, pads = skeleton
+        context = {
+            "endpoint": endpoint,
+            "api_base_url": server,
+            "auth_base_url": AUTH_BASE_URL,
+            "payload_file": payload_file,
+            "timestamp": timestamp or generated_timestamp(),
+        }
+        for slot, (value, pad) in enumerate(zip(leaves, pads)):
+            if isinstance(value, (list, dict)):
+                # Nested lines take the indentation of the line the value starts on
+                context[f"v{slot}"] = json.dumps(value, indent=indent).replace("\n", "\n" + pad)
+            else:
+                context[f"v{slot}"] = json.dumps(value)
+        return render(context)
+
+    def save(self, path: Path) -> Path:
+        """Write the table, stamped with the template sources it was built from"""
+        data = {"templates": templates_digest(), "skeletons": list(self._sources.values())}
+        return atomic_write(path, json.dumps(data))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SnippetMatrix"]:
+        """Read a saved table, or None when it is missing or the templates have changed since"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("templates") != templates_digest():
+            return None
+
+        matrix = cls()
+        for entry in data["skeletons"]:
+            matrix._store(entry["target"], body_shape(entry["body"], []), entry)
+        return matrix
+
+
+def templates_digest() -> str:
+    """Hash of every skeleton template, to detect a stale saved matrix"""
+    digest = hashlib.blake2b(digest_size=8)
+    for target in SNIPPET_TARGETS:
+        source, indent = CODE_TEMPLATES.source(target)
+        digest.update(f"{target}\0{indent}\0{source}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def sample_bodies() -> Iterator[Dict[str, Any]]:
+    """One filled-in body per combination of the Level 2 structural choices
+
+    Document specification method (or a document from the template),
+    recipient entry type (or none), payment type (or none), template ID or
+    name (or none), and tags or not. Many combinations share a shape.
+    """
+    documents = [()] + [tuple(fields) for fields in DOC_SPEC_FIELDS.values()]
+    recipients = [None] + list(SAMPLE_RECIPIENTS.values())
+    payments = [None] + PAYMENT_TYPES
+    templates = [(), ("template_id",), ("template_name",)]
+    payment_fields = [field for field, section in FIELD_SECTIONS.items() if section == "payment" and field != "payment"]
+
+    for document, recipient, payment, template, tags in product(documents, recipients, payments, templates,
+                                                                (False, True)):
+        params = ParameterStore()
+        for field in document + template:
+            params.set(field, field)
+        if payment:
+            params.set("payment", payment)
+            for field in payment_fields:
+                params.set(field, 1.0 if field == "credit_amount" else field)
+        if tags:
+            params.set("tags", "tag")
+
+        addresses = AddressStore()
+        if recipient:
+            addresses.append(recipient)
+        yield params.build_body(addresses)
+
+
+def build_snippet_matrix() -> SnippetMatrix:
+    """Skeletons for every target and every body shape the Level 2 form can produce"""
+    bodies = {}
+    for body in sample_bodies():
+        bodies.setdefault(body_shape(body, []), body)
+
+    matrix = SnippetMatrix()
+    for body in bodies.values():
+        for target in SNIPPET_TARGETS:
+            matrix.add(target, body)
+    return matrix
+
+
+@lru_cache(maxsize=1)
+def snippet_matrix(path: Path = DEFAULT_MATRIX_PATH) -> SnippetMatrix:
+    """The process-wide matrix: the offline build at path when current, otherwise built on first use"""
+    return SnippetMatrix.load(path) or build_snippet_matrix()
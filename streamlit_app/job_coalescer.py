@@ -0,0 +1,132 @@
+"""
+Job Coalescer
+Group compatible single-document jobs and rewrite them into multi-document submissions
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Single-doc endpoint -> the multi-doc endpoint that accepts the same job settings
+COALESCE_TARGETS = {
+    "/jobs/single-doc": "/jobs/multi-doc",
+    "/jobs/single-doc-job-template": "/jobs/multi-docs-job-template",
+}
+
+DOCUMENT_KEY = "documentSourceIdentifier"
+RECIPIENTS_KEY = "recipientAddressSources"
+ITEMS_KEY = "items"
+
+# Document/recipient pairs per multi-doc submission
+DEFAULT_MAX_ITEMS = 1000
+
+Spec = Tuple[str, Dict[str, Any]]
+
+
+def group_key(endpoint: str, body: Dict[str, Any]) -> str:
+    """Hash of everything two jobs must share to be submitted together
+
+    That is the endpoint plus every body section other than the document and
+    its recipients: template, job options, payment and tags.
+    """
+    shared = {key: value for key, value in body.items() if key not in (DOCUMENT_KEY, RECIPIENTS_KEY)}
+    canonical = json.dumps([endpoint, shared], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _Group:
+    """Pending document/recipient pairs for one group key"""
+
+    __slots__ = ("endpoint", "shared", "items", "parts")
+
+    def __init__(self, endpoint: str, body: Dict[str, Any]):
+        self.endpoint = endpoint
+        self.shared = {key: value for key, value in body.items() if key not in (DOCUMENT_KEY, RECIPIENTS_KEY)}
+        self.items: List[Dict[str, Any]] = []
+        # (spec index, document, number of its recipients in items)
+        self.parts: List[List[Any]] = []
+
+
+class JobCoalescer:
+    """Streaming planner that packs single-doc specs into the fewest multi-doc submissions
+
+    Specs are indexed by group_key, so each one costs a single hash lookup.
+    A group is emitted as soon as it holds max_items pairs, which keeps
+    memory bounded by the number of distinct groups rather than the number
+    of specs.
+    """
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS):
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        self.max_items = max_items
+        self._groups: Dict[str, _Group] = {}
+        self._next_index = 0
+        self.stats = {"specs": 0, "coalesced": 0, "passthrough": 0, "submissions": 0}
+
+    def add(self, endpoint: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Queue one spec, returning any submissions it filled up"""
+        index = self._next_index
+        self._next_index += 1
+        self.stats["specs"] += 1
+
+        recipients = body.get(RECIPIENTS_KEY) or []
+        if endpoint not in COALESCE_TARGETS or not body.get(DOCUMENT_KEY) or not recipients:
+            # Nothing to pair up (e.g. recipients come from the job template) - send as is
+            self.stats["passthrough"] += 1
+            return [self._submission(endpoint, body, [index])]
+
+        self.stats["coalesced"] += 1
+        key = group_key(endpoint, body)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group(endpoint, body)
+
+        document = body[DOCUMENT_KEY]
+        ready = []
+        for recipient in recipients:
+            if not group.parts or group.parts[-1][0] != index:
+                group.parts.append([index, document, 0])
+            group.items.append({DOCUMENT_KEY: document, "recipientAddressSource": recipient})
+            group.parts[-1][2] += 1
+            if len(group.items) >= self.max_items:
+                ready.append(self._emit(group))
+        return ready
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Emit every partially filled group"""
+        ready = [self._emit(group) for group in self._groups.values() if group.items]
+        self._groups.clear()
+        return ready
+
+    def _emit(self, group: _Group) -> Dict[str, Any]:
+        """Turn a group's pending pairs into one submission and reset it"""
+        items, parts = group.items, group.parts
+        group.items, group.parts = [], []
+
+        if len(parts) == 1:
+            # A lone document gains nothing from multi-doc; keep its original endpoint
+            body = {DOCUMENT_KEY: parts[0][1], RECIPIENTS_KEY: [item["recipientAddressSource"] for item in items]}
+            body.update(group.shared)
+            return self._submission(group.endpoint, body, [parts[0][0]])
+
+        body = {ITEMS_KEY: items}
+        body.update(group.shared)
+        return self._submission(COALESCE_TARGETS[group.endpoint], body, [part[0] for part in parts])
+
+    def _submission(self, endpoint: str, body: Dict[str, Any], specs: List[int]) -> Dict[str, Any]:
+        self.stats["submissions"] += 1
+        return {"endpoint": endpoint, "body": body, "specs": specs}
+
+
+def coalesce(specs: Iterable[Spec], max_items: int = DEFAULT_MAX_ITEMS,
+             coalescer: Optional[JobCoalescer] = None) -> Iterator[Dict[str, Any]]:
+    """Yield submissions for a stream of (endpoint, body) single-doc specs
+
+    Each submission is {"endpoint", "body", "specs"} where specs lists the
+    input positions it carries. Pass a coalescer to read its stats afterwards.
+    """
+    coalescer = coalescer or JobCoalescer(max_items)
+    for endpoint, body in specs:
+        yield from coalescer.add(endpoint, body)
+    yield from coalescer.flush()
@@ -0,0 +1,145 @@
+"""
+Job Splitter
+Partition oversized recipient lists into balanced jobs with one payload file per job
+"""
+
+import json
+from bisect import bisect_left
+from datetime import datetime
+from itertools import accumulate, islice
+from math import ceil
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from streamlit_app.payload_writer import iter_json, write_payload
+from streamlit_app.session_workspace import atomic_write, atomic_writer
+
+# Endpoints whose recipient list can be split across independent jobs
+SPLITTABLE_ENDPOINTS = ("/jobs/single-doc", "/jobs/multi-doc")
+
+RECIPIENTS_KEY = "recipientAddressSources"
+MANIFEST_FILE = "manifest.json"
+
+DEFAULT_MAX_RECIPIENTS = 1000
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# Bytes each streamed element adds around its JSON: indent plus ",\n"
+_ITEM_OVERHEAD = 6
+# A non-empty streamed array closes with "\n  ]" instead of the "]" of an empty one
+_ARRAY_OVERHEAD = 3
+
+BodyItems = Iterable[Tuple[str, Any]]
+
+
+def measure_body(body_items: BodyItems) -> Tuple[int, List[int]]:
+    """Size of the body without recipients, and the encoded size of every recipient
+
+    Recipients are consumed one at a time, so only the list of sizes is kept.
+    """
+    sizes: List[int] = []
+    others = []
+    for key, value in body_items:
+        if key == RECIPIENTS_KEY:
+            sizes = [len(json.dumps(item).encode("utf-8")) + _ITEM_OVERHEAD for item in value]
+            value = iter(())
+        others.append((key, value))
+    base = sum(len(piece.encode("utf-8")) for piece in iter_json(others))
+    return base + (_ARRAY_OVERHEAD if sizes else 0), sizes
+
+
+def plan_chunks(sizes: Sequence[int], max_recipients: int = DEFAULT_MAX_RECIPIENTS,
+                max_bytes: int = DEFAULT_MAX_BYTES, base_bytes: int = 0) -> List[Tuple[int, int]]:
+    """Split recipients into the fewest contiguous [start, end) ranges within both limits
+
+    Ranges are balanced on whichever limit forces the split - recipient
+    count or bytes - so jobs come out roughly equal rather than full jobs
+    followed by a small remainder.
+    """
+    total = len(sizes)
+    if total == 0:
+        return []
+
+    budget = max_bytes - base_bytes
+    if max_recipients < 1:
+        raise ValueError("max_recipients must be at least 1")
+    if budget <= 0 or max(sizes) > budget:
+        raise ValueError("A single recipient does not fit within max_bytes")
+
+    prefix = list(accumulate(sizes, initial=0))
+    by_count = ceil(total / max_recipients)
+    by_bytes = ceil(prefix[-1] / budget)
+    weights = range(total + 1) if by_count >= by_bytes else prefix
+
+    for count in range(max(by_count, by_bytes), total + 1):
+        bounds = _balanced_bounds(weights, count)
+        if all(end - start <= max_recipients and prefix[end] - prefix[start] <= budget
+               for start, end in bounds):
+            return bounds
+
+    # One recipient per job always fits, given the checks above
+    return [(i, i + 1) for i in range(total)]
+
+
+def _balanced_bounds(weights: Sequence[int], count: int) -> List[Tuple[int, int]]:
+    """Cut a cumulative weight sequence into count ranges of near-equal weight"""
+    total = len(weights) - 1
+    cuts = [0]
+    for k in range(1, count):
+        target = weights[-1] * k / count
+        cut = bisect_left(weights, target, lo=cuts[-1] + 1)
+        cuts.append(min(max(cut, cuts[-1] + 1), total - (count - k)))
+    cuts.append(total)
+    return list(zip(cuts, cuts[1:]))
+
+
+def write_job_payloads(directory: Path, body_items: BodyItems, plan: Sequence[Tuple[int, int]],
+                       prefix: str = "job") -> List[Dict[str, Any]]:
+    """Stream one payload file per planned range, sharing every non-recipient section
+
+    Recipients are read once, in order, straight into the job files.
+    """
+    directory = Path(directory)
+    items = list(body_items)
+    recipients = iter(dict(items).get(RECIPIENTS_KEY, ()))
+    width = max(4, len(str(len(plan))))
+    jobs = []
+
+    for number, (start, end) in enumerate(plan, 1):
+        job_items = [
+            (key, islice(recipients, end - start) if key == RECIPIENTS_KEY else value)
+            for key, value in items
+        ]
+        name = f"{prefix}_{number:0{width}d}.json"
+        with atomic_writer(directory / name, binary=True) as f:
+            stats = write_payload(f, job_items)
+        jobs.append({"file": name, "first_recipient": start, "recipients": stats["streamed_items"],
+                     "bytes": stats["bytes"]})
+
+    return jobs
+
+
+def split_jobs(directory: Path, endpoint: str, body_items: Callable[[], BodyItems],
+               max_recipients: int = DEFAULT_MAX_RECIPIENTS,
+               max_bytes: int = DEFAULT_MAX_BYTES) -> Dict[str, Any]:
+    """Plan and write job payloads plus a manifest into directory
+
+    body_items is called twice - once to measure, once to write - and must
+    return a fresh iterable each time. Returns the manifest.
+    """
+    if endpoint not in SPLITTABLE_ENDPOINTS:
+        raise ValueError(f"Recipients cannot be split for {endpoint}")
+
+    base_bytes, sizes = measure_body(body_items())
+    plan = plan_chunks(sizes, max_recipients, max_bytes, base_bytes)
+    jobs = write_job_payloads(directory, body_items(), plan)
+
+    manifest = {
+        "endpoint": endpoint,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "max_recipients": max_recipients,
+        "max_bytes": max_bytes,
+        "total_recipients": len(sizes),
+        "jobs": jobs
+    }
+    atomic_write(Path(directory) / MANIFEST_FILE, json.dumps(manifest, indent=2))
+    return manifest
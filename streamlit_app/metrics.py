@@ -0,0 +1,275 @@
+"""
+Metrics
+Per-thread sharded counters and fixed-bucket histograms with Prometheus text exposition
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from streamlit_app.session_workspace import atomic_write
+
+# Upper bounds in seconds, from sub-millisecond template renders to multi-second API calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# File name the node-exporter textfile collector picks up (it reads *.prom)
+TEXTFILE_NAME = "click2endpoint.prom"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+class _Shards:
+    """One value map per writing thread
+
+    A thread only ever updates its own map, so increments take no lock and
+    never contend; the lock guards shard registration (once per thread) and
+    collection. Maps of finished threads are folded into a retired map, so
+    short-lived Streamlit script threads do not pile up.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: List[Tuple[threading.Thread, Dict[LabelValues, Any]]] = []
+        self._retired: Dict[LabelValues, Any] = {}
+
+    def mine(self) -> Dict[LabelValues, Any]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._live.append((threading.current_thread(), values))
+            return values
+
+    def collect(self, merge: Callable[[Any, Any], Any]) -> Dict[LabelValues, Any]:
+        """All shards combined with merge(total, shard_value)"""
+        with self._lock:
+            alive = []
+            for thread, values in self._live:
+                if thread.is_alive():
+                    alive.append((thread, values))
+                else:
+                    _fold(self._retired, values, merge)
+            self._live = alive
+            totals: Dict[LabelValues, Any] = {}
+            _fold(totals, self._retired, merge)
+            for _thread, values in alive:
+                # dict.copy() is one C call, so a concurrent insert cannot break the iteration
+                _fold(totals, values.copy(), merge)
+        return totals
+
+
+def _fold(totals: Dict[LabelValues, Any], values: Dict[LabelValues, Any], merge: Callable[[Any, Any], Any]):
+    for labels, value in values.items():
+        totals[labels] = merge(totals[labels], value) if labels in totals else merge(None, value)
+
+
+def _label_text(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._shards = _Shards()
+
+    def inc(self, amount: float = 1, **labels: str):
+        values = self._shards.mine()
+        key = tuple(str(labels[name]) for name in self.labels)
+        values[key] = values.get(key, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        """Current totals per label set"""
+        return self._shards.collect(lambda total, value: value if total is None else total + value)
+
+    def expose(self) -> Iterator[str]:
+        for key, value in sorted(self.values().items()):
+            yield f"{self.name}{_label_text(self.labels, key)} {_number(value)}"
+
+
+class Histogram:
+    """Observation counts in fixed cumulative buckets, plus their sum and count"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _Shards()
+
+    def observe(self, value: float, **labels: str):
+        values = self._shards.mine()
+        key = tuple(str(labels[name]) for name in self.labels)
+        # Per bucket counts (the last one is +Inf), then the sum
+        state = values.get(key)
+        if state is None:
+            state = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block, whether or not it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def values(self) -> Dict[LabelValues, List[float]]:
+        """Per label set: non-cumulative bucket counts followed by the sum"""
+        return self._shards.collect(
+            lambda total, value: list(value) if total is None else [a + b for a, b in zip(total, value)])
+
+    def expose(self) -> Iterator[str]:
+        for key, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                bucket = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_label_text(self.labels, key, bucket)} {cumulative}"
+            yield f"{self.name}_sum{_label_text(self.labels, key)} {_number(state[-1])}"
+            yield f"{self.name}_count{_label_text(self.labels, key)} {cumulative}"
+
+
+class CallbackCounter:
+    """Counter read from elsewhere at exposition time, e.g. a cache's own hit statistics"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str],
+                 read: Callable[[], Dict[LabelValues, float]]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.read = read
+
+    def expose(self) -> Iterator[str]:
+        for key, value in sorted(self.read().items()):
+            yield f"{self.name}{_label_text(self.labels, key)} {_number(value)}"
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def register(self, metric):
+        """Add a metric; registering the same name again returns the existing one"""
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Exposition text for every metric"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, directory: Path, file_name: str = TEXTFILE_NAME) -> Path:
+        """Atomically write the exposition for the node-exporter textfile collector"""
+        return atomic_write(Path(directory) / file_name, self.render())
+
+    def serve(self, host: str = "0.0.0.0", port: int = 9464) -> ThreadingHTTPServer:
+        """Serve /metrics from a daemon thread of this process"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                data = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any):
+                """Scrapes are not worth a log line each"""
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+
+class TextfileExporter:
+    """Writes the registry to a textfile collector directory at most once per interval"""
+
+    def __init__(self, registry: MetricsRegistry, directory: Path, interval_seconds: float = 15.0):
+        self.registry = registry
+        self.directory = Path(directory)
+        self.interval_seconds = interval_seconds
+        self._next_write = 0.0
+
+    def maybe_write(self) -> bool:
+        """Write if the interval has passed since the last write; returns True when written"""
+        now = time.monotonic()
+        if now < self._next_write:
+            return False
+        self._next_write = now + self.interval_seconds
+        self.registry.write_textfile(self.directory)
+        return True
+
+
+# Shared by everything in the process
+METRICS = MetricsRegistry()
+
+RECOMMENDATIONS = METRICS.counter(
+    "c2m_recommendations_total", "Endpoint recommendations made", ["endpoint", "source"])
+WIZARD_STEP_SECONDS = METRICS.histogram(
+    "c2m_wizard_step_seconds", "Time to run the app script once, by wizard step", ["step"])
+POSTMAN_REQUEST_SECONDS = METRICS.histogram(
+    "c2m_postman_request_seconds", "Postman API call latency", ["resource"])
+POSTMAN_ERRORS = METRICS.counter(
+    "c2m_postman_errors_total", "Postman API calls that failed", ["resource"])
+CODE_EXECUTIONS = METRICS.counter(
+    "c2m_code_executions_total", "Generated scripts run from the app", ["result"])
+CODE_EXECUTION_SECONDS = METRICS.histogram(
+    "c2m_code_execution_seconds", "Generated script run time", buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+SESSION_LOG_WRITE_SECONDS = METRICS.histogram(
+    "c2m_session_log_write_seconds", "Time to append one recommendation session to the logs")
+TRAINING_EXAMPLES = METRICS.counter(
+    "c2m_training_examples_total", "Training examples written", ["format"])
+TRAINING_BUILD_SECONDS = METRICS.histogram(
+    "c2m_training_build_seconds", "Time to build one training data file", ["format"])
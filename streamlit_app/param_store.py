@@ -0,0 +1,314 @@
+"""
+Parameter Store
+Typed, slot-based storage for Level 2 parameters with per-section dirty tracking
+"""
+
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from streamlit_app.address_store import AddressStore
+
+# Streamlit widget keys for Level 2 parameters all carry this prefix
+WIDGET_PREFIX = "param_"
+
+# Which request body section each parameter feeds
+FIELD_SECTIONS = {
+    "doc_id": "document",
+    "doc_url": "document",
+    "upload_id": "document",
+    "zip_id": "document",
+    "doc_name": "document",
+    "template_id": "template",
+    "template_name": "template",
+    "payment": "payment",
+    "cardnum": "payment",
+    "cardtype": "payment",
+    "exp": "payment",
+    "cvv": "payment",
+    "invoice_num": "payment",
+    "routing": "payment",
+    "account": "payment",
+    "credit_amount": "payment",
+    "tags": "tags",
+    "docclass": "options",
+    "layout": "options",
+    "mailclass": "options",
+    "paper": "options",
+    "print": "options",
+    "envelope": "options",
+}
+
+# Parameters each document specification method uses
+DOC_SPEC_FIELDS = {
+    "Document ID": ["doc_id"],
+    "External URL": ["doc_url"],
+    "Upload Request + Name": ["upload_id", "doc_name"],
+    "Zip + Document Name": ["zip_id", "doc_name"],
+    "Upload Request + Zip + Name": ["upload_id", "zip_id", "doc_name"]
+}
+
+# Payment method choices; the wallet types carry no details of their own
+PAYMENT_TYPES = ["CREDIT_CARD", "INVOICE", "ACH", "USER_CREDIT", "APPLE_PAY", "GOOGLE_PAY"]
+
+# Sections in the order they appear in the request body
+BODY_SECTIONS = ("document", "recipients", "template", "options", "payment", "tags")
+
+# jobOptions keys in the API spec, per options parameter
+JOB_OPTION_KEYS = {
+    "docclass": "documentClass",
+    "layout": "layout",
+    "mailclass": "mailclass",
+    "paper": "paperType",
+    "print": "printOption",
+    "envelope": "envelope",
+}
+
+FIELD_DEFAULTS = {field: "" for field in FIELD_SECTIONS}
+FIELD_DEFAULTS["credit_amount"] = 0.0
+
+# Recipients kept in the cached body; longer lists are streamed from the address store
+RECIPIENT_PREVIEW_LIMIT = 20
+
+
+class ParameterStore:
+    """Level 2 parameters that widgets write into directly
+
+    Every write compares against the stored value and marks the owning
+    section dirty only on a real change. build_body() then rebuilds just the
+    dirty sections and reuses the cached fragments for the rest, so the cost
+    of a rerun does not grow with the number of parameters on the page.
+    """
+
+    __slots__ = tuple(FIELD_SECTIONS) + ("_dirty", "_fragments", "_recipient_count", "revision")
+
+    doc_id: str
+    doc_url: str
+    upload_id: str
+    zip_id: str
+    doc_name: str
+    template_id: str
+    template_name: str
+    payment: str
+    cardnum: str
+    cardtype: str
+    exp: str
+    cvv: str
+    invoice_num: str
+    routing: str
+    account: str
+    credit_amount: float
+    tags: str
+    docclass: str
+    layout: str
+    mailclass: str
+    paper: str
+    print: str
+    envelope: str
+
+    def __init__(self):
+        for field, default in FIELD_DEFAULTS.items():
+            setattr(self, field, default)
+        self._dirty = set(BODY_SECTIONS)
+        self._fragments: Dict[str, Dict[str, Any]] = {}
+        self._recipient_count = 0
+        # Bumped on every change, so derived artifacts (payload files) know when to refresh
+        self.revision = 0
+
+    def set(self, field: str, value: Any) -> bool:
+        """Store a parameter value, returning True if it changed"""
+        section = FIELD_SECTIONS.get(field)
+        if section is None:
+            raise KeyError(f"Unknown parameter: {field}")
+
+        if value is None:
+            value = FIELD_DEFAULTS[field]
+        if getattr(self, field) == value:
+            return False
+
+        setattr(self, field, value)
+        self.mark_dirty(section)
+        return True
+
+    def set_widget(self, key: str, value: Any) -> bool:
+        """Store a value coming from a param_* Streamlit widget"""
+        return self.set(key[len(WIDGET_PREFIX):], value)
+
+    def get(self, field: str) -> Any:
+        """Read a parameter value"""
+        if field not in FIELD_SECTIONS:
+            raise KeyError(f"Unknown parameter: {field}")
+        return getattr(self, field)
+
+    def retain(self, section: str, keep: Iterable[str]):
+        """Reset every field of a section except those in keep
+
+        Used when a choice hides some inputs, so stale values from the hidden
+        inputs cannot leak into the request body.
+        """
+        keep = set(keep)
+        for field, field_section in FIELD_SECTIONS.items():
+            if field_section == section and field not in keep:
+                self.set(field, FIELD_DEFAULTS[field])
+
+    def mark_dirty(self, section: str):
+        """Force a section to be rebuilt on the next build_body()"""
+        self._dirty.add(section)
+        self.revision += 1
+
+    def is_dirty(self, section: str) -> bool:
+        """Check whether a section will be rebuilt on the next build_body()"""
+        return section in self._dirty
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Non-default parameters keyed by widget key"""
+        return {
+            f"{WIDGET_PREFIX}{field}": getattr(self, field)
+            for field, default in FIELD_DEFAULTS.items()
+            if getattr(self, field) != default
+        }
+
+    def build_body(self, addresses: Optional[AddressStore] = None) -> Dict[str, Any]:
+        """Assemble the full request body, rebuilding only dirty sections
+
+        The returned dict is new on every call, but nested values are shared
+        with the section cache and must be treated as read-only.
+        """
+        return dict(
+            (key, list(value) if isinstance(value, Iterator) else value)
+            for key, value in self.iter_body(addresses)
+        )
+
+    def preview_body(self, addresses: Optional[AddressStore] = None) -> Tuple[Dict[str, Any], int]:
+        """Request body cut to the first RECIPIENT_PREVIEW_LIMIT recipients, plus the full recipient count"""
+        self._refresh(addresses)
+        body: Dict[str, Any] = {}
+        for section in BODY_SECTIONS:
+            body.update(self._fragments[section])
+        return body, self._recipient_count
+
+    def iter_body(self, addresses: Optional[AddressStore] = None) -> Iterator[Tuple[str, Any]]:
+        """Yield top-level body items in order without materializing a long recipient list
+
+        Recipients beyond the preview limit come back as an iterator over
+        the address store, for consumers that stream the body to disk.
+        """
+        self._refresh(addresses)
+        for section in BODY_SECTIONS:
+            if section == "recipients" and self._recipient_count > RECIPIENT_PREVIEW_LIMIT:
+                yield "recipientAddressSources", addresses.iter_recipient_sources()
+            else:
+                yield from self._fragments[section].items()
+
+    def _refresh(self, addresses: Optional[AddressStore]):
+        """Rebuild the cached fragment of every dirty section"""
+        for section in BODY_SECTIONS:
+            if section in self._dirty:
+                if section == "recipients":
+                    preview, self._recipient_count = _summarize_recipients(addresses)
+                    self._fragments[section] = {"recipientAddressSources": preview} if preview else {}
+                else:
+                    self._fragments[section] = _SECTION_BUILDERS[section](self)
+        self._dirty.clear()
+
+
+def _build_document(store: ParameterStore) -> Dict[str, Any]:
+    """documentSourceIdentifier is a single value OR object"""
+    if store.doc_id:
+        return {"documentSourceIdentifier": store.doc_id}
+    if store.doc_url:
+        return {"documentSourceIdentifier": store.doc_url}
+    if store.upload_id and store.doc_name:
+        if store.zip_id:
+            # Upload + Zip + Name
+            return {"documentSourceIdentifier": {
+                "uploadRequestId": store.upload_id,
+                "zipId": store.zip_id,
+                "documentName": store.doc_name
+            }}
+        # Upload + Name
+        return {"documentSourceIdentifier": {
+            "uploadRequestId": store.upload_id,
+            "documentName": store.doc_name
+        }}
+    if store.zip_id and store.doc_name:
+        # Zip + Name
+        return {"documentSourceIdentifier": {
+            "zipId": store.zip_id,
+            "documentName": store.doc_name
+        }}
+    return {}
+
+
+def _summarize_recipients(addresses: Optional[AddressStore]) -> Tuple[List[Dict[str, Any]], int]:
+    """First RECIPIENT_PREVIEW_LIMIT recipientAddressSources items and the total count"""
+    if addresses is None:
+        return [], 0
+    sources = addresses.iter_recipient_sources()
+    preview = list(islice(sources, RECIPIENT_PREVIEW_LIMIT))
+    return preview, len(preview) + sum(1 for _ in sources)
+
+
+def _build_template(store: ParameterStore) -> Dict[str, Any]:
+    """jobTemplate - prefer ID over name"""
+    if store.template_id:
+        return {"jobTemplate": store.template_id}
+    if store.template_name:
+        return {"jobTemplate": store.template_name}
+    return {}
+
+
+def _build_options(store: ParameterStore) -> Dict[str, Any]:
+    """jobOptions from the print and mail choices that were made"""
+    job_options = {key: getattr(store, field) for field, key in JOB_OPTION_KEYS.items() if getattr(store, field)}
+    if not job_options:
+        return {}
+    return {"jobOptions": job_options}
+
+
+def _build_payment(store: ParameterStore) -> Dict[str, Any]:
+    """paymentDetails with the sub-object matching the payment type"""
+    if not store.payment:
+        return {}
+
+    payment_details: Dict[str, Any] = {"type": store.payment}
+
+    if store.payment == "CREDIT_CARD":
+        if store.cardnum:
+            payment_details["creditCardDetails"] = {
+                "cardNumber": store.cardnum,
+                "cardType": store.cardtype,
+                "expirationDate": store.exp,
+                "cvv": store.cvv
+            }
+    elif store.payment == "INVOICE":
+        if store.invoice_num:
+            payment_details["invoiceDetails"] = {
+                "invoiceNumber": store.invoice_num
+            }
+    elif store.payment == "ACH":
+        if store.routing:
+            payment_details["achDetails"] = {
+                "routingNumber": store.routing,
+                "accountNumber": store.account
+            }
+    elif store.payment == "USER_CREDIT":
+        if store.credit_amount:
+            payment_details["creditAmount"] = store.credit_amount
+
+    return {"paymentDetails": payment_details}
+
+
+def _build_tags(store: ParameterStore) -> Dict[str, Any]:
+    """tags from the comma-separated input"""
+    if not store.tags:
+        return {}
+    return {"tags": [t.strip() for t in store.tags.split(",")]}
+
+
+_SECTION_BUILDERS: Dict[str, Callable[[ParameterStore], Dict[str, Any]]] = {
+    "document": _build_document,
+    "template": _build_template,
+    "options": _build_options,
+    "payment": _build_payment,
+    "tags": _build_tags,
+}
@@ -0,0 +1,78 @@
+"""
+Payload Writer
+Incremental JSON encoding of request bodies straight to a payload file
+"""
+
+import json
+from collections.abc import Iterator as IteratorABC
+from typing import IO, Any, Dict, Iterable, Iterator, Tuple
+
+# Bytes buffered before each write to the payload file
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def iter_json(items: Iterable[Tuple[str, Any]], indent: int = 2) -> Iterator[str]:
+    """Encode top-level body items as a JSON object, one piece at a time
+
+    Values that are iterators (e.g. a long recipient list) are written as
+    arrays with one compact element per line, so the full list never has to
+    exist in memory. Other values are encoded with json.dumps as usual.
+    """
+    pad = " " * indent
+    first = True
+    yield "{"
+
+    for key, value in items:
+        yield ("\n" if first else ",\n") + pad + json.dumps(key) + ": "
+        first = False
+
+        if isinstance(value, IteratorABC):
+            yield "["
+            first_item = True
+            for item in value:
+                yield ("\n" if first_item else ",\n") + pad * 2 + json.dumps(item)
+                first_item = False
+            yield "]" if first_item else "\n" + pad + "]"
+        else:
+            yield json.dumps(value, indent=indent).replace("\n", "\n" + pad)
+
+    yield "}" if first else "\n}"
+
+
+def write_payload(f: IO[bytes], items: Iterable[Tuple[str, Any]], indent: int = 2) -> Dict[str, int]:
+    """Stream a request body into a binary file object as UTF-8 JSON
+
+    Returns the number of bytes written and the number of elements streamed
+    from iterator values (the recipient count for a streamed recipient list).
+    """
+    counter = _ItemCounter()
+    items = ((key, counter.wrap(value) if isinstance(value, IteratorABC) else value) for key, value in items)
+
+    written = 0
+    buffer = []
+    buffered = 0
+    for piece in iter_json(items, indent=indent):
+        data = piece.encode("utf-8")
+        buffer.append(data)
+        buffered += len(data)
+        if buffered >= WRITE_BUFFER_SIZE:
+            f.write(b"".join(buffer))
+            written += buffered
+            buffer = []
+            buffered = 0
+    f.write(b"".join(buffer))
+    written += buffered
+
+    return {"bytes": written, "streamed_items": counter.count}
+
+
+class _ItemCounter:
+    """Counts elements as they pass through wrapped iterators"""
+
+    def __init__(self):
+        self.count = 0
+
+    def wrap(self, values: Iterable[Any]) -> Iterator[Any]:
+        for value in values:
+            self.count += 1
+            yield value
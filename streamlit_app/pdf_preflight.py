@@ -0,0 +1,284 @@
+"""
+PDF Preflight
+Page counts and proposed split ranges for local PDFs, read through mmap without loading the file
+"""
+
+import mmap
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Endpoints that split one combined PDF into page ranges per recipient
+SPLIT_ENDPOINTS = ("/jobs/single-pdf-split", "/jobs/single-pdf-split-addressCapture")
+
+# startxref sits at the very end; allow for trailing junk some producers append
+_TAIL_SIZE = 4096
+# Upper bound on how far a trailer dictionary is searched
+_TRAILER_WINDOW = 1 << 16
+
+_HEADER = re.compile(rb"%PDF-(\d\.\d)")
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)\s*")
+_TRAILER = re.compile(rb"\s*trailer")
+_OBJECT = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+
+
+def _ref(name: bytes, data: bytes) -> Optional[int]:
+    """Object number of an indirect reference /Name n g R"""
+    match = re.search(rb"/" + name + rb"\s+(\d+)\s+\d+\s+R", data)
+    return int(match.group(1)) if match else None
+
+
+def _int(name: bytes, data: bytes) -> Optional[int]:
+    """Direct integer value of /Name"""
+    match = re.search(rb"/" + name + rb"\s+(\d+)\b(?!\s+\d+\s+R)", data)
+    return int(match.group(1)) if match else None
+
+
+def _ints(name: bytes, data: bytes) -> Optional[List[int]]:
+    """Integer array value of /Name [a b c]"""
+    match = re.search(rb"/" + name + rb"\s*\[([\d\s]*)\]", data)
+    return [int(v) for v in match.group(1).split()] if match else None
+
+
+class _XrefIndex:
+    """Cross-reference sections, newest first, resolved lazily per object
+
+    Classic tables are not parsed up front: entries are fixed 20-byte
+    records, so an object's offset is read straight from its position.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        self.mapped = mapped
+        # Classic: ("table", first, count, entries position); stream: ("stream", first, count, rows, widths)
+        self.sections: List[Tuple] = []
+        self.trailer = b""
+
+    def load(self, offset: int):
+        """Read the section at offset and every older section it chains to"""
+        seen = set()
+        pending = [offset]
+        while pending:
+            offset = pending.pop(0)
+            if offset in seen or offset >= len(self.mapped):
+                continue
+            seen.add(offset)
+
+            if self.mapped[offset:offset + 4] == b"xref":
+                trailer = self._load_table(offset + 4)
+                hybrid = _int(b"XRefStm", trailer)
+                # Hybrid files: the xref stream ranks right after the table that points to it
+                pending[:0] = [o for o in (hybrid, _int(b"Prev", trailer)) if o is not None]
+            else:
+                trailer = self._load_stream(offset)
+                prev = _int(b"Prev", trailer)
+                if prev is not None:
+                    pending.insert(0, prev)
+
+            if not self.trailer:
+                self.trailer = trailer
+
+    def _load_table(self, position: int) -> bytes:
+        """Record classic subsections and return the trailer dictionary"""
+        while True:
+            trailer = _TRAILER.match(self.mapped, position)
+            if trailer:
+                start = trailer.end()
+                end = self.mapped.find(b"startxref", start, start + _TRAILER_WINDOW)
+                return self.mapped[start:end if end != -1 else start + _TRAILER_WINDOW]
+
+            match = _SUBSECTION.match(self.mapped, position)
+            if not match:
+                raise ValueError("Malformed cross-reference table")
+            first, count = int(match.group(1)), int(match.group(2))
+            self.sections.append(("table", first, count, match.end()))
+            position = match.end() + 20 * count
+
+    def _load_stream(self, offset: int) -> bytes:
+        """Decode an xref stream (PDF 1.5+) and return its dictionary"""
+        dictionary, data = self._stream(offset)
+        if b"/XRef" not in dictionary:
+            raise ValueError("startxref does not point to a cross-reference section")
+
+        widths = _ints(b"W", dictionary)
+        index = _ints(b"Index", dictionary) or [0, _int(b"Size", dictionary) or 0]
+        row = sum(widths)
+        rows = memoryview(data)
+        base = 0
+        for first, count in zip(index[0::2], index[1::2]):
+            self.sections.append(("stream", first, count, rows[base * row:(base + count) * row], widths))
+            base += count
+        return dictionary
+
+    def _stream(self, offset: int) -> Tuple[bytes, bytes]:
+        """Dictionary and decoded data of the stream object at offset"""
+        header = _OBJECT.match(self.mapped, offset)
+        if not header:
+            raise ValueError(f"No object at offset {offset}")
+        start = self.mapped.find(b"stream", header.end())
+        dictionary = self.mapped[header.end():start]
+        start += len(b"stream")
+        start += 2 if self.mapped[start:start + 2] == b"\r\n" else 1
+
+        length = _int(b"Length", dictionary)
+        if length is None:
+            end = self.mapped.find(b"endstream", start)
+            raw = self.mapped[start:end]
+        else:
+            raw = self.mapped[start:start + length]
+
+        if b"/FlateDecode" in dictionary:
+            raw = zlib.decompressobj().decompress(raw)
+        elif b"/Filter" in dictionary:
+            raise ValueError("Unsupported stream filter")
+
+        predictor = _int(b"Predictor", dictionary) or 1
+        if predictor >= 10:
+            raw = _png_unpredict(raw, _int(b"Columns", dictionary) or 1)
+        return dictionary, raw
+
+    def lookup(self, number: int) -> Optional[Tuple[int, int, int]]:
+        """(type, field 2, field 3) for an object: 1 = offset, 2 = in object stream"""
+        for section in self.sections:
+            kind, first, count = section[:3]
+            if not first <= number < first + count:
+                continue
+            if kind == "table":
+                position = section[3] + 20 * (number - first)
+                entry = self.mapped[position:position + 18]
+                if entry[17:18] != b"n":
+                    return None
+                return 1, int(entry[:10]), int(entry[11:16])
+
+            rows, widths = section[3], section[4]
+            row = rows[(number - first) * sum(widths):(number - first + 1) * sum(widths)]
+            fields, position = [], 0
+            for width in widths:
+                fields.append(int.from_bytes(row[position:position + width], "big"))
+                position += width
+            kind = fields[0] if widths[0] else 1
+            return (kind, fields[1], fields[2]) if kind in (1, 2) else None
+        return None
+
+    def object(self, number: int) -> bytes:
+        """Body of an object, from the file or from inside its object stream"""
+        entry = self.lookup(number)
+        if entry is None:
+            raise ValueError(f"Object {number} is not in the cross-reference table")
+
+        kind, field2, field3 = entry
+        if kind == 1:
+            header = _OBJECT.match(self.mapped, field2)
+            if not header or int(header.group(1)) != number:
+                raise ValueError(f"Object {number} is not at its recorded offset")
+            end = self.mapped.find(b"endobj", header.end())
+            return self.mapped[header.end():end]
+
+        dictionary, data = self._stream(self.lookup(field2)[1])
+        count, first = _int(b"N", dictionary), _int(b"First", dictionary)
+        pairs = [int(v) for v in data[:first].split()[:2 * count]]
+        offsets = dict(zip(pairs[0::2], pairs[1::2]))
+        if number not in offsets:
+            raise ValueError(f"Object {number} is missing from object stream {field2}")
+        following = [o for o in offsets.values() if o > offsets[number]]
+        return data[first + offsets[number]:first + min(following) if following else len(data)]
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """Undo PNG row prediction, as used by xref and object streams"""
+    row_size = columns + 1
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data) - row_size + 1, row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        if kind == 2:
+            row = bytearray((a + b) & 0xFF for a, b in zip(row, previous))
+        elif kind == 1:
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind not in (0, 2):
+            raise ValueError(f"Unsupported PNG predictor {kind}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+def count_pages(mapped: mmap.mmap) -> Tuple[int, str]:
+    """Page count and how it was found: "xref" (page tree /Count) or "scan"
+
+    The catalog and page tree root are reached through the cross-reference
+    sections, so only a few kilobytes of the file are touched. Damaged
+    files fall back to counting /Type /Page objects across the mapping.
+    """
+    tail = mapped[max(0, len(mapped) - _TAIL_SIZE):]
+    matches = list(_STARTXREF.finditer(tail))
+    if matches:
+        try:
+            xref = _XrefIndex(mapped)
+            xref.load(int(matches[-1].group(1)))
+            catalog = xref.object(_ref(b"Root", xref.trailer))
+            pages = xref.object(_ref(b"Pages", catalog))
+            count = _int(b"Count", pages)
+            if count is not None:
+                return count, "xref"
+        except (ValueError, TypeError, IndexError, zlib.error):
+            pass
+
+    count = sum(1 for _ in _PAGE_OBJECT.finditer(mapped))
+    if count == 0:
+        raise ValueError("Could not find any pages; the PDF may be damaged or compressed beyond a scan")
+    return count, "scan"
+
+
+def split_ranges(pages: int, recipients: Optional[int] = None,
+                 pages_per_recipient: Optional[int] = None) -> List[Dict[str, int]]:
+    """Consecutive 1-based inclusive page ranges, one per recipient
+
+    Give either the number of recipients (pages must divide evenly) or a
+    fixed document length (the last range may be short).
+    """
+    if pages_per_recipient:
+        size = pages_per_recipient
+    elif recipients:
+        if pages % recipients:
+            raise ValueError(f"{pages} pages do not divide evenly among {recipients} recipients")
+        size = pages // recipients
+    else:
+        raise ValueError("Give the number of recipients or pages per recipient")
+
+    return [{"startPage": start, "endPage": min(pages, start + size - 1)} for start in range(1, pages + 1, size)]
+
+
+def preflight(path: Path, recipients: Optional[int] = None,
+              pages_per_recipient: Optional[int] = None) -> Dict[str, Any]:
+    """Check a local PDF before a split submission
+
+    Returns the page count, how it was determined, the PDF version and, if
+    recipients or pages_per_recipient is given, the proposed page ranges.
+    """
+    path = Path(path)
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        if f.read(1024).find(b"%PDF-") == -1:
+            raise ValueError(f"{path.name} is not a PDF")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            header = _HEADER.search(mapped[:1024])
+            pages, method = count_pages(mapped)
+            size = len(mapped)
+
+    report = {
+        "file": path.name,
+        "bytes": size,
+        "version": header.group(1).decode("ascii") if header else None,
+        "pages": pages,
+        "method": method,
+        "ranges": [],
+    }
+    if recipients or pages_per_recipient:
+        report["ranges"] = split_ranges(pages, recipients, pages_per_recipient)
+    report["seconds"] = time.perf_counter() - started
+    return report
@@ -0,0 +1,137 @@
+"""
+Profiling
+Shared --profile mode for command-line tools: cProfile, stack samples, imports, memory
+"""
+
+import argparse
+import cProfile
+import io
+import pstats
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from streamlit_app.rerun_watchdog import RerunWatchdog
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_PROFILE_DIR = Path("logs") / "profiles"
+
+# Rows shown per section of the report
+TOP = 15
+
+_SCRIPT_START = "-- script imports --\n"
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def add_profile_argument(parser: argparse.ArgumentParser):
+    """Add --profile [DIR] to a command's parser"""
+    parser.add_argument("--profile", nargs="?", type=Path, const=DEFAULT_PROFILE_DIR, default=None, metavar="DIR",
+                        help=f"Profile this run and write the results to DIR (default {DEFAULT_PROFILE_DIR})")
+
+
+def import_times(script: Path) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) of each top-level import of a script, slowest first
+
+    The script is imported in a fresh interpreter under -X importtime, so
+    every import is cold, whatever this process has loaded already.
+    Interpreter startup is left out, and the script's main() does not run,
+    since __name__ is not "__main__" there.
+    """
+    code = ("import importlib.util, sys; "
+            f"spec = importlib.util.spec_from_file_location('profiled_script', {str(script)!r}); "
+            f"sys.stderr.write({_SCRIPT_START!r}); "
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=str(Path(script).parent))
+    rows = []
+    # Interpreter startup imports (site, encodings, ...) come before the marker
+    for line in result.stderr.partition(_SCRIPT_START)[2].splitlines():
+        match = _IMPORT_TIME.match(line)
+        # Only the outermost imports; their cumulative time covers what they import
+        if match and not match.group(3):
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None where the resource module is missing"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def profiling(out_dir: Optional[Path], script: str, interval_seconds: float = 0.005) -> Iterator[None]:
+    """Profile the block when out_dir is set (the --profile value); otherwise do nothing
+
+    Writes <name>.pstats (cProfile, for snakeviz or pstats), <name>.folded
+    (sampled stacks, for flamegraph.pl or speedscope) and <name>.txt, and
+    prints the report to stderr so the command's own output stays clean.
+    The block still reports when it ends in sys.exit().
+    """
+    if out_dir is None:
+        yield
+        return
+
+    name = Path(script).stem
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sampler = RerunWatchdog(threshold_seconds=0, interval_seconds=interval_seconds, output_file=None).start()
+    token = sampler.watch(name)
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        samples = sampler.finish(token) or {}
+        sampler.stop()
+
+        profiler.dump_stats(str(out_dir / f"{name}.pstats"))
+        with open(out_dir / f"{name}.folded", "w", encoding="utf-8") as f:
+            f.writelines(f"{name};{stack} {count}\n" for stack, count in samples.items())
+
+        report = _report(name, elapsed, profiler, snapshot, traced_peak, import_times(Path(script)), out_dir)
+        (out_dir / f"{name}.txt").write_text(report, encoding="utf-8")
+        print(report, file=sys.stderr)
+
+
+def _report(name: str, elapsed: float, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot,
+            traced_peak: int, imports: List[Tuple[str, int, int]], out_dir: Path) -> str:
+    lines = [f"📈 Profile of {name}: {elapsed:.3f}s"]
+    rss = peak_rss_mb()
+    lines.append(f"Peak RSS: {rss:.1f} MB" if rss is not None else "Peak RSS: unavailable on this platform")
+    lines.append(f"Peak traced Python memory: {traced_peak / (1024 * 1024):.1f} MB")
+
+    lines.append(f"\nImports (cold, cumulative): {sum(row[2] for row in imports) / 1000:.1f} ms")
+    lines.extend(f"  {cumulative / 1000:8.1f} ms  {module}" for module, _self, cumulative in imports[:TOP])
+
+    lines.append("\nTop allocations:")
+    for stat in snapshot.statistics("lineno")[:TOP]:
+        frame = stat.traceback[0]
+        lines.append(f"  {stat.size / 1024:8.1f} KiB  {stat.count:7} blocks  {frame.filename}:{frame.lineno}")
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(TOP)
+    lines.append("\nTop functions (cumulative):")
+    lines.append(stream.getvalue().strip())
+
+    lines.append(f"\nWritten to {out_dir}: {name}.pstats, {name}.folded, {name}.txt")
+    return "\n".join(lines) + "\n"
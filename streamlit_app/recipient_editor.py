@@ -0,0 +1,47 @@
+"""
+Recipient Editor
+Paging and bulk-edit helpers for the table-style recipient address editor
+"""
+
+from typing import Any, Dict, Tuple
+
+from streamlit_app.address_store import RECIPIENT_COLUMNS, AddressStore
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def page_count(total: int, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """Number of pages needed for total rows (an empty list still has one page)"""
+    return max(1, -(-total // page_size))
+
+
+def page_bounds(page: int, total: int, page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[int, int]:
+    """Slice bounds [start, end) of a 1-based page, clamped to the last page"""
+    page = min(max(1, page), page_count(total, page_size))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+
+def apply_editor_delta(store: AddressStore, start: int, end: int, delta: Dict[str, Any]):
+    """Apply a st.data_editor edit delta for the page store[start:end] in place
+
+    The delta holds positional "edited_rows", "deleted_rows" and
+    "added_rows" relative to the page, so the cost is proportional to the
+    number of changes rather than the size of the store.
+    """
+    for position, changes in delta.get("edited_rows", {}).items():
+        index = start + int(position)
+        if start <= index < end:
+            store.update(index, changes)
+
+    deleted = {start + int(position) for position in delta.get("deleted_rows", [])
+               if 0 <= int(position) < end - start}
+    store.delete(deleted)
+    end -= len(deleted)
+
+    # Skip rows the user added but never filled in beyond column defaults
+    added = [
+        row for row in delta.get("added_rows", [])
+        if any(row.get(column) for column in RECIPIENT_COLUMNS if column not in ("type", "country"))
+    ]
+    store.insert(end, added)
@@ -0,0 +1,136 @@
+"""
+Recipient Import
+Chunked CSV / JSONL recipient import with vectorized validation
+"""
+
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from streamlit_app.address_store import COLUMN_DEFAULTS, RECIPIENT_COLUMNS, AddressStore
+from streamlit_app import address_validation
+from streamlit_app.address_dedup import Deduplicator
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Rejected rows listed individually in the import report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Common alternative header spellings, compared case-insensitively
+COLUMN_ALIASES = {
+    "first_name": "firstName",
+    "firstname": "firstName",
+    "last_name": "lastName",
+    "lastname": "lastName",
+    "address_1": "address1",
+    "address_line_1": "address1",
+    "address_2": "address2",
+    "address_line_2": "address2",
+    "zipcode": "zip",
+    "zip_code": "zip",
+    "postalcode": "zip",
+    "postal_code": "zip",
+}
+COLUMN_ALIASES.update({column.lower(): column for column in RECIPIENT_COLUMNS})
+
+# Rows missing these are rejected at import; the full address check runs on demand
+IMPORT_REQUIRED_FIELDS = ("firstName", "lastName")
+
+Source = Union[str, IO]
+
+
+def iter_chunks(source: Source, fmt: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream a CSV or JSONL source as DataFrames of at most chunksize rows"""
+    if fmt == "csv":
+        reader = pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False)
+    elif fmt in ("jsonl", "ndjson"):
+        reader = pd.read_json(source, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def normalize_columns(frame: pd.DataFrame, **options) -> pd.DataFrame:
+    """Map headers onto RECIPIENT_COLUMNS and canonicalize every cell as a string
+
+    Keyword options are passed on to address_validation.normalize_frame.
+    """
+    renames = {}
+    for column in frame.columns:
+        name = str(column).strip()
+        if name in RECIPIENT_COLUMNS:
+            renames[column] = name
+        elif name.lower() in COLUMN_ALIASES:
+            renames[column] = COLUMN_ALIASES[name.lower()]
+    frame = frame.rename(columns=renames)
+
+    normalized = pd.DataFrame(index=frame.index)
+    for column in RECIPIENT_COLUMNS:
+        if column in frame.columns:
+            values = frame[column]
+            if isinstance(values, pd.DataFrame):
+                # Two headers mapped to the same column - first one wins
+                values = values.iloc[:, 0]
+            normalized[column] = values.fillna("").astype(str)
+        else:
+            normalized[column] = ""
+
+    # Blank cells in defaulted columns take the default, as typed rows do
+    for column in ("type", "country"):
+        normalized.loc[normalized[column] == "", column] = COLUMN_DEFAULTS[column]
+    return address_validation.normalize_frame(normalized, **options)
+
+
+def validate_frame(frame: pd.DataFrame) -> np.ndarray:
+    """Rejection reason for each row of a normalized frame ("" when valid)
+
+    Import only rejects rows that cannot be sent as entered; missing address
+    lines and ZIP / state mismatches are left to the full address check.
+    """
+    return address_validation.validate_frame(frame, required=IMPORT_REQUIRED_FIELDS, check_zip_state=False)
+
+
+def import_recipients(source: Source, fmt: str, store: AddressStore,
+                      chunksize: int = DEFAULT_CHUNK_SIZE,
+                      deduplicator: Optional[Deduplicator] = None) -> Dict[str, Any]:
+    """Parse, validate and append recipients to store one chunk at a time
+
+    Memory stays bounded by the chunk size plus the store itself. With a
+    deduplicator, valid rows it has already seen are skipped as well.
+    Returns a report with row counts and the first MAX_REPORTED_ERRORS
+    rejections as (1-based data row, reason) pairs.
+    """
+    rows = 0
+    imported = 0
+    errors: List[Tuple[int, str]] = []
+
+    try:
+        for chunk in iter_chunks(source, fmt, chunksize):
+            frame = normalize_columns(chunk)
+            reasons = validate_frame(frame)
+            valid = reasons == ""
+            if deduplicator is not None and valid.any():
+                reasons[valid] = deduplicator.check(frame[valid])
+                valid = reasons == ""
+
+            store.extend_columns(frame[valid], coerce=False)
+
+            if len(errors) < MAX_REPORTED_ERRORS:
+                for position in np.flatnonzero(~valid)[:MAX_REPORTED_ERRORS - len(errors)]:
+                    errors.append((rows + int(position) + 1, str(reasons[position])))
+
+            rows += len(frame)
+            imported += int(valid.sum())
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ValueError(f"Could not parse {fmt} file: {e}") from e
+    except pd.errors.EmptyDataError:
+        pass
+
+    report = {"rows": rows, "imported": imported, "rejected": rows - imported, "errors": errors}
+    if deduplicator is not None:
+        report["deduplication"] = deduplicator.stats()
+    return report
@@ -0,0 +1,230 @@
+"""
+Rerun Benchmark
+Per-click latency and output size of the web app, measured headlessly with Streamlit's AppTest
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import streamlit_app.code_templates as code_templates
+import streamlit_app.core.postman as postman
+import streamlit_app.core.snippets as snippets
+from streamlit_app.benchmark_suite import sample_addresses
+from streamlit_app.core.endpoints import get_endpoint
+from streamlit_app.core.service import make_server
+from streamlit_app.static_export import iter_paths, load_questions, path_slug
+
+APP_PATH = Path(__file__).parent / "app_hardcoded_v1.py"
+
+# Output format radio labels in the generate step, shown in this order
+FORMATS = {"python": "🐍 Python", "javascript": "🟨 JavaScript", "curl": "🔧 cURL", "json": "📋 JSON"}
+
+GENERATE_LABEL = "🚀 Generate API Call & Code"
+
+# A slow rerun should fail its journey, not hang the benchmark
+STEP_TIMEOUT_SECONDS = 120
+
+PERCENTILES = (50, 95, 99)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Postman API, the C2M auth service and the C2M API
+
+    GET /collections and /mocks answer like Postman with one collection and
+    one mock server, whose URL is this server; every POST succeeds, with a
+    token for /auth/tokens/* and a job ID otherwise.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        base_url = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        if self.path == "/collections":
+            self._send({"collections": [{"uid": "benchmark-collection", "name": "C2M API v2"}]})
+        elif self.path == "/mocks":
+            self._send({"mocks": [{"id": "benchmark", "name": "C2M API v2 Mock", "collection": "benchmark-collection",
+                                   "mockUrl": base_url}]})
+        else:
+            self._send({"error": f"Not found: {self.path}"}, HTTPStatus.NOT_FOUND)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.startswith("/auth/tokens/"):
+            self._send({"access_token": "benchmark-token-0123456789abcdef0123456789", "expires_in": 900})
+        else:
+            self._send({"jobId": "benchmark-job", "status": "queued"})
+
+    def _send(self, payload: Dict[str, Any], status: HTTPStatus = HTTPStatus.OK):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response_only(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any):
+        """Quiet, like the service"""
+
+
+@contextmanager
+def stubbed_services() -> Iterator[str]:
+    """Point Postman lookups and generated code's auth at a local stub for the block; yields its URL
+
+    The app runs in this process under AppTest, so the module settings it
+    reads are swapped here and restored afterwards. Dummy Postman keys make
+    the app take its Postman path instead of skipping it.
+    """
+    server = make_server("127.0.0.1", 0, StubHandler)
+    threading.Thread(target=server.serve_forever, name="rerun-benchmark-stub", daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    settings = [(postman, "POSTMAN_API_URL"), (code_templates, "AUTH_BASE_URL"), (snippets, "AUTH_BASE_URL")]
+    saved_settings = [getattr(module, name) for module, name in settings]
+    saved_env = {variable: os.environ.get(variable) for variable in postman.API_KEY_VARIABLES.values()}
+    try:
+        for module, name in settings:
+            setattr(module, name, base_url)
+        for variable in saved_env:
+            os.environ[variable] = "benchmark-key"
+        # Renders cached before the swap embed the real auth URL
+        code_templates.CODE_TEMPLATES.clear()
+        yield base_url
+    finally:
+        for (module, name), value in zip(settings, saved_settings):
+            setattr(module, name, value)
+        for variable, value in saved_env.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+        code_templates.CODE_TEMPLATES.clear()
+        server.shutdown()
+        server.server_close()
+
+
+def tree_bytes(node) -> int:
+    """Serialized size of every element and block the last rerun rendered
+
+    This is what the rerun's delta messages carry to the browser, give or
+    take their envelopes.
+    """
+    proto = getattr(node, "proto", None)
+    total = proto.ByteSize() if hasattr(proto, "ByteSize") else 0
+    for child in getattr(node, "children", {}).values():
+        total += tree_bytes(child)
+    return total
+
+
+def run_journey(answers: Dict[str, str], fields: List[str], recipients: int = 10,
+                execute: bool = True) -> Tuple[List[Tuple[str, float, int]], Optional[str]]:
+    """Click through the whole wizard for one answer path
+
+    Returns (step, seconds, bytes) per click and the first error, if any;
+    the journey stops at an error. Each journey is a new session.
+    """
+    from streamlit.testing.v1 import AppTest  # Only the benchmark needs the test harness
+
+    app = AppTest.from_file(str(APP_PATH), default_timeout=STEP_TIMEOUT_SECONDS)
+    # Seeded so recipient-taking endpoints have a body to build
+    app.session_state["address_store"] = sample_addresses(recipients)
+    samples: List[Tuple[str, float, int]] = []
+
+    def step(name: str, action) -> bool:
+        start = time.perf_counter()
+        action().run()
+        samples.append((name, time.perf_counter() - start, tree_bytes(app._tree)))
+        return not app.exception
+
+    if not step("load", lambda: app):
+        return samples, _error(app)
+    for field in fields:
+        if field in answers and not step(app.session_state["current_step"],
+                                         lambda: app.button(key=f"{field}_{answers[field]}").click()):
+            return samples, _error(app)
+
+    submit = next((button for button in app.button if button.label == GENERATE_LABEL), None)
+    if submit is None:
+        return samples, f"No '{GENERATE_LABEL}' button at step {app.session_state['current_step']}"
+    if not step("level2", submit.click):
+        return samples, _error(app)
+
+    for name, label in FORMATS.items():
+        if not step(f"generate:{name}", lambda: app.radio(key="code_format").set_value(label)):
+            return samples, _error(app)
+        if name == "python" and execute:
+            if not step("python_script", lambda: app.button(key="gen_python").click()):
+                return samples, _error(app)
+            if not step("run_code", lambda: app.button(key="execute_python").click()):
+                return samples, _error(app)
+            if not any("executed successfully" in message.value for message in app.success):
+                return samples, "Generated code did not run successfully against the stub"
+    return samples, None
+
+
+def _error(app) -> str:
+    return f"{app.session_state['current_step']}: {app.exception[0].message.splitlines()[0]}"
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile, as numpy's default"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples: Iterable[Tuple[str, float, int]]) -> Dict[str, Dict[str, float]]:
+    """Per step: rerun count, latency percentiles in ms, and median bytes rendered"""
+    by_step: Dict[str, Tuple[List[float], List[int]]] = {}
+    for name, seconds, size in samples:
+        latencies, sizes = by_step.setdefault(name, ([], []))
+        latencies.append(seconds * 1000)
+        sizes.append(size)
+
+    summary = {}
+    for name, (latencies, sizes) in by_step.items():
+        entry = {"count": len(latencies)}
+        for q in PERCENTILES:
+            entry[f"p{q}_ms"] = round(percentile(latencies, q), 3)
+        entry["bytes"] = int(percentile(sizes, 50))
+        summary[name] = entry
+    return summary
+
+
+def run_rerun_benchmark(rounds: int = 1, recipients: int = 10, execute: bool = True,
+                        endpoints: Iterable[str] = (), on_journey=None) -> Dict[str, Any]:
+    """Every reachable answer path, rounds times, against local stubs
+
+    endpoints limits the run to paths whose endpoint contains one of the
+    given strings. on_journey(slug, endpoint, samples, error) is called as
+    each journey ends.
+    """
+    questions = load_questions()
+    fields = [question["field"] for question in questions]
+    paths = [answers for answers in iter_paths(questions)
+             if not endpoints or any(text in get_endpoint(answers) for text in endpoints)]
+
+    samples: List[Tuple[str, float, int]] = []
+    errors = []
+    with stubbed_services():
+        for _round in range(rounds):
+            for answers in paths:
+                journey, error = run_journey(answers, fields, recipients, execute)
+                samples.extend(journey)
+                slug = path_slug(answers, fields)
+                if error:
+                    errors.append({"path": slug, "error": error})
+                if on_journey:
+                    on_journey(slug, get_endpoint(answers), journey, error)
+
+    return {"journeys": len(paths) * rounds, "recipients": recipients, "steps": summarize(samples),
+            "errors": errors}
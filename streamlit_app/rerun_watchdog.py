@@ -0,0 +1,124 @@
+"""
+Rerun Watchdog
+Stack sampling of reruns that run past a latency threshold, written as collapsed stacks per wizard step
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from itertools import count
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_OUTPUT_FILE = Path("logs") / "slow_reruns.folded"
+
+
+class _Run:
+    __slots__ = ("step", "thread_id", "deadline", "samples")
+
+    def __init__(self, step: str, thread_id: int, deadline: float):
+        self.step = step
+        self.thread_id = thread_id
+        self.deadline = deadline
+        self.samples: Counter = Counter()
+
+
+def collapse(frame, max_depth: int = 64) -> str:
+    """One stack as root-first "file.py:function" frames joined by semicolons
+
+    Frames past max_depth from the innermost one are dropped.
+    """
+    names = []
+    while frame is not None and len(names) < max_depth:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).name}:{code.co_name}".replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class RerunWatchdog:
+    """One sampler thread for every session of the server process
+
+    Each rerun registers its script thread with watch() and unregisters
+    with finish(). The sampler sleeps until the oldest rerun passes the
+    threshold and only then reads sys._current_frames() every interval,
+    so reruns that finish in time cost two dict operations. Samples of a
+    slow rerun are appended to the output file in the collapsed-stack
+    format flamegraph.pl and speedscope read, rooted at the wizard step.
+    """
+
+    def __init__(self, threshold_seconds: float = 2.0, interval_seconds: float = 0.01,
+                 output_file: Optional[Path] = DEFAULT_OUTPUT_FILE, max_depth: int = 64):
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = interval_seconds
+        self.output_file = Path(output_file) if output_file else None
+        self.max_depth = max_depth
+        # Collapsed stack counts of every slow rerun so far, per step
+        self.stacks: Dict[str, Counter] = {}
+        self._runs: Dict[int, _Run] = {}
+        self._tokens = count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "RerunWatchdog":
+        self._thread = threading.Thread(target=self._loop, name="rerun-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+
+    def watch(self, step: str, thread_id: Optional[int] = None) -> int:
+        """Start watching a rerun of the calling thread (or thread_id); returns the token for finish()"""
+        run = _Run(step, thread_id or threading.get_ident(), time.monotonic() + self.threshold_seconds)
+        with self._lock:
+            token = next(self._tokens)
+            self._runs[token] = run
+        self._wake.set()
+        return token
+
+    def finish(self, token: int) -> Optional[Counter]:
+        """Stop watching a rerun; returns its samples if it went over the threshold"""
+        with self._lock:
+            run = self._runs.pop(token, None)
+            if run is None or not run.samples:
+                return None
+            self.stacks.setdefault(run.step, Counter()).update(run.samples)
+
+        if self.output_file:
+            lines = "".join(f"{run.step};{stack} {samples}\n" for stack, samples in run.samples.items())
+            self.output_file.parent.mkdir(parents=True, exist_ok=True)
+            # One write on an O_APPEND file, so concurrent reruns do not interleave
+            with open(self.output_file, "a", encoding="utf-8") as f:
+                f.write(lines)
+        return run.samples
+
+    def _loop(self):
+        while not self._stopped:
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                if any(run.deadline <= now for run in self._runs.values()):
+                    frames = sys._current_frames()
+                    for token, run in list(self._runs.items()):
+                        if run.deadline > now:
+                            continue
+                        frame = frames.get(run.thread_id)
+                        if frame is None:
+                            # The thread ended without finish(); nothing left to sample
+                            del self._runs[token]
+                        else:
+                            run.samples[collapse(frame, self.max_depth)] += 1
+                    # Frames keep their locals alive
+                    frames = frame = None
+                    timeout = self.interval_seconds
+                else:
+                    deadline = min((run.deadline for run in self._runs.values()), default=None)
+                    timeout = None if deadline is None else deadline - now
+            self._wake.wait(timeout)
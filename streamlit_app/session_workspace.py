@@ -0,0 +1,147 @@
+"""
+Session Workspaces
+Per-session scratch directories with atomic writes for generated files
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROOT = REPO_ROOT / "generated_code" / "sessions"
+DEFAULT_TTL_SECONDS = 60 * 60
+HEARTBEAT_FILE = ".last_seen"
+
+
+@contextmanager
+def atomic_writer(path: Path, binary: bool = False) -> Iterator[IO]:
+    """Open a temp file next to path and rename it into place on success
+
+    Readers never observe a partially written file: they see either the old
+    content or the new content, even with concurrent writers. If the block
+    raises, the temp file is removed and path is left untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if binary:
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write(path: Path, data: Union[str, bytes]) -> Path:
+    """Atomically replace path with data"""
+    with atomic_writer(path, binary=isinstance(data, bytes)) as f:
+        f.write(data)
+    return Path(path)
+
+
+def resolve_root(root: Union[str, Path]) -> Path:
+    """Absolute workspace root; relative roots are taken from the repo root, not the working directory"""
+    return (REPO_ROOT / root).resolve()
+
+
+class SessionWorkspace:
+    """Scratch directory owned by a single Streamlit session"""
+
+    def __init__(self, root: Path = DEFAULT_ROOT, session_id: Optional[str] = None,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.root = resolve_root(root)
+        self.session_id = session_id or uuid.uuid4().hex
+        self.ttl_seconds = ttl_seconds
+        self.path = self.root / self.session_id
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.touch()
+
+    def touch(self):
+        """Record activity so the expiry sweep leaves this workspace alone"""
+        # Recreate the directory if a sweep removed it while the session was idle
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / HEARTBEAT_FILE).touch()
+
+    def unique_name(self, prefix: str, suffix: str) -> str:
+        """Build a filename that cannot collide, even within the same second"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{prefix}_{timestamp}_{uuid.uuid4().hex[:8]}{suffix}"
+
+    def write_text(self, name: str, content: str) -> Path:
+        """Atomically write a text file inside the workspace"""
+        return atomic_write(self._resolve(name), content)
+
+    def write_json(self, name: str, data: Any, indent: int = 2) -> Path:
+        """Atomically write a JSON file inside the workspace"""
+        return atomic_write(self._resolve(name), json.dumps(data, indent=indent))
+
+    def open_atomic(self, name: str, binary: bool = False):
+        """Stream a file into the workspace; it appears only once fully written"""
+        return atomic_writer(self._resolve(name), binary=binary)
+
+    def contains(self, path: Union[str, Path]) -> bool:
+        """Check whether a path lives inside this workspace"""
+        try:
+            Path(path).resolve().relative_to(self.path.resolve())
+            return True
+        except ValueError:
+            return False
+
+    def cleanup(self):
+        """Remove the workspace and everything in it"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _resolve(self, name: str) -> Path:
+        """Map a bare filename into the workspace, refusing anything that escapes it"""
+        path = self.path / name
+        if not self.contains(path):
+            raise ValueError(f"Path escapes session workspace: {name}")
+        return path
+
+    @staticmethod
+    def cleanup_expired(root: Path = DEFAULT_ROOT, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                        now: Optional[float] = None) -> int:
+        """Remove session workspaces whose heartbeat is older than ttl_seconds
+
+        Returns the number of workspaces removed.
+        """
+        root = resolve_root(root)
+        if not root.exists():
+            return 0
+
+        now = time.time() if now is None else now
+        removed = 0
+
+        for session_dir in root.iterdir():
+            if not session_dir.is_dir():
+                continue
+
+            heartbeat = session_dir / HEARTBEAT_FILE
+            try:
+                last_seen = (heartbeat if heartbeat.exists() else session_dir).stat().st_mtime
+            except FileNotFoundError:
+                continue
+
+            if now - last_seen > ttl_seconds:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                removed += 1
+
+        return removed
@@ -0,0 +1,124 @@
+"""
+Static Assets
+Minified, content-hashed stylesheet bundle and cached choice-card HTML fragments
+"""
+
+import hashlib
+import html
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from streamlit_app.session_workspace import atomic_write
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+# Served by Streamlit at app/static/ when server.enableStaticServing is on
+STATIC_DIR = Path(__file__).parent / "static"
+STATIC_URL = "app/static"
+MANIFEST_FILE = "manifest.json"
+
+# Source stylesheets concatenated, in cascade order, into one bundle
+BUNDLES = {"app.css": ("app.css", "sidebar.css")}
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_COLON = re.compile(r"\s*:\s*(?=[^{}]*\})")
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and every whitespace run the CSS grammar does not need
+
+    Colons are only tightened inside declaration blocks, so selectors such as
+    "a :hover" keep their meaning.
+    """
+    css = _COMMENT.sub("", css)
+    css = _SPACE.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    css = _COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def content_hash(data: str) -> str:
+    """Short digest used in bundle file names"""
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def build_assets(source_dir: Path = ASSETS_DIR, static_dir: Path = STATIC_DIR) -> Dict[str, Dict[str, str]]:
+    """Minify and hash every bundle into static_dir; returns the manifest
+
+    Each bundle is written as <name>.<hash>.css, so its URL changes only
+    when its content does and browsers can keep it cached. Older builds of
+    the same bundle are removed, and an unchanged bundle is not rewritten.
+    Manifest entries hold the hashed file name and the minified text, which
+    is inlined when static serving is off.
+    """
+    static_dir = Path(static_dir)
+    static_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    for bundle, sources in BUNDLES.items():
+        css = minify_css("\n".join((Path(source_dir) / source).read_text(encoding="utf-8") for source in sources))
+        stem, suffix = bundle.rsplit(".", 1)
+        file_name = f"{stem}.{content_hash(css)}.{suffix}"
+
+        target = static_dir / file_name
+        if not target.exists() or target.read_text(encoding="utf-8") != css:
+            atomic_write(target, css)
+        for stale in static_dir.glob(f"{stem}.*.{suffix}"):
+            if stale.name != file_name:
+                stale.unlink()
+        manifest[bundle] = {"file": file_name, "css": css}
+
+    atomic_write(static_dir / MANIFEST_FILE,
+                 json.dumps({bundle: entry["file"] for bundle, entry in manifest.items()}, indent=2))
+    return manifest
+
+
+def stylesheet_tag(entry: Dict[str, str], static_serving: bool) -> str:
+    """Markup that applies a bundle: a cacheable link, or inline CSS as a fallback"""
+    if static_serving:
+        return f'<link rel="stylesheet" href="{STATIC_URL}/{entry["file"]}">'
+    return f"<style>{entry['css']}</style>"
+
+
+# Card icon per option value
+CHOICE_ICONS = {
+    "single": "📄",
+    "multi": "📚",
+    "merge": "🔗",
+    "pdfSplit": "✂️",
+    "true": "✅",
+    "false": "❌",
+    "explicit": "📝",
+    "template": "📋",
+    "addressCapture": "🔍"
+}
+
+OptionsKey = Tuple[Tuple[str, str, str], ...]
+
+
+def options_key(options: Iterable[Dict[str, str]]) -> OptionsKey:
+    """Hashable (value, label, description) form of a choice list"""
+    return tuple((opt["value"], opt["label"], opt.get("description", "")) for opt in options)
+
+
+@lru_cache(maxsize=64)
+def choice_cards(field: str, options: OptionsKey, selected: Optional[str]) -> Tuple[str, ...]:
+    """Card HTML per option, built once per (field, option set, selection)
+
+    Styling lives in the stylesheet bundle, so each card is a few short tags.
+    """
+    cards = []
+    for value, label, description in options:
+        state = " selected" if value == selected else ""
+        cards.append(
+            f'<div class="choice-card{state}"><div>'
+            f'<div class="choice-icon">{CHOICE_ICONS.get(value, "📌")}</div>'
+            f'<div class="choice-title">{html.escape(label)}</div>'
+            f'<div class="choice-description">{html.escape(description)}</div>'
+            f'</div></div>'
+        )
+    return tuple(cards)
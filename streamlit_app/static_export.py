@@ -0,0 +1,161 @@
+"""
+Static Export
+Pre-rendered recommendation pages and default code snippets for every Level 1 answer path
+"""
+
+import html
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+from streamlit_app.code_templates import DEFAULT_API_BASE_URL
+from streamlit_app.core.codegen import CODE_GENERATORS
+from streamlit_app.core.endpoints import get_endpoint
+from streamlit_app.session_workspace import atomic_write
+
+REPO_ROOT = Path(__file__).parent.parent
+DATA_DIR = REPO_ROOT / "data"
+QA_TREE_PATH = DATA_DIR / "qa_tree.yaml"
+ENDPOINTS_PATH = DATA_DIR / "endpoints.json"
+DEFAULT_EXPORT_DIR = REPO_ROOT / "exports" / "static"
+INDEX_FILE = "index"
+
+
+def load_questions(path: Path = QA_TREE_PATH) -> List[Dict[str, Any]]:
+    """Level 1 questions from the decision tree, skipping optional ones
+
+    Option values are strings, as in the app ("true", not True).
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = yaml.safe_load(f)["decision_tree"]
+    questions = []
+    for question in tree:
+        if question.get("optional"):
+            continue
+        questions.append({
+            "field": question["field"],
+            "question": question["question"],
+            "conditions": question.get("conditions", {}),
+            "options": [str(option["value"]).lower() if isinstance(option["value"], bool) else option["value"]
+                        for option in question["options"]],
+        })
+    return questions
+
+
+def iter_paths(questions: List[Dict[str, Any]]) -> Iterator[Dict[str, str]]:
+    """Every answer combination the questionnaire can reach
+
+    A question is asked only when the earlier answers meet its conditions,
+    so pdfSplit paths never carry a templateUsage answer.
+    """
+    def walk(index: int, answers: Dict[str, str]) -> Iterator[Dict[str, str]]:
+        if index == len(questions):
+            yield dict(answers)
+            return
+        question = questions[index]
+        if any(answers.get(field) not in allowed for field, allowed in question["conditions"].items()):
+            yield from walk(index + 1, answers)
+            return
+        for value in question["options"]:
+            answers[question["field"]] = value
+            yield from walk(index + 1, answers)
+            del answers[question["field"]]
+
+    yield from walk(0, {})
+
+
+def path_slug(answers: Dict[str, str], fields: List[str]) -> str:
+    """File name stem of an answer path: the answers in question order, e.g. "single-true-explicit"
+
+    Static hosts can map a finished questionnaire to its page without Python.
+    """
+    return "-".join(answers[field] for field in fields if field in answers)
+
+
+@lru_cache(maxsize=None)
+def _endpoint_details(path: Path) -> Dict[str, Dict[str, Any]]:
+    """endpoints.json entries keyed by URL path, read once per process"""
+    with open(path, encoding="utf-8") as f:
+        return {entry["path"]: entry for entry in json.load(f)["endpoints"]}
+
+
+def render_path(answers: Dict[str, str], slug: str, out_dir: Path, base_url: str = DEFAULT_API_BASE_URL,
+                endpoints_path: Path = ENDPOINTS_PATH) -> Dict[str, Any]:
+    """Write <slug>.json and <slug>.html for one answer path; returns its index entry
+
+    Snippets are the code the app generates before any parameter is filled
+    in, for every language in CODE_GENERATORS.
+    """
+    endpoint = get_endpoint(answers)
+    details = _endpoint_details(Path(endpoints_path)).get(endpoint, {})
+    snippets = {language: generator(endpoint, {}, None, base_url) for language, generator in CODE_GENERATORS.items()}
+    page = {"answers": answers, "endpoint": endpoint, "details": details, "snippets": snippets}
+
+    out_dir = Path(out_dir)
+    atomic_write(out_dir / f"{slug}.json", json.dumps(page, indent=2))
+    atomic_write(out_dir / f"{slug}.html", render_html(page))
+    return {"slug": slug, "answers": answers, "endpoint": endpoint}
+
+
+def render_html(page: Dict[str, Any]) -> str:
+    """Self-contained recommendation page"""
+    details = page["details"]
+    answers = "".join(f"<li><b>{html.escape(field)}</b>: {html.escape(value)}</li>"
+                      for field, value in page["answers"].items())
+    use_cases = "".join(f"<li>{html.escape(use_case)}</li>" for use_case in details.get("useCases", []))
+    snippets = "".join(f"<h3>{html.escape(language)}</h3><pre><code>{html.escape(code)}</code></pre>"
+                       for language, code in page["snippets"].items())
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(page['endpoint'])} - Click2Endpoint</title>"
+        "<style>body{font-family:sans-serif;max-width:60rem;margin:2rem auto}"
+        "pre{background:#f5f5f5;padding:1rem;overflow-x:auto}</style></head><body>"
+        f"<h1>🎯 POST {html.escape(page['endpoint'])}</h1>"
+        f"<p>{html.escape(details.get('description', ''))}</p>"
+        f"<h2>Your answers</h2><ul>{answers}</ul>"
+        + (f"<h2>Use cases</h2><ul>{use_cases}</ul>" if use_cases else "")
+        + f"<h2>Code</h2>{snippets}</body></html>"
+    )
+
+
+def render_index(entries: List[Dict[str, Any]]) -> str:
+    """Page linking every pre-rendered path"""
+    links = "".join(
+        f'<li><a href="{html.escape(entry["slug"])}.html">{html.escape(entry["slug"])}</a>'
+        f' → {html.escape(entry["endpoint"])}</li>'
+        for entry in entries
+    )
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Click2Endpoint</title></head>"
+            f"<body><h1>Click2Endpoint recommendations</h1><ul>{links}</ul></body></html>")
+
+
+def export_static(out_dir: Path = DEFAULT_EXPORT_DIR, base_url: str = DEFAULT_API_BASE_URL,
+                  workers: Optional[int] = None, qa_tree_path: Path = QA_TREE_PATH,
+                  endpoints_path: Path = ENDPOINTS_PATH) -> List[Dict[str, Any]]:
+    """Render every reachable answer path into out_dir in parallel; returns the index entries
+
+    Pages are rendered by a process pool (workers=1 renders in this process).
+    index.json lists every slug with its answers and endpoint, and
+    index.html links the pages.
+    """
+    questions = load_questions(qa_tree_path)
+    fields = [question["field"] for question in questions]
+    paths = list(iter_paths(questions))
+    slugs = [path_slug(answers, fields) for answers in paths]
+    count = len(paths)
+    arguments = (paths, slugs, [out_dir] * count, [base_url] * count, [endpoints_path] * count)
+
+    if workers == 1:
+        entries = list(map(render_path, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(render_path, *arguments, chunksize=max(1, count // 16)))
+
+    out_dir = Path(out_dir)
+    atomic_write(out_dir / f"{INDEX_FILE}.json", json.dumps({"fields": fields, "paths": entries}, indent=2))
+    atomic_write(out_dir / f"{INDEX_FILE}.html", render_index(entries))
+    return entries
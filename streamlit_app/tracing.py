@@ -0,0 +1,120 @@
+"""
+Tracing
+Monotonic-clock spans for one Streamlit rerun, summarized and appended to a JSONL trace file
+"""
+
+import functools
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_TRACE_FILE = Path("logs") / "traces.jsonl"
+
+
+class _NullSpan:
+    """Span stand-in when tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start", "depth")
+
+    def __init__(self, trace: "RerunTrace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.trace._depth
+        self.trace._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.trace._depth -= 1
+        self.trace.spans.append((self.name, self.start, end - self.start, self.depth))
+        return False
+
+
+class RerunTrace:
+    """Spans recorded while the app script runs once
+
+    Streamlit executes the whole script on every rerun, so the app creates
+    one RerunTrace at the top of the script and summarizes it at the end.
+    With tracing off, wrap() hands back the function unchanged and span()
+    returns a shared no-op, so disabled tracing costs nothing measurable.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, float, int]] = []
+        self._depth = 0
+
+    def span(self, name: str):
+        """Context manager timing a block"""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def wrap(self, func: Optional[Callable] = None, *, name: Optional[str] = None):
+        """Decorator timing every call of a function, as a span named after it"""
+        if func is None:
+            return functools.partial(self.wrap, name=name)
+        if not self.enabled:
+            return func
+
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(self, span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def summary(self, **attributes: Any) -> Dict[str, Any]:
+        """The rerun as one record: spans in start order plus per-name totals, times in ms"""
+        total = time.perf_counter() - self.started
+        spans = [
+            {"name": name, "start_ms": round((start - self.started) * 1000, 3),
+             "duration_ms": round(duration * 1000, 3), "depth": depth}
+            for name, start, duration, depth in sorted(self.spans, key=lambda span: span[1])
+        ]
+        totals: Dict[str, Dict[str, float]] = {}
+        for name, _start, duration, _depth in self.spans:
+            entry = totals.setdefault(name, {"calls": 0, "ms": 0.0})
+            entry["calls"] += 1
+            entry["ms"] += duration * 1000
+        for entry in totals.values():
+            entry["ms"] = round(entry["ms"], 3)
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            **attributes,
+            "duration_ms": round(total * 1000, 3),
+            "spans": spans,
+            "totals": totals,
+        }
+
+
+def append_trace(record: Dict[str, Any], path: Path = DEFAULT_TRACE_FILE):
+    """Append one rerun record as a JSON line
+
+    The line is written with a single call on an O_APPEND file, so
+    concurrent sessions do not interleave their records.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
@@ -0,0 +1,112 @@
+"""
+Zip Bundler
+Stream local documents into a zip archive for zipId submissions, hashing each member on the way
+"""
+
+import hashlib
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from streamlit_app.session_workspace import atomic_write, atomic_writer
+
+# Bytes copied from a document into the archive at a time
+COPY_CHUNK_SIZE = 1 << 20
+
+# Endpoints whose documents are usually referenced inside one zip
+BUNDLE_ENDPOINTS = (
+    "/jobs/multi-doc",
+    "/jobs/multi-docs-job-template",
+    "/jobs/multi-doc-merge",
+    "/jobs/multi-doc-merge-job-template",
+)
+
+INDEX_SUFFIX = ".index.json"
+
+
+def member_names(paths: Iterable[Path]) -> List[str]:
+    """Archive member name for every document, keeping names unique
+
+    Members are stored flat under their file name; a repeated name gets a
+    numeric suffix before the extension.
+    """
+    seen = set()
+    names = []
+    for path in paths:
+        path = Path(path)
+        name = path.name
+        counter = 2
+        while name.lower() in seen:
+            name = f"{path.stem}_{counter}{path.suffix}"
+            counter += 1
+        seen.add(name.lower())
+        names.append(name)
+    return names
+
+
+def bundle_documents(paths: Iterable[Path], archive_path: Path, zip_id: Optional[str] = None,
+                     compress: bool = False) -> Dict[str, Any]:
+    """Stream documents into archive_path in one pass and return its index
+
+    Each file is copied in COPY_CHUNK_SIZE pieces and hashed as it is
+    written, so memory use does not depend on document sizes. PDFs are
+    already compressed, so members are stored by default. The index is
+    also written next to the archive as <archive>.index.json.
+    """
+    paths = [Path(p) for p in paths]
+    if not paths:
+        raise ValueError("No documents to bundle")
+    for path in paths:
+        if not path.is_file():
+            raise ValueError(f"Document not found: {path}")
+
+    archive_path = Path(archive_path)
+    zip_id = zip_id or archive_path.stem
+    method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    members = []
+
+    with atomic_writer(archive_path, binary=True) as f:
+        with zipfile.ZipFile(f, "w", compression=method, allowZip64=True) as archive:
+            for path, name in zip(paths, member_names(paths)):
+                digest = hashlib.sha256()
+                size = 0
+                with open(path, "rb") as source, archive.open(name, "w", force_zip64=True) as member:
+                    for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        member.write(chunk)
+                        size += len(chunk)
+                info = archive.getinfo(name)
+                members.append({
+                    "documentName": name,
+                    "source": str(path),
+                    "size": size,
+                    "sha256": digest.hexdigest(),
+                    "crc32": f"{info.CRC:08x}"
+                })
+
+    index = {
+        "zipId": zip_id,
+        "archive": archive_path.name,
+        "bytes": archive_path.stat().st_size,
+        "members": members
+    }
+    atomic_write(index_path(archive_path), json.dumps(index, indent=2))
+    return index
+
+
+def index_path(archive_path: Path) -> Path:
+    """Where the member index of an archive is written"""
+    archive_path = Path(archive_path)
+    return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+
+def document_sources(index: Dict[str, Any], upload_id: Optional[str] = None) -> List[Dict[str, str]]:
+    """documentSourceIdentifier entries referencing every member of a bundle"""
+    sources = []
+    for member in index["members"]:
+        source = {"zipId": index["zipId"], "documentName": member["documentName"]}
+        if upload_id:
+            source = {"uploadRequestId": upload_id, **source}
+        sources.append(source)
+    return sources
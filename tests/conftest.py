@@ -5,67 +5,12 @@ Pytest configuration and fixtures for Click2Endpoint tests
 import pytest
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
-@pytest.fixture(autouse=True)
-def mock_streamlit():
-    """Automatically mock streamlit for all tests"""
-    # Create mock module
-    streamlit_mock = MagicMock()
-    
-    # Mock common streamlit functions
-    streamlit_mock.set_page_config = MagicMock()
-    streamlit_mock.title = MagicMock()
-    streamlit_mock.header = MagicMock()
-    streamlit_mock.subheader = MagicMock()
-    streamlit_mock.write = MagicMock()
-    streamlit_mock.markdown = MagicMock()
-    streamlit_mock.code = MagicMock()
-    streamlit_mock.error = MagicMock()
-    streamlit_mock.warning = MagicMock()
-    streamlit_mock.info = MagicMock()
-    streamlit_mock.success = MagicMock()
-    streamlit_mock.button = MagicMock(return_value=False)
-    streamlit_mock.text_input = MagicMock(return_value="")
-    streamlit_mock.text_area = MagicMock(return_value="")
-    streamlit_mock.selectbox = MagicMock(return_value=None)
-    streamlit_mock.radio = MagicMock(return_value=None)
-    streamlit_mock.checkbox = MagicMock(return_value=False)
-    streamlit_mock.columns = MagicMock(return_value=[MagicMock(), MagicMock()])
-    streamlit_mock.container = MagicMock()
-    streamlit_mock.expander = MagicMock()
-    streamlit_mock.sidebar = MagicMock()
-    streamlit_mock.download_button = MagicMock(return_value=False)
-    
-    # Mock session state
-    streamlit_mock.session_state = {}
-    
-    # Mock components
-    components_mock = MagicMock()
-    components_mock.v1 = MagicMock()
-    components_mock.v1.html = MagicMock()
-    
-    # Register mocks
-    sys.modules['streamlit'] = streamlit_mock
-    sys.modules['streamlit.components'] = components_mock
-    sys.modules['streamlit.components.v1'] = components_mock.v1
-    
-    yield streamlit_mock
-    
-    # Cleanup
-    if 'streamlit' in sys.modules:
-        del sys.modules['streamlit']
-    if 'streamlit.components' in sys.modules:
-        del sys.modules['streamlit.components']
-    if 'streamlit.components.v1' in sys.modules:
-        del sys.modules['streamlit.components.v1']
-
-
 @pytest.fixture
 def sample_request_bodies():
     """Sample request bodies for different endpoints"""
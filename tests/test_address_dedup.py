@@ -0,0 +1,92 @@
+"""
+Tests for streaming recipient deduplication
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.address_dedup import Deduplicator, dedupe_store, store_frame
+from streamlit_app.address_store import AddressStore
+from streamlit_app.recipient_import import import_recipients
+
+
+def make_store(*addresses):
+    """Store of Jane Doe recipients at the given address1 lines in ZIP 02134"""
+    store = AddressStore()
+    for address in addresses:
+        store.append({"firstName": "Jane", "lastName": "Doe", "address1": address, "city": "Boston",
+                      "state": "MA", "zip": "02134"})
+    return store
+
+
+class TestDedupeStore:
+    """Test removing duplicates from a store"""
+
+    def test_exact_and_near(self):
+        """Test normalized copies are exact duplicates and designator variants are near duplicates"""
+        store = make_store("1 Main Street Apt 2", "1  Main Street Apt 2", "1 MAIN ST. #2", "100 North Main St",
+                           "100 N Main", "100 S Main")
+
+        report = dedupe_store(store)
+
+        assert store.columns["address1"] == ["1 Main Street Apt 2", "100 North Main St", "100 S Main"]
+        assert (report["duplicates"], report["near_duplicates"], report["pieces_saved"]) == (1, 2, 3)
+        assert report["dropped"] == [(2, "duplicate"), (3, "near duplicate"), (5, "near duplicate")]
+
+    def test_names_and_units_kept_apart(self):
+        """Test surnames that look like street suffixes, and different unit types, are not near duplicates"""
+        store = AddressStore()
+        for last_name, address2 in (("Lane", ""), ("Way", ""), ("Lane", "Apt 2"), ("Lane", "Floor 2"),
+                                    ("Lane", "FL 2")):
+            store.append({"firstName": "Penny", "lastName": last_name, "address1": "12 Oak Ave",
+                          "address2": address2, "city": "Boston", "state": "MA", "zip": "02134"})
+
+        report = dedupe_store(store)
+
+        assert report["dropped"] == [(5, "near duplicate")]
+        assert store.columns["lastName"] == ["Lane", "Way", "Lane", "Lane"]
+
+    def test_exact_only(self):
+        """Test near matching can be switched off"""
+        store = make_store("1 Main Street", "1 Main St")
+
+        assert dedupe_store(store, near=False)["pieces_saved"] == 0
+        assert len(store) == 2
+
+    def test_list_references(self):
+        """Test repeated address list ids are counted apart from single pieces"""
+        store = AddressStore()
+        store.append({"type": "addressListId", "value": "list_1"})
+        store.append({"type": "addressListId", "value": "list_1"})
+        store.append({"type": "addressListId", "value": "list_2"})
+
+        report = dedupe_store(store, apply=False)
+
+        assert (report["pieces_saved"], report["lists_skipped"]) == (0, 1)
+        assert len(store) == 3
+
+
+class TestStreaming:
+    """Test duplicates are found across chunks"""
+
+    def test_across_chunks_and_seeded(self):
+        """Test an import skips rows seen in earlier chunks or already in the store"""
+        store = make_store("9 Elm St")
+        deduplicator = Deduplicator()
+        deduplicator.remember(store_frame(store))
+        csv_data = ("firstName,lastName,address1,city,state,zip\n"
+                    "Jane,Doe,1 Oak Ave,Boston,MA,02134\n"
+                    "Jane,Doe,9 Elm Street,Boston,MA,02134\n"
+                    "John,Doe,1 Oak Ave,Boston,MA,02134\n"
+                    "Jane,Doe,1 OAK AVENUE,Boston,MA,02134\n")
+
+        report = import_recipients(io.StringIO(csv_data), "csv", store, chunksize=2, deduplicator=deduplicator)
+
+        assert report["imported"] == 2
+        assert report["errors"] == [(2, "near duplicate"), (4, "near duplicate")]
+        assert report["deduplication"]["checked"] == 4
+        assert store.columns["firstName"] == ["Jane", "Jane", "John"]
@@ -0,0 +1,123 @@
+"""
+Tests for vectorized address normalization and validation
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.address_store import RECIPIENT_COLUMNS, AddressStore
+from streamlit_app.address_validation import normalize_frame, validate_frame, validate_store, zip_state_mismatch
+
+
+def address_frame(**columns):
+    """One-column-per-field frame with the given overrides on a valid Boston address"""
+    rows = len(next(iter(columns.values()), [""]))
+    base = {"type": "newAddress", "value": "", "firstName": "Jane", "lastName": "Doe", "address1": "1 Main St",
+            "address2": "", "city": "Boston", "state": "MA", "zip": "02134", "country": "USA"}
+    return pd.DataFrame({column: columns.get(column, [base[column]] * rows) for column in RECIPIENT_COLUMNS})
+
+
+class TestNormalize:
+    """Test canonical forms"""
+
+    def test_whitespace_and_state_names(self):
+        """Test whitespace collapses and full state names become codes"""
+        frame = normalize_frame(address_frame(address1=["  1  Main\tSt ", "2 Oak Ave"],
+                                              state=["massachusetts", " tx"],
+                                              country=["united states", "us"]))
+
+        assert frame["address1"].tolist() == ["1 Main St", "2 Oak Ave"]
+        assert frame["state"].tolist() == ["MA", "TX"]
+        assert frame["country"].tolist() == ["USA", "USA"]
+
+    def test_zip_forms(self):
+        """Test 9-digit ZIPs get a hyphen and 4-digit repair is opt-in"""
+        frame = address_frame(zip=["021341234", "2134", "02134 1234"])
+
+        assert normalize_frame(frame)["zip"].tolist() == ["02134-1234", "2134", "02134-1234"]
+        assert normalize_frame(frame, repair_zip=True)["zip"].tolist() == ["02134-1234", "02134", "02134-1234"]
+
+    def test_postal_case(self):
+        """Test postal case uppercases address lines and city only"""
+        frame = normalize_frame(address_frame(city=["Boston"]), postal_case=True)
+
+        assert (frame["address1"][0], frame["city"][0], frame["firstName"][0]) == ("1 MAIN ST", "BOSTON", "Jane")
+
+
+class TestValidate:
+    """Test rejection reasons"""
+
+    def test_reasons(self):
+        """Test each check reports its own reason and valid rows report none"""
+        frame = normalize_frame(address_frame(
+            city=["Boston", "", "Boston", "Boston", "Boston"],
+            state=["MA", "MA", "ZZ", "MA", "TX"],
+            zip=["02134", "02134", "02134", "2134", "02134"],
+        ))
+
+        assert validate_frame(frame).tolist() == [
+            "", "missing city", "invalid state", "invalid ZIP", "ZIP does not match state"
+        ]
+
+    def test_foreign_addresses_skip_us_checks(self):
+        """Test state and ZIP rules only apply to US addresses"""
+        frame = normalize_frame(address_frame(state=["Ontario"], zip=["M5V 2T6"], country=["Canada"]))
+
+        assert validate_frame(frame).tolist() == [""]
+
+    def test_shared_and_unassigned_prefixes(self):
+        """Test shared ZIP prefixes accept every owner and unknown prefixes are not mismatches"""
+        zips = pd.Series(["96799", "96799", "96960", "96960", "00001", "abcde"])
+        states = pd.Series(["AS", "HI", "MH", "GU", "CA", "CA"])
+
+        assert zip_state_mismatch(zips, states).tolist() == [False, False, False, False, False, False]
+        assert zip_state_mismatch(pd.Series(["10001"]), pd.Series(["CA"])).tolist() == [True]
+
+
+class TestValidateStore:
+    """Test validating a whole store"""
+
+    def test_applies_normalization(self):
+        """Test normalized values are written back and counted"""
+        store = AddressStore()
+        store.append({"firstName": "Jane", "lastName": "Doe", "address1": "1  Main St", "city": "Boston",
+                      "state": "Massachusetts", "zip": "2134"})
+        store.append({"firstName": "John", "lastName": "Doe", "address1": "9 Elm St", "city": "Boston",
+                      "state": "CA", "zip": "02134"})
+
+        report = validate_store(store, repair_zip=True)
+
+        assert store.row(0)["state"] == "MA"
+        assert store.row(0)["zip"] == "02134"
+        assert (report["valid"], report["invalid"], report["normalized"]) == (1, 1, 3)
+        assert report["errors"] == [(2, "ZIP does not match state")]
+
+    def test_dry_run_leaves_store(self):
+        """Test apply=False only reports"""
+        store = AddressStore()
+        store.append({"firstName": "Jane", "lastName": "Doe", "address1": "1 Main St", "city": "Boston",
+                      "state": "ma", "zip": "02134"})
+
+        assert validate_store(store, apply=False)["normalized"] == 1
+        assert store.row(0)["state"] == "ma"
+
+    def test_large_store_is_fast(self):
+        """Test 100k recipients validate in about a second at worst"""
+        rows = 100_000
+        store = AddressStore()
+        store.extend_columns({
+            "firstName": ["Jane"] * rows, "lastName": ["Doe"] * rows, "address1": ["1  Main St"] * rows,
+            "city": ["Boston"] * rows, "state": ["ma", "TX"] * (rows // 2), "zip": ["2134"] * rows,
+        }, coerce=False)
+
+        started = time.perf_counter()
+        report = validate_store(store, repair_zip=True)
+
+        assert time.perf_counter() - started < 1.5
+        assert report["reasons"] == {"ZIP does not match state": rows // 2}
@@ -0,0 +1,75 @@
+"""
+Tests for the benchmark suite and its baseline gating
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.benchmark_suite import (
+    Benchmark,
+    compare,
+    default_benchmarks,
+    load_baseline,
+    machine_id,
+    run_benchmarks,
+    sample_addresses,
+    save_baseline,
+)
+
+
+def result(median):
+    return {"seconds": median, "median": median, "number": 1, "units": 1, "unit": "call"}
+
+
+class TestBenchmarkSuite:
+    """Test running benchmarks and comparing them with a baseline"""
+
+    def test_covers_hot_paths(self):
+        """Test the suite times every hot path, at each recipient count"""
+        names = [benchmark.name for benchmark in default_benchmarks()]
+
+        assert "endpoint_resolution" in names
+        for count in (10, 1000, 100000):
+            assert f"generate_api_call[{count}]" in names
+        assert "codegen[curl]" in names
+        assert "training_data[openai]" in names
+        assert len(names) == len(set(names))
+
+    def test_run_records_timings(self):
+        """Test a run times each benchmark's call and keeps its throughput unit"""
+        calls = []
+        benchmark = Benchmark("append", lambda: lambda: calls.append(1), 3, "items")
+        results = run_benchmarks([benchmark], repeats=2)
+
+        assert results["append"]["seconds"] > 0
+        assert results["append"]["median"] >= results["append"]["seconds"]
+        assert results["append"]["unit"] == "items"
+        assert len(calls) > 2
+
+    def test_compare_against_baseline(self):
+        """Test only slowdowns past the tolerance fail, and new benchmarks never do"""
+        baseline = {"results": {"same": result(1.0), "slower": result(1.0), "much_slower": result(1.0)}}
+        current = {"same": result(1.0), "slower": result(1.2), "much_slower": result(2.0), "new": result(9.0)}
+
+        regressions = compare(current, baseline, tolerance=0.25)
+
+        assert [regression["name"] for regression in regressions] == ["much_slower"]
+        assert regressions[0]["ratio"] == 2.0
+
+    def test_baseline_round_trip(self, tmp_path):
+        """Test a saved baseline loads back with this machine's name, and a missing one is None"""
+        path = tmp_path / "baselines" / "machine.json"
+        assert load_baseline(path) is None
+
+        save_baseline({"same": result(1.0)}, path)
+        baseline = load_baseline(path)
+
+        assert baseline["machine"] == machine_id()
+        assert baseline["results"] == {"same": result(1.0)}
+
+    def test_sample_addresses(self):
+        """Test sample recipients are complete, so none are skipped from the body"""
+        assert len(sample_addresses(50).recipient_sources()) == 50
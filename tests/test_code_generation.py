@@ -3,21 +3,13 @@ Tests for code generation - Python, JavaScript, and cURL
 """
 
 import pytest
-import json
-from unittest.mock import patch, MagicMock
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Mock streamlit
-sys.modules['streamlit'] = MagicMock()
-sys.modules['streamlit.components'] = MagicMock()
-sys.modules['streamlit.components.v1'] = MagicMock()
-
-# Import after mocking
-from streamlit_app.app_hardcoded_v1 import (
+from streamlit_app.core import (
     generate_full_python_code,
     generate_javascript_preview,
     generate_curl_command
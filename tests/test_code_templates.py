@@ -0,0 +1,144 @@
+"""
+Tests for the compiled code template registry
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import streamlit_app.code_templates as code_templates
+from streamlit_app.code_templates import (
+    TemplateRegistry,
+    build_default_registry,
+    compile_template,
+    body_digest
+)
+
+
+class TestCompileTemplate:
+    """Test template compilation"""
+
+    def test_placeholders_substituted(self):
+        """Test placeholders are filled and literal braces survive"""
+        render = compile_template('headers = {"url": "{{ api_base_url }}{{endpoint}}"}')
+        assert render.placeholders == ("api_base_url", "endpoint")
+        assert render({"api_base_url": "https://x", "endpoint": "/jobs"}) == 'headers = {"url": "https://x/jobs"}'
+
+    def test_values_are_not_reinterpreted(self):
+        """Test braces inside substituted values are left alone"""
+        render = compile_template("payload = {{ body_json }}")
+        assert render({"body_json": '{"a": "{b}"}'}) == 'payload = {"a": "{b}"}'
+
+
+class TestTemplateRegistry:
+    """Test rendering and memoization"""
+
+    def test_all_targets_render(self):
+        """Test every built-in target renders the endpoint and body"""
+        registry = build_default_registry()
+        body = {"tags": ["urgent"]}
+
+        for target in ("python", "python_preview", "javascript", "curl"):
+            code = registry.render(target, "/jobs/single-doc", body, "https://mock.pstmn.io")
+            assert "/jobs/single-doc" in code
+            assert '"urgent"' in code
+
+    def test_file_targets_reference_payload_file(self):
+        """Test the streaming variants read the payload file and never embed the body"""
+        registry = build_default_registry()
+        body = {"tags": ["urgent"]}
+
+        for target in ("python_file", "python_preview_file", "javascript_file", "curl_file"):
+            code = registry.render(target, "/jobs/single-doc", body, payload_file="c2m_api_request.json")
+            assert "c2m_api_request.json" in code
+            assert "urgent" not in code
+
+    def test_python_template_is_valid_python(self):
+        """Test both full Python clients compile"""
+        registry = build_default_registry()
+        for target in ("python", "python_file"):
+            code = registry.render(target, "/jobs/multi-doc", {"name": "O'Brien \"Jr\""})
+            compile(code, "<generated>", "exec")
+
+    def test_upload_clients(self, tmp_path):
+        """Test the upload clients compile and read parts of a mapped file in pieces"""
+        import mmap
+        registry = build_default_registry()
+        body = {"documentSourceIdentifier": {"uploadRequestId": "", "documentName": "big.pdf"}}
+        for target in ("python_upload", "python_upload_file"):
+            code = registry.render(target, "/jobs/single-doc", body)
+            compile(code, "<generated>", "exec")
+        assert '"documentName": "big.pdf"' in registry.render("python_upload", "/jobs/single-doc", body)
+        file_code = registry.render("python_upload_file", "/jobs/single-doc", body, payload_file="job.json")
+        assert 'PAYLOAD_FILE = Path(__file__).with_name("job.json")' in file_code
+        assert "big.pdf" not in file_code
+
+        namespace = {"__name__": "generated"}
+        exec(registry.render("python_upload", "/jobs/single-doc", body), namespace)
+        document = tmp_path / "big.pdf"
+        document.write_bytes(bytes(range(256)) * 100)
+
+        with open(document, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            part = namespace["MappedPart"](mapped, 1000, 2000)
+            assert len(part) == 1000
+            assert part.read(10) == document.read_bytes()[1000:1010]
+            assert part.tell() == 10
+            part.checksum()
+            part.seek(0)
+            assert part.read() == document.read_bytes()[1000:2000]
+            assert part.read(10) == b""
+
+    def test_memoized_per_inputs(self, monkeypatch):
+        """Test repeat renders hit the cache and changed inputs miss"""
+        monkeypatch.setattr(code_templates, "generated_timestamp", lambda: "2025-01-01 00:00:00")
+        registry = build_default_registry()
+        body = {"tags": ["a"]}
+
+        first = registry.render("curl", "/jobs/single-doc", body, "https://a")
+        second = registry.render("curl", "/jobs/single-doc", dict(body), "https://a")
+        assert first == second
+        assert registry.cache_info()["hits"] == 1
+
+        registry.render("curl", "/jobs/single-doc", body, "https://b")
+        registry.render("curl", "/jobs/single-doc", {"tags": ["b"]}, "https://a")
+        assert registry.cache_info()["misses"] == 3
+
+    def test_cache_hits_get_current_timestamp(self, monkeypatch):
+        """Test a cached render is stamped with the time of the call, not of the first render"""
+        registry = build_default_registry()
+        monkeypatch.setattr(code_templates, "generated_timestamp", lambda: "2025-01-01 00:00:00")
+        registry.render("python", "/jobs/single-doc", {"tags": ["a"]})
+
+        monkeypatch.setattr(code_templates, "generated_timestamp", lambda: "2025-06-30 12:00:00")
+        code = registry.render("python", "/jobs/single-doc", {"tags": ["a"]})
+
+        assert registry.cache_info()["hits"] == 1
+        assert "Generated: 2025-06-30 12:00:00" in code
+        assert code_templates.TIMESTAMP_MARKER not in code
+
+    def test_file_targets_ignore_body_changes(self):
+        """Test templates without body_json are not re-rendered when only the body changes"""
+        registry = build_default_registry()
+        registry.render("curl_file", "/jobs/single-doc", {"tags": ["a"]})
+        registry.render("curl_file", "/jobs/single-doc", {"tags": ["b"]})
+        assert registry.cache_info()["hits"] == 1
+
+    def test_cache_is_bounded(self):
+        """Test least recently used entries are evicted"""
+        registry = TemplateRegistry(max_entries=2)
+        registry.register("plain", "{{ endpoint }}")
+        for i in range(5):
+            registry.render("plain", f"/e{i}", {})
+        assert registry.cache_info()["size"] == 2
+
+    def test_unknown_target(self):
+        """Test rendering an unregistered target fails loudly"""
+        with pytest.raises(ValueError, match="Unknown code template"):
+            build_default_registry().render("cobol", "/jobs/single-doc", {})
+
+    def test_body_digest_keeps_key_order(self):
+        """Test bodies that serialize differently hash differently"""
+        assert body_digest({"a": 1, "b": 2}) != body_digest({"b": 2, "a": 1})
@@ -0,0 +1,65 @@
+"""
+Tests for the Streamlit-free core package
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.core import load_config, resolve_mock_server
+from streamlit_app.core.postman import get_postman_mock_servers
+
+
+class TestImport:
+    """Test importing the core package"""
+
+    def test_no_heavy_or_ui_imports(self):
+        """Test a fresh interpreter imports core without Streamlit, requests or YAML"""
+        script = ("import sys; import streamlit_app.core; "
+                  "print(sorted(m for m in ('streamlit', 'requests', 'yaml') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).parent.parent)
+
+        assert result.stdout.strip() == "[]"
+
+
+class TestConfig:
+    """Test lazy configuration loading"""
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing config file reads as empty"""
+        assert load_config(tmp_path / "missing.yaml") == {}
+
+    def test_cached(self, tmp_path):
+        """Test a path is parsed once"""
+        path = tmp_path / "config.yaml"
+        path.write_text("api:\n  mock_server_url: https://example.test\n")
+
+        assert load_config(path) is load_config(path)
+
+
+class TestMockServer:
+    """Test mock server resolution"""
+
+    def test_disabled_postman_uses_config(self, monkeypatch):
+        """Test the config URL is used without touching the network"""
+        monkeypatch.setenv("POSTMAN_API_KEY_PERSONAL", "key")
+        config = {"postman": {"enabled": False}, "api": {"mock_server_url": "https://mock.example.test"}}
+
+        assert get_postman_mock_servers(config=config) is None
+        assert resolve_mock_server(config=config) == ("https://mock.example.test", "Default Mock Server")
+
+    def test_errors_reach_handler(self, monkeypatch):
+        """Test a failed lookup is reported to on_error and falls back"""
+        monkeypatch.setenv("POSTMAN_API_KEY_PERSONAL", "key")
+        monkeypatch.setattr("streamlit_app.core.postman._get", lambda path, key: 1 / 0)
+        errors = []
+        config = {"postman": {"enabled": True}}
+
+        url, name = resolve_mock_server(config=config, on_error=errors.append)
+
+        assert name == "Default Mock Server" and url.startswith("https://")
+        assert isinstance(errors[0], ZeroDivisionError)
@@ -3,19 +3,12 @@ Tests for document specification methods - all 5 EBNF types
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Mock streamlit before importing
-import streamlit as st
-sys.modules['streamlit'] = MagicMock()
-st.text_input = MagicMock(side_effect=lambda label, key=None, **kwargs: f"test_{key}")
-st.columns = MagicMock(return_value=[MagicMock(), MagicMock()])
-
 
 class TestDocumentSpecification:
     """Test all 5 document specification methods from EBNF"""
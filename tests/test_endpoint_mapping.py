@@ -3,20 +3,13 @@ Tests for endpoint mapping logic - covers all 27 possible QA paths
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Mock streamlit before importing app
-sys.modules['streamlit'] = MagicMock()
-sys.modules['streamlit.components'] = MagicMock()
-sys.modules['streamlit.components.v1'] = MagicMock()
-
-# Now import the function we're testing
-from streamlit_app.app_hardcoded_v1 import get_endpoint
+from streamlit_app.core import get_endpoint
 
 
 class TestEndpointMapping:
@@ -4,21 +4,18 @@ Tests the complete flow from QA selection to code generation
 """
 
 import pytest
-import json
 import requests
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import patch, Mock
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Import after mocking streamlit (done in conftest.py)
-from streamlit_app.app_hardcoded_v1 import (
+from streamlit_app.core import (
     get_endpoint,
     generate_full_python_code,
-    get_postman_mock_servers,
-    initialize_mock_server
+    get_postman_mock_servers
 )
 
 
@@ -0,0 +1,103 @@
+"""
+Tests for coalescing single-document jobs into multi-document submissions
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from endpoint_mapper import EndpointMapper
+from streamlit_app.job_coalescer import COALESCE_TARGETS, JobCoalescer, coalesce, group_key
+
+
+def make_spec(doc, recipients=1, payment="INVOICE", template=None):
+    """Single-doc body with the given document and number of recipients"""
+    body = {
+        "documentSourceIdentifier": doc,
+        "recipientAddressSources": [{"addressId": f"{doc}_r{i}"} for i in range(recipients)],
+        "paymentDetails": {"type": payment},
+        "tags": ["monthly"]
+    }
+    if template:
+        body["jobTemplate"] = template
+        return "/jobs/single-doc-job-template", body
+    body["jobOptions"] = {"mailclass": "firstClassMail"}
+    return "/jobs/single-doc", body
+
+
+class TestGroupKey:
+    """Test compatibility hashing"""
+
+    def test_ignores_document_and_recipients(self):
+        """Test jobs differing only in document and recipients share a key"""
+        assert group_key(*make_spec("a", 1)) == group_key(*make_spec("b", 3))
+
+    def test_shared_settings_split_groups(self):
+        """Test payment, template and endpoint all separate groups"""
+        keys = {
+            group_key(*make_spec("a")),
+            group_key(*make_spec("a", payment="ACH")),
+            group_key(*make_spec("a", template="tmpl_1")),
+            group_key(*make_spec("a", template="tmpl_2")),
+        }
+        assert len(keys) == 4
+
+
+class TestCoalesce:
+    """Test submission planning"""
+
+    def test_fewest_submissions(self):
+        """Test compatible specs are packed up to max_items pairs per call"""
+        coalescer = JobCoalescer(max_items=10)
+        submissions = list(coalesce((make_spec(f"doc{i}", 3) for i in range(10)), coalescer=coalescer))
+
+        assert [s["endpoint"] for s in submissions] == ["/jobs/multi-doc"] * 3
+        assert [len(s["body"]["items"]) for s in submissions] == [10, 10, 10]
+        assert submissions[0]["body"]["paymentDetails"] == {"type": "INVOICE"}
+        # doc3 straddles the first two submissions
+        assert submissions[0]["specs"][-1] == submissions[1]["specs"][0] == 3
+        assert coalescer.stats["submissions"] == 3
+
+    def test_items_pair_document_with_recipient(self):
+        """Test every recipient becomes its own document/recipient item"""
+        submission, = coalesce([make_spec("a", 2), make_spec("b", 1)])
+
+        assert submission["body"]["items"] == [
+            {"documentSourceIdentifier": "a", "recipientAddressSource": {"addressId": "a_r0"}},
+            {"documentSourceIdentifier": "a", "recipientAddressSource": {"addressId": "a_r1"}},
+            {"documentSourceIdentifier": "b", "recipientAddressSource": {"addressId": "b_r0"}},
+        ]
+
+    def test_template_groups_use_template_endpoint(self):
+        """Test template jobs go to the multi-doc template endpoint, grouped per template"""
+        specs = [make_spec("a", template="t1"), make_spec("b", template="t2"), make_spec("c", template="t1")]
+        submissions = list(coalesce(specs))
+
+        assert submissions[0]["endpoint"] == "/jobs/multi-docs-job-template"
+        assert submissions[0]["body"]["jobTemplate"] == "t1"
+        assert submissions[0]["specs"] == [0, 2]
+        # A lone job keeps its original endpoint and body
+        assert submissions[1] == {"endpoint": specs[1][0], "body": specs[1][1], "specs": [1]}
+
+    def test_passthrough(self):
+        """Test specs without a document or recipients are sent unchanged"""
+        endpoint, body = make_spec("a", 0, template="t1")
+        submission, = coalesce([(endpoint, body)])
+
+        assert submission["body"] is body
+
+    def test_invalid_max_items(self):
+        """Test max_items must allow at least one pair"""
+        with pytest.raises(ValueError):
+            JobCoalescer(max_items=0)
+
+    def test_targets_are_known_endpoints(self):
+        """Test every rewrite source and target is a documented use case"""
+        for source, target in COALESCE_TARGETS.items():
+            assert source in EndpointMapper.ENDPOINT_TO_USECASE
+            assert target in EndpointMapper.ENDPOINT_TO_USECASE
@@ -0,0 +1,97 @@
+"""
+Tests for splitting oversized recipient lists into balanced jobs
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.code_templates import build_default_registry
+from streamlit_app.job_splitter import MANIFEST_FILE, measure_body, plan_chunks, split_jobs
+
+
+def make_body(recipients):
+    """Body items factory shaped like ParameterStore.iter_body output"""
+    def body_items():
+        yield "documentSourceIdentifier", {"zipId": "zip_456", "documentName": "contract.pdf"}
+        yield "recipientAddressSources", iter(
+            {"recipientAddress": {"firstName": f"First{i}", "lastName": "Doe", "zip": "90210"}}
+            for i in range(recipients)
+        )
+        yield "tags", ["bulk"]
+    return body_items
+
+
+class TestPlanChunks:
+    """Test partition planning"""
+
+    def test_balanced_on_recipient_count(self):
+        """Test jobs come out even rather than full jobs plus a remainder"""
+        plan = plan_chunks([10] * 2500, max_recipients=1000, max_bytes=10 ** 9)
+
+        assert [end - start for start, end in plan] == [834, 833, 833]
+        assert plan[0][0] == 0 and plan[-1][1] == 2500
+
+    def test_balanced_on_bytes(self):
+        """Test the byte limit drives the split when it binds first"""
+        sizes = [100] * 50 + [300] * 50
+        plan = plan_chunks(sizes, max_recipients=1000, max_bytes=5000, base_bytes=100)
+
+        assert all(sum(sizes[start:end]) <= 4900 for start, end in plan)
+        assert len(plan) == 5
+
+    def test_oversized_recipient(self):
+        """Test a recipient bigger than the byte budget cannot be planned"""
+        with pytest.raises(ValueError, match="single recipient"):
+            plan_chunks([10, 500], max_bytes=400)
+
+    def test_empty(self):
+        """Test no recipients means no jobs"""
+        assert plan_chunks([]) == []
+
+
+class TestSplitJobs:
+    """Test job payload files and manifest"""
+
+    def test_round_trip(self, tmp_path):
+        """Test every recipient lands in exactly one job, within both limits"""
+        manifest = split_jobs(tmp_path, "/jobs/single-doc", make_body(250), max_recipients=100, max_bytes=20000)
+
+        assert json.loads((tmp_path / MANIFEST_FILE).read_text()) == manifest
+        names = []
+        for job in manifest["jobs"]:
+            data = (tmp_path / job["file"]).read_bytes()
+            body = json.loads(data)
+            assert len(data) == job["bytes"] <= 20000
+            assert len(body["recipientAddressSources"]) == job["recipients"] <= 100
+            assert body["tags"] == ["bulk"]
+            names += [r["recipientAddress"]["firstName"] for r in body["recipientAddressSources"]]
+        assert names == [f"First{i}" for i in range(250)]
+
+    def test_size_estimate_is_safe(self):
+        """Test measured sizes never undercount the written payload"""
+        base, sizes = measure_body(make_body(30)())
+        plan = plan_chunks(sizes, max_recipients=1000, max_bytes=base + sum(sizes))
+
+        assert plan == [(0, 30)]
+
+    def test_unsplittable_endpoint(self, tmp_path):
+        """Test endpoints without recipient lists are refused"""
+        with pytest.raises(ValueError, match="cannot be split"):
+            split_jobs(tmp_path, "/jobs/single-pdf-split", make_body(10))
+
+
+class TestBatchTemplate:
+    """Test the generated submission script"""
+
+    def test_compiles(self):
+        """Test the batch client is valid Python pointing at the manifest"""
+        script = build_default_registry().render("python_batch", "/jobs/single-doc", payload_file=MANIFEST_FILE)
+
+        compile(script, "submit_jobs.py", "exec")
+        assert MANIFEST_FILE in script
+        assert "/jobs/single-doc" in script
@@ -0,0 +1,92 @@
+"""
+Tests for the Prometheus metrics exporter
+"""
+
+import threading
+import urllib.request
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.metrics import CONTENT_TYPE, TEXTFILE_NAME, CallbackCounter, MetricsRegistry, TextfileExporter
+
+
+class TestMetrics:
+    """Test counting, exposition and export"""
+
+    def test_counter_exposition(self):
+        """Test counters render HELP, TYPE and one escaped sample per label set"""
+        registry = MetricsRegistry()
+        counter = registry.counter("c2m_test_total", "Things counted", ["endpoint"])
+        counter.inc(endpoint="/jobs/single-doc")
+        counter.inc(2, endpoint="/jobs/single-doc")
+        counter.inc(endpoint='say "hi"')
+
+        text = registry.render()
+        assert "# HELP c2m_test_total Things counted\n# TYPE c2m_test_total counter\n" in text
+        assert 'c2m_test_total{endpoint="/jobs/single-doc"} 3\n' in text
+        assert 'c2m_test_total{endpoint="say \\"hi\\""} 1\n' in text
+
+    def test_counts_from_many_threads(self):
+        """Test increments from concurrent threads are all counted, including finished threads"""
+        registry = MetricsRegistry()
+        counter = registry.counter("c2m_test_total", "Things counted")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.values() == {(): 40000}
+        # Finished threads were folded in; counting again must not lose or double them
+        assert counter.values() == {(): 40000}
+
+    def test_histogram_buckets(self):
+        """Test histogram buckets are cumulative, with +Inf, sum and count"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("c2m_test_seconds", "Durations", ["step"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, step="q1")
+
+        lines = registry.render().splitlines()
+        assert 'c2m_test_seconds_bucket{step="q1",le="0.1"} 2' in lines
+        assert 'c2m_test_seconds_bucket{step="q1",le="1.0"} 3' in lines
+        assert 'c2m_test_seconds_bucket{step="q1",le="+Inf"} 4' in lines
+        assert 'c2m_test_seconds_sum{step="q1"} 3.65' in lines
+        assert 'c2m_test_seconds_count{step="q1"} 4' in lines
+
+    def test_callback_counter(self):
+        """Test callback counters are read at exposition time"""
+        registry = MetricsRegistry()
+        hits = {"count": 1}
+        registry.register(CallbackCounter("c2m_cache_total", "Lookups", ["result"],
+                                          lambda: {("hit",): hits["count"]}))
+        hits["count"] = 5
+
+        assert 'c2m_cache_total{result="hit"} 5\n' in registry.render()
+
+    def test_textfile_and_server(self, tmp_path):
+        """Test the textfile is written at most once per interval and /metrics serves the same text"""
+        registry = MetricsRegistry()
+        registry.counter("c2m_test_total", "Things counted").inc()
+
+        exporter = TextfileExporter(registry, tmp_path, interval_seconds=60)
+        assert exporter.maybe_write()
+        assert not exporter.maybe_write()
+        assert (tmp_path / TEXTFILE_NAME).read_text() == registry.render()
+
+        server = registry.serve("127.0.0.1", 0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert response.read().decode("utf-8") == registry.render()
+        finally:
+            server.shutdown()
+            server.server_close()
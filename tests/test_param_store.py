@@ -0,0 +1,165 @@
+"""
+Tests for the slot-based Level 2 parameter store
+"""
+
+import pytest
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.address_store import AddressStore
+from streamlit_app.param_store import ParameterStore, BODY_SECTIONS, RECIPIENT_PREVIEW_LIMIT
+
+
+class TestParameterStore:
+    """Test typed storage and dirty tracking"""
+
+    def test_slots_reject_unknown_attributes(self):
+        """Test the store has no per-instance dict"""
+        store = ParameterStore()
+        with pytest.raises(AttributeError):
+            store.not_a_param = "x"
+        with pytest.raises(KeyError, match="Unknown parameter"):
+            store.set("not_a_param", "x")
+
+    def test_widget_writes_mark_only_their_section(self):
+        """Test changing a value dirties just the owning section"""
+        store = ParameterStore()
+        store.build_body()
+        assert not any(store.is_dirty(section) for section in BODY_SECTIONS)
+
+        assert store.set_widget("param_invoice_num", "INV-1") is True
+        assert store.is_dirty("payment")
+        assert not store.is_dirty("document")
+
+        store.build_body()
+        assert store.set_widget("param_invoice_num", "INV-1") is False
+        assert not store.is_dirty("payment")
+
+    def test_clean_sections_are_reused(self):
+        """Test unchanged sections return the cached fragment"""
+        store = ParameterStore()
+        store.set("doc_id", "doc_1")
+        first = store.build_body()
+
+        store.set("tags", "a, b")
+        second = store.build_body()
+
+        assert second["documentSourceIdentifier"] is first["documentSourceIdentifier"]
+        assert second["tags"] == ["a", "b"]
+
+    def test_retain_clears_hidden_inputs(self):
+        """Test switching document method drops the old method's values"""
+        store = ParameterStore()
+        store.set("doc_id", "doc_1")
+        store.retain("document", ["doc_url"])
+        store.set("doc_url", "https://example.com/a.pdf")
+
+        assert store.build_body()["documentSourceIdentifier"] == "https://example.com/a.pdf"
+
+
+class TestBodyBuilding:
+    """Test request body sections match the EBNF shapes"""
+
+    def test_document_variants(self):
+        """Test zip and upload document identifiers"""
+        store = ParameterStore()
+        store.set("zip_id", "zip_456")
+        store.set("doc_name", "contract.pdf")
+        assert store.build_body()["documentSourceIdentifier"] == {"zipId": "zip_456", "documentName": "contract.pdf"}
+
+        store.set("upload_id", "upload_789")
+        assert store.build_body()["documentSourceIdentifier"] == {
+            "uploadRequestId": "upload_789",
+            "zipId": "zip_456",
+            "documentName": "contract.pdf"
+        }
+
+    def test_recipients_rebuilt_when_marked(self):
+        """Test the address store is read again only after mark_dirty"""
+        store = ParameterStore()
+        addresses = AddressStore()
+        addresses.append({"type": "addressListId", "value": "list_1"})
+        assert store.build_body(addresses)["recipientAddressSources"] == [{"addressListId": "list_1"}]
+
+        addresses.append({"type": "newAddress", "firstName": "Jane", "lastName": "Doe", "city": "Anytown"})
+        assert len(store.build_body(addresses)["recipientAddressSources"]) == 1
+
+        store.mark_dirty("recipients")
+        recipients = store.build_body(addresses)["recipientAddressSources"]
+        assert recipients[1]["recipientAddress"]["firstName"] == "Jane"
+        assert recipients[1]["recipientAddress"]["country"] == "USA"
+
+    def test_payment_and_key_order(self):
+        """Test payment details and body key order"""
+        store = ParameterStore()
+        store.set("payment", "CREDIT_CARD")
+        store.set("cardnum", "4111")
+        store.set("cardtype", "visa")
+        store.set("template_id", "template_1")
+        store.set("doc_id", "doc_1")
+        store.set("tags", "x")
+
+        body = store.build_body(AddressStore())
+        assert list(body) == ["documentSourceIdentifier", "jobTemplate", "paymentDetails", "tags"]
+        assert body["paymentDetails"]["creditCardDetails"]["cardType"] == "visa"
+
+    def test_job_options(self):
+        """Test job option selections land in jobOptions under their API names, before payment"""
+        store = ParameterStore()
+        store.set("payment", "INVOICE")
+        store.set("layout", "landscape")
+        store.set("paper", "legal")
+
+        body = store.build_body()
+        assert list(body) == ["jobOptions", "paymentDetails"]
+        assert body["jobOptions"] == {"layout": "landscape", "paperType": "legal"}
+        assert store.as_dict()["param_layout"] == "landscape"
+
+        store.set("layout", None)
+        store.set("paper", None)
+        assert "jobOptions" not in store.build_body()
+
+
+class TestLargeBodies:
+    """Test preview and streaming access for long recipient lists"""
+
+    def make_addresses(self, count):
+        """Address store with count complete newAddress rows"""
+        addresses = AddressStore()
+        addresses.extend_columns({
+            "firstName": [f"F{i}" for i in range(count)],
+            "lastName": ["Doe"] * count
+        })
+        return addresses
+
+    def test_preview_is_truncated_with_count(self):
+        """Test the cached body holds only the preview recipients"""
+        store = ParameterStore()
+        body, count = store.preview_body(self.make_addresses(RECIPIENT_PREVIEW_LIMIT + 5))
+
+        assert count == RECIPIENT_PREVIEW_LIMIT + 5
+        assert len(body["recipientAddressSources"]) == RECIPIENT_PREVIEW_LIMIT
+
+    def test_iter_body_streams_recipients(self):
+        """Test long recipient lists come back lazily and build_body still has them all"""
+        store = ParameterStore()
+        store.set("doc_id", "doc_1")
+        addresses = self.make_addresses(RECIPIENT_PREVIEW_LIMIT + 5)
+
+        items = dict(store.iter_body(addresses))
+        assert isinstance(items["recipientAddressSources"], Iterator)
+        assert len(store.build_body(addresses)["recipientAddressSources"]) == RECIPIENT_PREVIEW_LIMIT + 5
+
+    def test_revision_tracks_changes(self):
+        """Test only real changes bump the revision"""
+        store = ParameterStore()
+        revision = store.revision
+        store.set("tags", "a")
+        store.set("tags", "a")
+        assert store.revision == revision + 1
+        store.mark_dirty("recipients")
+        assert store.revision == revision + 2
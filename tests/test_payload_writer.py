@@ -0,0 +1,66 @@
+"""
+Tests for the incremental JSON payload writer
+"""
+
+import io
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.payload_writer import iter_json, write_payload
+from streamlit_app.session_workspace import SessionWorkspace
+
+
+class TestIterJson:
+    """Test incremental encoding"""
+
+    @pytest.mark.parametrize("items", [
+        [],
+        [("documentSourceIdentifier", {"zipId": "zip_1", "documentName": "a.pdf"})],
+        [("recipientAddressSources", iter([])), ("tags", ["a", "b"])],
+        [("recipientAddressSources", iter([{"addressId": "1"}, {"addressId": "2"}]))],
+    ])
+    def test_output_is_valid_json(self, items):
+        """Test empty, nested and streamed values all decode back"""
+        expected = {key: list(value) if hasattr(value, "__next__") else value for key, value in items}
+        items = [(key, iter(value) if isinstance(value, list) and key == "recipientAddressSources" else value)
+                 for key, value in expected.items()]
+        assert json.loads("".join(iter_json(items))) == expected
+
+    def test_streamed_items_one_per_line(self):
+        """Test each streamed element is written compactly on its own line"""
+        text = "".join(iter_json([("r", iter([{"a": 1}, {"b": 2}]))]))
+        assert '    {"a": 1},\n    {"b": 2}\n' in text
+
+
+class TestWritePayload:
+    """Test writing payload files"""
+
+    def test_counts_bytes_and_streamed_items(self):
+        """Test the returned stats match what was written"""
+        out = io.BytesIO()
+        recipients = ({"addressId": str(i)} for i in range(1000))
+        stats = write_payload(out, [("tags", ["ü"]), ("recipientAddressSources", recipients)])
+
+        data = out.getvalue()
+        assert stats == {"bytes": len(data), "streamed_items": 1000}
+        assert json.loads(data.decode("utf-8"))["recipientAddressSources"][-1] == {"addressId": "999"}
+
+    def test_failed_stream_leaves_no_file(self, tmp_path):
+        """Test an error mid-stream does not publish a partial payload"""
+        workspace = SessionWorkspace(tmp_path)
+
+        def broken():
+            yield {"addressId": "1"}
+            raise RuntimeError("address store changed")
+
+        with pytest.raises(RuntimeError):
+            with workspace.open_atomic("payload.json", binary=True) as f:
+                write_payload(f, [("recipientAddressSources", broken())])
+
+        assert not (workspace.path / "payload.json").exists()
+        assert [p.name for p in workspace.path.iterdir()] == [".last_seen"]
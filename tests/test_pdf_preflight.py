@@ -0,0 +1,127 @@
+"""
+Tests for mmap-based PDF preflight
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.pdf_preflight import preflight, split_ranges
+
+
+def build_pdf(objects, root=1, prev=None, base=b"%PDF-1.4\n"):
+    """Serialize numbered objects with a classic xref table; returns the file bytes"""
+    out = bytearray(base)
+    offsets = {}
+    for number, body in objects.items():
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n"
+    if prev is None:
+        out += b"0 1\n0000000000 65535 f \n"
+    for number in sorted(offsets):
+        out += b"%d 1\n%010d 00000 n \n" % (number, offsets[number])
+    trailer = b"/Size %d /Root %d 0 R" % (max(offsets) + 1, root)
+    if prev is not None:
+        trailer += b" /Prev %d" % prev
+    out += b"trailer\n<< " + trailer + b" >>\nstartxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out), xref
+
+
+def page_objects(pages, first=3):
+    """Catalog, page tree root and leaf pages"""
+    kids = b" ".join(b"%d 0 R" % (first + i) for i in range(pages))
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages,
+    }
+    for i in range(pages):
+        objects[first + i] = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"
+    return objects
+
+
+class TestPageCount:
+    """Test page counting through the cross-reference table"""
+
+    def test_classic_xref(self, tmp_path):
+        """Test the page tree count is read via the xref"""
+        path = tmp_path / "combined.pdf"
+        path.write_bytes(build_pdf(page_objects(12))[0])
+
+        report = preflight(path, recipients=4)
+
+        assert (report["pages"], report["method"], report["version"]) == (12, "xref", "1.4")
+        assert report["ranges"][1] == {"startPage": 4, "endPage": 6}
+
+    def test_incremental_update(self, tmp_path):
+        """Test the newest revision of the page tree wins"""
+        original, xref = build_pdf(page_objects(2))
+        update, _ = build_pdf(
+            {2: b"<< /Type /Pages /Kids [3 0 R 4 0 R 5 0 R] /Count 3 >>",
+             5: b"<< /Type /Page /Parent 2 0 R >>"},
+            prev=xref, base=original
+        )
+        path = tmp_path / "updated.pdf"
+        path.write_bytes(update)
+
+        assert preflight(path)["pages"] == 3
+
+    def test_xref_stream_and_object_stream(self, tmp_path):
+        """Test PDF 1.5 files with compressed xref and object streams"""
+        catalog = b"<< /Type /Catalog /Pages 2 0 R >>"
+        pages = b"<< /Type /Pages /Kids [] /Count 7 >>"
+        header = b"1 0 2 %d " % (len(catalog) + 1)
+        objstm_data = zlib.compress(header + catalog + b" " + pages)
+
+        out = bytearray(b"%PDF-1.5\n")
+        objstm_offset = len(out)
+        out += (b"3 0 obj\n<< /Type /ObjStm /N 2 /First %d /Filter /FlateDecode /Length %d >>\nstream\n"
+                % (len(header), len(objstm_data)) + objstm_data + b"\nendstream\nendobj\n")
+        xref_offset = len(out)
+        rows = bytes([0, 0, 0, 0]) + bytes([2, 0, 3, 0]) + bytes([2, 0, 3, 1])
+        rows += bytes([1]) + objstm_offset.to_bytes(2, "big") + bytes([0])
+        rows += bytes([1]) + xref_offset.to_bytes(2, "big") + bytes([0])
+        xref_data = zlib.compress(rows)
+        out += (b"4 0 obj\n<< /Type /XRef /Size 5 /W [1 2 1] /Root 1 0 R /Filter /FlateDecode /Length %d >>\nstream\n"
+                % len(xref_data) + xref_data + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref_offset)
+        path = tmp_path / "compressed.pdf"
+        path.write_bytes(bytes(out))
+
+        assert (preflight(path)["pages"], preflight(path)["method"]) == (7, "xref")
+
+    def test_scan_fallback(self, tmp_path):
+        """Test a broken xref falls back to counting page objects"""
+        data = build_pdf(page_objects(5))[0].replace(b"startxref\n", b"startxref\n9")
+        path = tmp_path / "broken.pdf"
+        path.write_bytes(data)
+
+        assert (preflight(path)["pages"], preflight(path)["method"]) == (5, "scan")
+
+    def test_not_a_pdf(self, tmp_path):
+        """Test other files are rejected"""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello")
+        with pytest.raises(ValueError, match="not a PDF"):
+            preflight(path)
+
+
+class TestSplitRanges:
+    """Test proposed page ranges"""
+
+    def test_fixed_length_with_short_tail(self):
+        """Test a fixed document length leaves a short last range"""
+        assert split_ranges(7, pages_per_recipient=3) == [
+            {"startPage": 1, "endPage": 3}, {"startPage": 4, "endPage": 6}, {"startPage": 7, "endPage": 7}
+        ]
+
+    def test_uneven_recipients(self):
+        """Test pages must divide evenly among recipients"""
+        with pytest.raises(ValueError, match="evenly"):
+            split_ranges(10, recipients=3)
@@ -0,0 +1,70 @@
+"""
+Tests for the shared --profile mode
+"""
+
+import argparse
+import pstats
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.profiling import DEFAULT_PROFILE_DIR, add_profile_argument, import_times, profiling
+
+
+def build_data():
+    return [str(i) for i in range(100000)]
+
+
+def write_script(tmp_path):
+    (tmp_path / "local_dependency.py").write_text("VALUE = 1\n")
+    script = tmp_path / "tool.py"
+    script.write_text("import local_dependency\n\nif __name__ == '__main__':\n    raise SystemExit('main ran')\n")
+    return script
+
+
+class TestProfiling:
+    """Test profiling a command"""
+
+    def test_profile_argument(self):
+        """Test --profile is off by default and takes an optional directory"""
+        parser = argparse.ArgumentParser()
+        add_profile_argument(parser)
+
+        assert parser.parse_args([]).profile is None
+        assert parser.parse_args(["--profile"]).profile == DEFAULT_PROFILE_DIR
+        assert parser.parse_args(["--profile", "out"]).profile == Path("out")
+
+    def test_import_times(self, tmp_path):
+        """Test the script's own top-level imports are timed without interpreter startup"""
+        modules = [module for module, _self, _cumulative in import_times(write_script(tmp_path))]
+
+        assert "local_dependency" in modules
+        assert "site" not in modules
+
+    def test_profiling_writes_results(self, tmp_path, capsys):
+        """Test a profiled block leaves pstats, collapsed stacks and a report, even on sys.exit()"""
+        script = write_script(tmp_path)
+        out_dir = tmp_path / "profiles"
+
+        with pytest.raises(SystemExit):
+            with profiling(out_dir, str(script)):
+                sys.exit(len(build_data()))
+
+        stats = pstats.Stats(str(out_dir / "tool.pstats"))
+        assert any(function == "build_data" for _file, _line, function in stats.stats)
+        assert (out_dir / "tool.folded").exists()
+        report = (out_dir / "tool.txt").read_text()
+        for section in ("Peak RSS", "Imports (cold, cumulative)", "local_dependency", "Top allocations",
+                        "Top functions"):
+            assert section in report
+        assert report in capsys.readouterr().err
+
+    def test_disabled_does_nothing(self, tmp_path):
+        """Test no --profile runs the block as is and writes nothing"""
+        with profiling(None, str(tmp_path / "tool.py")):
+            pass
+        assert list(tmp_path.iterdir()) == []
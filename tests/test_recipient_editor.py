@@ -0,0 +1,99 @@
+"""
+Tests for the paginated recipient editor helpers
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.address_store import RECIPIENT_COLUMNS, AddressStore
+from streamlit_app.recipient_editor import apply_editor_delta, page_bounds, page_count
+
+
+class CountingList(list):
+    """List that counts item writes and deletions"""
+
+    writes = 0
+
+    def __setitem__(self, key, value):
+        CountingList.writes += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        CountingList.writes += 1
+        super().__delitem__(key)
+
+
+def make_store(count):
+    """Build a store of newAddress rows F0..F{count-1}"""
+    store = AddressStore()
+    store.extend_columns({
+        "firstName": [f"F{i}" for i in range(count)],
+        "lastName": [f"L{i}" for i in range(count)]
+    })
+    return store
+
+
+class TestPaging:
+    """Test page math"""
+
+    def test_page_count(self):
+        """Test empty and partial pages"""
+        assert page_count(0, 50) == 1
+        assert page_count(50, 50) == 1
+        assert page_count(5001, 50) == 101
+
+    def test_page_bounds_clamped(self):
+        """Test out-of-range pages clamp to the last page"""
+        assert page_bounds(1, 120, 50) == (0, 50)
+        assert page_bounds(3, 120, 50) == (100, 120)
+        assert page_bounds(99, 120, 50) == (100, 120)
+        assert page_bounds(1, 0, 50) == (0, 0)
+
+
+class TestApplyEditorDelta:
+    """Test applying st.data_editor deltas to one page"""
+
+    def test_edit_only_touches_page_rows(self):
+        """Test positional edits are offset by the page start"""
+        store = make_store(120)
+        apply_editor_delta(store, 50, 100, {"edited_rows": {0: {"city": "Anytown"}, 2: {"type": "addressId"}}})
+
+        assert store.columns["city"][50] == "Anytown"
+        assert store.columns["type"][52] == "addressId"
+        assert store.columns["city"][0] == ""
+
+    def test_delete_and_add(self):
+        """Test deletions shift the page and additions land at its end"""
+        store = make_store(120)
+        apply_editor_delta(store, 50, 100, {
+            "deleted_rows": [0, 1],
+            "added_rows": [{"type": "addressListId", "value": "list_1"}, {"type": "newAddress", "country": "USA"}]
+        })
+
+        assert len(store) == 119
+        assert store.columns["firstName"][50] == "F52"
+        assert store.row(98)["type"] == "addressListId"
+        assert store.row(98)["value"] == "list_1"
+        assert store.columns["firstName"][99] == "F100"
+
+    def test_deleted_rows_outside_page_are_ignored(self):
+        """Test stale positions beyond the page do not delete other rows"""
+        store = make_store(60)
+        apply_editor_delta(store, 50, 60, {"deleted_rows": [10, 25]})
+        assert len(store) == 60
+
+    def test_page_delete_shifts_large_store_once(self):
+        """Test deleting a page's rows from a 5k store is one write per column, not one per row"""
+        store = make_store(5000)
+        store.columns = {column: CountingList(values) for column, values in store.columns.items()}
+        CountingList.writes = 0
+
+        apply_editor_delta(store, 0, 50, {"deleted_rows": list(range(0, 50, 2))})
+
+        assert CountingList.writes == len(RECIPIENT_COLUMNS)
+        assert len(store) == 4975
+        assert store.columns["firstName"][:3] == ["F1", "F3", "F5"]
+        assert store.columns["lastName"][25] == "L50"
@@ -0,0 +1,103 @@
+"""
+Tests for the columnar address store and chunked recipient import
+"""
+
+import io
+import pandas as pd
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.address_store import AddressStore
+from streamlit_app.recipient_import import import_recipients, normalize_columns, validate_frame
+
+
+class TestAddressStore:
+    """Test columnar storage"""
+
+    def test_append_fills_defaults(self):
+        """Test missing cells take column defaults"""
+        store = AddressStore()
+        store.append({"firstName": "Jane", "lastName": "Doe", "zip": 90210, "state": None})
+
+        assert store.row(0)["type"] == "newAddress"
+        assert store.row(0)["country"] == "USA"
+        assert store.row(0)["zip"] == "90210"
+        assert store.row(0)["state"] == ""
+
+    def test_extend_columns_requires_equal_lengths(self):
+        """Test ragged column arrays are rejected"""
+        store = AddressStore()
+        with pytest.raises(ValueError, match="same length"):
+            store.extend_columns({"firstName": ["a", "b"], "lastName": ["c"]})
+
+    def test_recipient_sources(self):
+        """Test rows map onto recipientAddressSources and incomplete rows are skipped"""
+        store = AddressStore()
+        store.append({"type": "addressListId", "value": "list_1"})
+        store.append({"type": "addressId", "value": ""})
+        store.append({"firstName": "Jane", "lastName": "Doe", "address2": "Apt 1"})
+        store.append({"firstName": "NoLastName"})
+
+        sources = store.recipient_sources()
+        assert sources[0] == {"addressListId": "list_1"}
+        assert len(sources) == 2
+        assert "address2" not in sources[1]["recipientAddress"]
+
+
+class TestValidation:
+    """Test vectorized row checks"""
+
+    def test_reasons(self):
+        """Test each rule flags only its rows"""
+        frame = normalize_columns(pd.DataFrame([
+            {"firstName": "A", "lastName": "B", "state": "CA", "zip": "90210-1234"},
+            {"firstName": "", "lastName": "B"},
+            {"firstName": "A", "lastName": "B", "state": "Calif"},
+            {"firstName": "A", "lastName": "B", "zip": "9021"},
+            {"firstName": "A", "lastName": "B", "zip": "SW1A 1AA", "country": "UK"},
+            {"type": "addressId", "value": ""},
+        ]))
+
+        assert list(validate_frame(frame)) == [
+            "", "missing firstName", "invalid state", "invalid ZIP", "", "missing list / address id"
+        ]
+
+
+class TestImport:
+    """Test streaming CSV and JSONL import"""
+
+    def test_csv_in_chunks_with_aliases(self):
+        """Test headers are mapped and rows spanning chunks are all imported"""
+        rows = "".join(f"F{i},L{i},{'CA' if i % 3 else 'XYZ'},02134\n" for i in range(25))
+        source = io.StringIO("first_name,Last_Name,state,zip_code\n" + rows)
+        store = AddressStore()
+
+        report = import_recipients(source, "csv", store, chunksize=10)
+
+        assert report["rows"] == 25
+        assert report["rejected"] == 9
+        assert report["errors"][0] == (1, "invalid state")
+        assert len(store) == 16
+        assert store.row(0)["zip"] == "02134"
+
+    def test_jsonl(self):
+        """Test JSON lines import, including non-string values"""
+        source = io.StringIO(
+            '{"type": "addressListId", "value": "list_1"}\n'
+            '{"firstName": "Jane", "lastName": "Doe", "zip": "10001", "state": "NY"}\n'
+        )
+        store = AddressStore()
+
+        report = import_recipients(source, "jsonl", store)
+
+        assert report["imported"] == 2
+        assert store.recipient_sources()[0] == {"addressListId": "list_1"}
+
+    def test_unknown_format(self):
+        """Test unsupported formats raise ValueError"""
+        with pytest.raises(ValueError, match="Unsupported"):
+            import_recipients(io.StringIO(""), "xml", AddressStore())
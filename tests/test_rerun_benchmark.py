@@ -0,0 +1,79 @@
+"""
+Tests for the headless rerun benchmark
+"""
+
+import json
+import os
+import sys
+import urllib.request
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import streamlit_app.code_templates as code_templates
+import streamlit_app.core.postman as postman
+from streamlit_app.rerun_benchmark import percentile, run_rerun_benchmark, stubbed_services, summarize
+
+
+def fetch(url, data=None):
+    with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=5) as response:
+        return json.loads(response.read())
+
+
+class TestRerunBenchmark:
+    """Test walking the wizard headlessly and summarizing its reruns"""
+
+    def test_percentile(self):
+        """Test percentiles interpolate between samples"""
+        values = [4.0, 1.0, 3.0, 2.0]
+
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+        assert percentile([7.0], 99) == 7.0
+
+    def test_summarize(self):
+        """Test samples are grouped per step, in first-seen order, with times in ms"""
+        samples = [("load", 0.1, 100), ("q1", 0.02, 50), ("load", 0.3, 300)]
+
+        summary = summarize(samples)
+
+        assert list(summary) == ["load", "q1"]
+        assert summary["load"]["count"] == 2
+        assert summary["load"]["p50_ms"] == 200.0
+        assert summary["load"]["bytes"] == 200
+        assert summary["q1"]["p99_ms"] == 20.0
+
+    def test_stubbed_services(self, monkeypatch):
+        """Test the stub answers like Postman and auth, and settings are restored afterwards"""
+        monkeypatch.delenv(postman.API_KEY_VARIABLES["personal"], raising=False)
+        postman_url = postman.POSTMAN_API_URL
+        auth_url = code_templates.AUTH_BASE_URL
+
+        with stubbed_services() as base_url:
+            assert postman.POSTMAN_API_URL == base_url
+            assert code_templates.AUTH_BASE_URL == base_url
+            assert os.environ[postman.API_KEY_VARIABLES["personal"]]
+            assert fetch(f"{base_url}/mocks")["mocks"][0]["mockUrl"] == base_url
+            assert "access_token" in fetch(f"{base_url}/auth/tokens/long", b"{}")
+            assert "jobId" in fetch(f"{base_url}/jobs/single-doc", b"{}")
+
+        assert postman.POSTMAN_API_URL == postman_url
+        assert code_templates.AUTH_BASE_URL == auth_url
+        assert postman.API_KEY_VARIABLES["personal"] not in os.environ
+
+    def test_journey(self, tmp_path, monkeypatch):
+        """Test every click of a journey is timed and sized, from load to each output format"""
+        monkeypatch.chdir(tmp_path)
+        journeys = []
+
+        report = run_rerun_benchmark(execute=False, endpoints=["/jobs/single-pdf-split-addressCapture"],
+                                     on_journey=lambda *journey: journeys.append(journey))
+
+        assert report["errors"] == []
+        assert report["journeys"] == len(journeys) == 1
+        steps = report["steps"]
+        assert list(steps)[0] == "load" and "level2" in steps and "generate:json" in steps
+        assert "run_code" not in steps
+        assert all(entry["bytes"] > 0 for entry in steps.values())
@@ -0,0 +1,71 @@
+"""
+Tests for the slow rerun sampling watchdog
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.rerun_watchdog import RerunWatchdog, collapse
+
+
+def slow_render(seconds):
+    time.sleep(seconds)
+
+
+class TestRerunWatchdog:
+    """Test sampling reruns over the threshold"""
+
+    def run_in_thread(self, watchdog, step, seconds):
+        result = {}
+
+        def rerun():
+            token = watchdog.watch(step)
+            slow_render(seconds)
+            result["samples"] = watchdog.finish(token)
+
+        thread = threading.Thread(target=rerun)
+        thread.start()
+        thread.join()
+        return result["samples"]
+
+    def test_fast_rerun_is_not_sampled(self, tmp_path):
+        """Test reruns under the threshold record nothing"""
+        output = tmp_path / "slow.folded"
+        watchdog = RerunWatchdog(threshold_seconds=1.0, interval_seconds=0.005, output_file=output).start()
+        try:
+            assert self.run_in_thread(watchdog, "q1", 0.01) is None
+        finally:
+            watchdog.stop()
+        assert watchdog.stacks == {}
+        assert not output.exists()
+
+    def test_slow_rerun_is_sampled_per_step(self, tmp_path):
+        """Test a slow rerun's stacks are collapsed, rooted at its step and appended to the output"""
+        output = tmp_path / "slow.folded"
+        watchdog = RerunWatchdog(threshold_seconds=0.05, interval_seconds=0.005, output_file=output).start()
+        try:
+            samples = self.run_in_thread(watchdog, "level2", 0.3)
+        finally:
+            watchdog.stop()
+
+        assert sum(samples.values()) >= 5
+        assert all(stack.endswith("test_rerun_watchdog.py:rerun;test_rerun_watchdog.py:slow_render")
+                   for stack in samples)
+        assert watchdog.stacks == {"level2": samples}
+
+        lines = output.read_text().splitlines()
+        assert len(lines) == len(samples)
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack.startswith("level2;")
+        assert int(count) == samples[stack[len("level2;"):]]
+
+    def test_collapse_depth(self):
+        """Test collapsed stacks are root first and keep the innermost frames"""
+        frame = sys._getframe()
+        assert collapse(frame).endswith("test_rerun_watchdog.py:test_collapse_depth")
+        assert collapse(frame, max_depth=1) == "test_rerun_watchdog.py:test_collapse_depth"
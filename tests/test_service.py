@@ -0,0 +1,168 @@
+"""
+Tests for the headless HTTP service
+"""
+
+import http.client
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import streamlit_app.core.service as service
+from streamlit_app.core.service import ServiceError, handle, make_server
+
+
+@pytest.fixture
+def server():
+    """Service on a free local port, shut down after the test"""
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fail(request):
+    raise KeyError("broken")
+
+
+def post(conn, path, payload):
+    """POST JSON on an open connection, returning the status and decoded body"""
+    conn.request("POST", path, json.dumps(payload), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+class TestOperations:
+    """Test the operations without HTTP"""
+
+    def test_recommend(self):
+        """Test answers resolve to the same endpoint as the app"""
+        result = handle("/recommend", {"answers": {"docType": "pdfSplit", "recipientStyle": "addressCapture"}})
+
+        assert result == {"endpoint": "/jobs/single-pdf-split-addressCapture"}
+
+    def test_payload(self):
+        """Test parameters and recipient rows build the full body"""
+        recipients = [{"type": "newAddress", "firstName": "Jane", "lastName": "Doe", "address1": "1 Main St",
+                       "city": "Boston", "state": "MA", "zip": "02134"}] * 30
+
+        result = handle("/payload", {"params": {"doc_id": "doc_1", "tags": "a, b"}, "recipients": recipients})
+
+        assert result["recipient_count"] == 30
+        assert result["body"]["documentSourceIdentifier"] == "doc_1"
+        assert result["body"]["tags"] == ["a", "b"]
+
+    def test_code_from_answers(self):
+        """Test code can be generated straight from answers and parameters"""
+        result = handle("/code", {"answers": {"docType": "single"}, "params": {"doc_id": "doc_1"},
+                                  "language": "curl", "base_url": "https://mock.example.test"})
+
+        assert result["endpoint"] == "/jobs/single-doc"
+        assert "https://mock.example.test/jobs/single-doc" in result["code"]
+
+    def test_invalid_requests(self):
+        """Test bad input raises ServiceError"""
+        with pytest.raises(ServiceError):
+            handle("/payload", {"params": {"no_such_field": 1}})
+        with pytest.raises(ServiceError):
+            handle("/recommend", {"answers": {}})
+
+    @pytest.mark.parametrize("path, request_body, message", [
+        ("/code", {"language": ["x"]}, "'language' must be a string"),
+        ("/code", {"endpoint": 5, "body": {}}, "'endpoint' must be a string"),
+        ("/code", {"endpoint": "/jobs/single-doc", "body": {}, "base_url": ["x"]}, "'base_url' must be a string"),
+        ("/payload", {"params": {"tags": 5}}, "'tags' must be a string"),
+        ("/payload", {"params": {"credit_amount": "10"}}, "'credit_amount' must be a number"),
+        ("/recommend", {"answers": []}, "'answers' must be an object"),
+        ("/payload", {"params": ""}, "'params' must be an object"),
+        ("/payload", {"params": 0}, "'params' must be an object"),
+    ])
+    def test_wrong_types(self, path, request_body, message):
+        """Test values of the wrong type are refused up front instead of failing inside the builders"""
+        with pytest.raises(ServiceError, match=message):
+            handle(path, request_body)
+
+    def test_batch_isolates_errors(self):
+        """Test a failing batch item is reported in place"""
+        results = handle("/code", [{"endpoint": "/jobs/single-doc", "body": {}}, {"language": "cobol"}, "text"])
+
+        assert "code" in results[0]
+        assert results[1]["error"].startswith("Unknown language") and "error" in results[2]
+
+    def test_batch_isolates_internal_errors(self, monkeypatch):
+        """Test an item the service fails on is reported in place, not raised"""
+        monkeypatch.setitem(service.OPERATIONS, "/payload", fail)
+
+        results = handle("/payload", [{}, {}])
+
+        assert results == [{"error": "Internal error: KeyError: 'broken'"}] * 2
+
+
+class TestServer:
+    """Test the HTTP layer"""
+
+    def test_keep_alive_and_batch(self, server):
+        """Test several requests, including a batch, share one connection"""
+        conn = http.client.HTTPConnection(*server.server_address[:2])
+
+        conn.request("GET", "/health")
+        health = conn.getresponse()
+        assert health.status == 200 and json.loads(health.read())["status"] == "ok"
+        sock = conn.sock
+
+        assert post(conn, "/recommend", {"answers": {"docType": "merge"}}) == \
+            (200, {"endpoint": "/jobs/multi-doc-merge"})
+        status, results = post(conn, "/recommend", [{"answers": {"docType": "multi"}}] * 3)
+        assert status == 200 and len(results) == 3
+        assert conn.sock is sock
+        conn.close()
+
+    def test_errors(self, server):
+        """Test bad JSON is a 400 and unknown paths are a 404"""
+        conn = http.client.HTTPConnection(*server.server_address[:2])
+        conn.request("POST", "/recommend", "{not json", {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        assert response.status == 400
+        response.read()
+
+        assert post(conn, "/nothing", {})[0] == 404
+        conn.close()
+
+    @pytest.mark.parametrize("length", ["abc", "-1"])
+    def test_bad_content_length(self, server, length):
+        """Test an unusable Content-Length is a JSON 400, not a dropped connection"""
+        conn = http.client.HTTPConnection(*server.server_address[:2])
+        conn.putrequest("POST", "/recommend")
+        conn.putheader("Content-Type", "application/json")
+        conn.putheader("Content-Length", length)
+        conn.endheaders(b"{}")
+        response = conn.getresponse()
+
+        assert response.status == 400
+        assert json.loads(response.read()) == {"error": "Content-Length must be a non-negative integer"}
+        conn.close()
+
+    def test_bad_items_keep_the_connection(self, server, monkeypatch):
+        """Test wrong types are a 400, internal failures a JSON 500, and neither drops the connection"""
+        conn = http.client.HTTPConnection(*server.server_address[:2])
+        conn.request("GET", "/health")
+        conn.getresponse().read()
+        sock = conn.sock
+
+        status, result = post(conn, "/code", {"language": ["x"]})
+        assert status == 400 and result["error"] == "'language' must be a string"
+        assert post(conn, "/payload", {"params": {"tags": 5}})[0] == 400
+        status, results = post(conn, "/code", [{"endpoint": "/jobs/single-doc", "body": {}}, {"language": ["x"]}])
+        assert status == 200 and "code" in results[0] and "error" in results[1]
+
+        monkeypatch.setitem(service.OPERATIONS, "/payload", fail)
+        assert post(conn, "/payload", {}) == (500, {"error": "Internal error: KeyError: 'broken'"})
+        assert conn.sock is sock
+        conn.close()
@@ -0,0 +1,100 @@
+"""
+Tests for per-session workspaces and atomic writes
+"""
+
+import json
+import os
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.session_workspace import REPO_ROOT, SessionWorkspace, atomic_write, resolve_root, HEARTBEAT_FILE
+
+
+class TestAtomicWrite:
+    """Test temp-file-plus-rename writes"""
+
+    def test_writes_text_and_bytes(self, tmp_path):
+        """Test both text and binary payloads land intact"""
+        text_file = atomic_write(tmp_path / "code.py", "print('🎯')\n")
+        bin_file = atomic_write(tmp_path / "blob.bin", b"\x00\x01")
+
+        assert text_file.read_text(encoding="utf-8") == "print('🎯')\n"
+        assert bin_file.read_bytes() == b"\x00\x01"
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        """Test the temp file is renamed away, not copied"""
+        atomic_write(tmp_path / "a.json", "{}")
+        atomic_write(tmp_path / "a.json", "[]")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["a.json"]
+        assert (tmp_path / "a.json").read_text() == "[]"
+
+
+class TestSessionWorkspace:
+    """Test isolation and cleanup of session workspaces"""
+
+    def test_sessions_are_isolated(self, tmp_path):
+        """Test two sessions writing the same name never collide"""
+        ws_a = SessionWorkspace(tmp_path)
+        ws_b = SessionWorkspace(tmp_path)
+
+        file_a = ws_a.write_text("script.py", "a")
+        file_b = ws_b.write_text("script.py", "b")
+
+        assert file_a != file_b
+        assert file_a.read_text() == "a"
+        assert file_b.read_text() == "b"
+        assert ws_a.contains(file_a)
+        assert not ws_a.contains(file_b)
+
+    def test_unique_names_within_same_second(self, tmp_path):
+        """Test generated filenames differ even when created back to back"""
+        ws = SessionWorkspace(tmp_path)
+        names = {ws.unique_name("c2m_jobs_single-doc", ".py") for _ in range(50)}
+        assert len(names) == 50
+
+    def test_write_json(self, tmp_path):
+        """Test JSON helper round-trips"""
+        ws = SessionWorkspace(tmp_path)
+        path = ws.write_json("body.json", {"tags": ["a"]})
+        assert json.loads(path.read_text()) == {"tags": ["a"]}
+
+    def test_rejects_paths_outside_workspace(self, tmp_path):
+        """Test names cannot escape into another session's directory"""
+        ws = SessionWorkspace(tmp_path)
+        with pytest.raises(ValueError, match="escapes"):
+            ws.write_text("../other/script.py", "x")
+
+    def test_cleanup_expired(self, tmp_path):
+        """Test only idle workspaces are swept"""
+        stale = SessionWorkspace(tmp_path)
+        fresh = SessionWorkspace(tmp_path)
+
+        old = time.time() - 7200
+        os.utime(stale.path / HEARTBEAT_FILE, (old, old))
+
+        removed = SessionWorkspace.cleanup_expired(tmp_path, ttl_seconds=3600)
+
+        assert removed == 1
+        assert not stale.path.exists()
+        assert fresh.path.exists()
+
+    def test_touch_recreates_swept_workspace(self, tmp_path):
+        """Test a session that was swept while idle can keep writing"""
+        ws = SessionWorkspace(tmp_path)
+        ws.cleanup()
+        ws.touch()
+        assert ws.write_text("x.txt", "ok").read_text() == "ok"
+
+    def test_relative_root_is_repo_relative(self, tmp_path, monkeypatch):
+        """Test a relative root lands under the repo root whichever directory the app starts in"""
+        monkeypatch.chdir(tmp_path)
+
+        assert resolve_root("generated_code/sessions") == REPO_ROOT / "generated_code" / "sessions"
+        assert resolve_root(tmp_path) == tmp_path
+        assert SessionWorkspace(tmp_path / "sessions").path.is_absolute()
@@ -0,0 +1,97 @@
+"""
+Tests for the precomputed code-snippet matrix
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.code_templates import build_default_registry
+from streamlit_app.core.snippets import SNIPPET_TARGETS, SnippetMatrix, build_snippet_matrix, sample_bodies
+
+BODY = {
+    "documentSourceIdentifier": {"uploadRequestId": "up_1", "documentName": "Letter {1}.pdf"},
+    "recipientAddressSources": [
+        {"recipientAddress": {"firstName": "José", "lastName": "O\"Neil", "address1": "1 Main St"}},
+        {"addressListId": "list_1"},
+    ],
+    "paymentDetails": {"type": "USER_CREDIT", "creditAmount": 12.5},
+    "tags": ["a", "b"],
+}
+
+
+def without_timestamp(code):
+    """Generated code with the generation time blanked out"""
+    return re.sub(r"Generated: .*", "", code)
+
+
+class TestMatrix:
+    """Test skeleton rendering"""
+
+    def test_matches_templates(self):
+        """Test every target renders exactly what the full template renders"""
+        registry = build_default_registry()
+        matrix = SnippetMatrix()
+        for target in SNIPPET_TARGETS:
+            matrix.add(target, BODY)
+
+            code = matrix.render(target, "/jobs/single-doc", BODY, "https://mock.example.test")
+
+            assert without_timestamp(code) == without_timestamp(
+                registry.render(target, "/jobs/single-doc", BODY, "https://mock.example.test"))
+
+    def test_shape_not_values(self):
+        """Test one skeleton serves any values and list length of the same shape"""
+        matrix = SnippetMatrix()
+        matrix.add("curl", {"documentSourceIdentifier": "doc_1", "tags": ["a"]})
+
+        code = matrix.render("curl", "/jobs/single-doc", {"documentSourceIdentifier": "doc_2", "tags": ["x", "y"]})
+
+        assert '{"documentSourceIdentifier": "doc_2", "tags": ["x", "y"]}' in code
+        assert matrix.render("curl", "/jobs/single-doc", {"documentSourceIdentifier": {"zipId": "z"}}) is None
+
+    def test_covers_form_shapes(self):
+        """Test the built matrix holds every shape the Level 2 form produces"""
+        matrix = build_snippet_matrix()
+
+        assert all(matrix.render("python", "/jobs/single-doc", body) for body in sample_bodies())
+
+
+class TestPersistence:
+    """Test the offline build"""
+
+    def test_round_trip(self, tmp_path):
+        """Test a saved matrix loads with the same skeletons"""
+        matrix = SnippetMatrix()
+        matrix.add("javascript", BODY)
+        loaded = SnippetMatrix.load(matrix.save(tmp_path / "matrix.json"))
+
+        assert len(loaded) == 1
+        assert loaded.render("javascript", "/e", BODY) == matrix.render("javascript", "/e", BODY)
+
+    def test_stale_or_missing(self, tmp_path, monkeypatch):
+        """Test a build from other templates, or no build, is not used"""
+        path = SnippetMatrix().save(tmp_path / "matrix.json")
+        monkeypatch.setattr("streamlit_app.core.snippets.templates_digest", lambda: "changed")
+
+        assert SnippetMatrix.load(path) is None
+        assert SnippetMatrix.load(tmp_path / "missing.json") is None
+
+
+class TestRegistry:
+    """Test the template registry consults skeletons"""
+
+    def test_miss_uses_skeleton_and_caches(self):
+        """Test a cache miss is served from the matrix and then memoized"""
+        registry = build_default_registry()
+        matrix = SnippetMatrix()
+        matrix.add("curl", BODY)
+
+        first = registry.render("curl", "/e", BODY, skeletons=matrix)
+
+        assert first is registry.render("curl", "/e", BODY, skeletons=matrix)
+        assert registry.cache_info()["hits"] == 1
+        assert registry.render("curl", "/e", {"other": 1}, skeletons=matrix).count('"other": 1') == 1
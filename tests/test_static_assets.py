@@ -0,0 +1,62 @@
+"""
+Tests for the stylesheet bundle and cached choice cards
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.static_assets import build_assets, choice_cards, minify_css, options_key, stylesheet_tag
+
+
+class TestMinify:
+    """Test CSS minification"""
+
+    def test_minify(self):
+        """Test comments and optional whitespace go while selector spaces stay"""
+        css = "/* cards */\n.a :hover {\n    color : red ;\n}\n.b > .c , .d { margin: 0 auto; }"
+
+        assert minify_css(css) == ".a :hover{color:red}.b>.c,.d{margin:0 auto}"
+
+
+class TestBuildAssets:
+    """Test the hashed bundle build"""
+
+    def test_hashed_bundle_replaces_stale_builds(self, tmp_path):
+        """Test bundles are concatenated in order and old hashes are removed"""
+        source, static = tmp_path / "assets", tmp_path / "static"
+        source.mkdir()
+        (source / "app.css").write_text(".a { color: red; }")
+        (source / "sidebar.css").write_text(".a { color: blue; }")
+
+        first = build_assets(source, static)["app.css"]
+        (source / "sidebar.css").write_text(".a { color: green; }")
+        second = build_assets(source, static)["app.css"]
+
+        assert first["css"] == ".a{color:red}.a{color:blue}"
+        assert first["file"] != second["file"]
+        assert sorted(path.name for path in static.iterdir()) == sorted([second["file"], "manifest.json"])
+
+    def test_stylesheet_tag(self):
+        """Test a link is emitted with static serving and inline CSS without"""
+        entry = {"file": "app.0123.css", "css": ".a{color:red}"}
+
+        assert stylesheet_tag(entry, True) == '<link rel="stylesheet" href="app/static/app.0123.css">'
+        assert stylesheet_tag(entry, False) == "<style>.a{color:red}</style>"
+
+
+class TestChoiceCards:
+    """Test cached card fragments"""
+
+    def test_cards_are_cached(self):
+        """Test the same option set and selection reuse one rendering"""
+        options = [{"value": "single", "label": "Single", "description": "One <document>"},
+                   {"value": "multi", "label": "Multi"}]
+
+        cards = choice_cards("docType", options_key(options), "multi")
+
+        assert cards is choice_cards("docType", options_key(options), "multi")
+        assert 'class="choice-card selected"' in cards[1] and "selected" not in cards[0]
+        assert "📄" in cards[0] and "One &lt;document&gt;" in cards[0]
@@ -0,0 +1,47 @@
+"""
+Tests for the static recommendation export
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.core.endpoints import get_endpoint
+from streamlit_app.static_export import export_static, iter_paths, load_questions, path_slug
+
+
+class TestPaths:
+    """Test enumerating the questionnaire"""
+
+    def test_every_reachable_path(self):
+        """Test conditional questions are only asked where the app asks them"""
+        questions = load_questions()
+        fields = [question["field"] for question in questions]
+        paths = list(iter_paths(questions))
+
+        # single: 2 x 3, multi and merge: 2 x 3 x 2, pdfSplit: 3
+        assert len(paths) == 33
+        assert len({path_slug(answers, fields) for answers in paths}) == 33
+        assert {"docType": "pdfSplit", "recipientStyle": "addressCapture"} in paths
+        assert all(get_endpoint(answers) for answers in paths)
+
+
+class TestExport:
+    """Test rendering pages to disk"""
+
+    def test_export(self, tmp_path):
+        """Test the pool and in-process renderings write the same pages and index"""
+        pooled = export_static(tmp_path / "pooled", base_url="https://mock.example.test", workers=2)
+        serial = export_static(tmp_path / "serial", base_url="https://mock.example.test", workers=1)
+
+        assert pooled == serial
+        page = json.loads((tmp_path / "pooled" / "single-true-template.json").read_text())
+        assert page["endpoint"] == "/jobs/single-doc-job-template"
+        assert page["details"]["id"] == "submitSingleDocTemplate"
+        assert "https://mock.example.test/jobs/single-doc-job-template" in page["snippets"]["curl"]
+        assert "single-true-template.html" in (tmp_path / "pooled" / "index.html").read_text()
+        assert (tmp_path / "pooled" / "single-true-template.html").read_text() == \
+            (tmp_path / "serial" / "single-true-template.html").read_text()
@@ -4,16 +4,12 @@ Templates ALWAYS provide job options and MAY provide either document OR recipien
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Mock streamlit
-sys.modules['streamlit'] = MagicMock()
-
 
 class TestTemplateLogic:
     """Test template business logic implementation"""
@@ -0,0 +1,78 @@
+"""
+Tests for per-rerun span tracing
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app.tracing import RerunTrace, append_trace
+
+
+class TestRerunTrace:
+    """Test recording spans"""
+
+    def test_disabled_is_free(self):
+        """Test disabled tracing returns functions unchanged and records nothing"""
+        trace = RerunTrace(enabled=False)
+
+        def render():
+            return 1
+
+        assert trace.wrap(render) is render
+        with trace.span("block"):
+            pass
+        assert trace.spans == []
+
+    def test_nested_spans_and_totals(self):
+        """Test spans keep start order, nesting depth and per-name totals"""
+        trace = RerunTrace(enabled=True)
+
+        @trace.wrap
+        def render_inner():
+            return "inner"
+
+        @trace.wrap(name="outer")
+        def render_outer():
+            return [render_inner(), render_inner()]
+
+        assert render_outer() == ["inner", "inner"]
+        with trace.span("inject_css"):
+            pass
+
+        record = trace.summary(step="q1", outcome="completed")
+        assert [(span["name"], span["depth"]) for span in record["spans"]] == \
+            [("outer", 0), ("render_inner", 1), ("render_inner", 1), ("inject_css", 0)]
+        assert record["totals"]["render_inner"]["calls"] == 2
+        assert record["step"] == "q1" and record["duration_ms"] >= record["totals"]["outer"]["ms"]
+
+    def test_exceptions_still_close_spans(self):
+        """Test a raising function (e.g. st.rerun) still records its span"""
+        trace = RerunTrace(enabled=True)
+
+        @trace.wrap
+        def rerun():
+            raise RuntimeError("rerun")
+
+        try:
+            rerun()
+        except RuntimeError:
+            pass
+
+        assert [span[0] for span in trace.spans] == ["rerun"]
+        assert trace._depth == 0
+
+
+class TestTraceFile:
+    """Test the JSONL sink"""
+
+    def test_append(self, tmp_path):
+        """Test each rerun becomes one JSON line"""
+        path = tmp_path / "logs" / "traces.jsonl"
+        append_trace(RerunTrace(enabled=True).summary(step="q1"), path)
+        append_trace(RerunTrace(enabled=True).summary(step="q2"), path)
+
+        assert [json.loads(line)["step"] for line in path.read_text().splitlines()] == ["q1", "q2"]
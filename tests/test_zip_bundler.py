@@ -0,0 +1,74 @@
+"""
+Tests for streaming documents into zip bundles
+"""
+
+import hashlib
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from streamlit_app import zip_bundler
+from streamlit_app.code_templates import build_default_registry
+from streamlit_app.zip_bundler import bundle_documents, document_sources, index_path, member_names
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Three documents, two of them sharing a file name"""
+    (tmp_path / "sub").mkdir()
+    paths = [tmp_path / "invoice.pdf", tmp_path / "sub" / "invoice.pdf", tmp_path / "letter.pdf"]
+    for i, path in enumerate(paths):
+        path.write_bytes(bytes([i]) * (1000 + i))
+    return paths
+
+
+class TestBundleDocuments:
+    """Test archive contents and index"""
+
+    def test_members_and_hashes(self, documents, tmp_path, monkeypatch):
+        """Test every document lands in the archive intact, copied in chunks"""
+        monkeypatch.setattr(zip_bundler, "COPY_CHUNK_SIZE", 64)
+        archive_path = tmp_path / "bundle.zip"
+
+        index = bundle_documents(documents, archive_path, zip_id="zip_123")
+
+        assert [m["documentName"] for m in index["members"]] == ["invoice.pdf", "invoice_2.pdf", "letter.pdf"]
+        with zipfile.ZipFile(archive_path) as archive:
+            assert archive.testzip() is None
+            for member, path in zip(index["members"], documents):
+                data = archive.read(member["documentName"])
+                assert data == path.read_bytes()
+                assert member["sha256"] == hashlib.sha256(data).hexdigest()
+        assert json.loads(index_path(archive_path).read_text()) == index
+
+    def test_document_sources(self, documents, tmp_path):
+        """Test identifiers pair the zipId with each member name"""
+        index = bundle_documents(documents[:1], tmp_path / "docs.zip")
+
+        assert document_sources(index) == [{"zipId": "docs", "documentName": "invoice.pdf"}]
+        assert document_sources(index, "up_1")[0]["uploadRequestId"] == "up_1"
+
+    def test_missing_document(self, tmp_path):
+        """Test a missing file fails before anything is written"""
+        with pytest.raises(ValueError, match="not found"):
+            bundle_documents([tmp_path / "nope.pdf"], tmp_path / "bundle.zip")
+        assert not (tmp_path / "bundle.zip").exists()
+
+    def test_member_names_case_insensitive(self):
+        """Test names differing only by case are also made unique"""
+        assert member_names([Path("a/A.pdf"), Path("b/a.pdf")]) == ["A.pdf", "a_2.pdf"]
+
+
+class TestBundleTemplate:
+    """Test the generated bundler script"""
+
+    def test_compiles(self):
+        """Test the standalone bundler is valid Python"""
+        code = build_default_registry().render("python_bundle", "/jobs/multi-doc")
+        compile(code, "bundle_documents.py", "exec")